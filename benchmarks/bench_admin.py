@@ -0,0 +1,99 @@
+"""Changelist сотрудников в админке с WORKERS_ADMIN_SCALE_MODE и без.
+
+Запуск::
+
+    python -m benchmarks.bench_admin --size 1000000
+
+"default" - стандартный changelist: COUNT(*) выборки и всей таблицы,
+SELECT DISTINCT position для фильтра. "scale" - число строк из WorkerStats
+или с пределом WORKERS_ADMIN_COUNT_CAP, варианты фильтра из кэша.
+Отдельно замеряется сохранение list_editable is_active для целой страницы.
+"""
+
+import argparse
+
+from benchmarks.harness import setup_django, test_database
+from benchmarks.suite import measure, seed_workers
+
+CHANGELIST = "/admin/workers/worker/"
+CASES = {
+    "all": {},
+    "filtered": {"is_active__exact": "1", "position": "Developer"},
+    "date": {"hired_date__gte": "2000-01-01 00:00:00+00:00"},
+    "search": {"q": "Имя1"},
+}
+
+
+def make_admin_client():
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    user, _ = User.objects.get_or_create(
+        username="bench-admin", defaults={"is_staff": True, "is_superuser": True}
+    )
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def run(size, iterations):
+    from django.conf import settings
+
+    from workers.models import WorkerStats
+
+    seed_workers(size)
+    # seed_workers пишет через bulk_create, счётчики пересчитываются здесь
+    WorkerStats.rebuild()
+    client = make_admin_client()
+
+    results = {}
+    for mode, scale in (("default", False), ("scale", True)):
+        settings.WORKERS_ADMIN_SCALE_MODE = scale
+        for case, params in CASES.items():
+
+            def request(i):
+                response = client.get(CHANGELIST, params)
+                assert response.status_code == 200
+
+            results[(mode, case)] = measure(request, iterations)
+
+    response = client.get(CHANGELIST)
+    pks = [worker.pk for worker in response.context["cl"].result_list]
+
+    def save(i):
+        data = {
+            "form-TOTAL_FORMS": str(len(pks)),
+            "form-INITIAL_FORMS": str(len(pks)),
+            "_save": "Save",
+        }
+        for n, pk in enumerate(pks):
+            data[f"form-{n}-id"] = str(pk)
+            # Каждая итерация переключает is_active всей страницы
+            if i % 2:
+                data[f"form-{n}-is_active"] = "on"
+        response = client.post(CHANGELIST, data)
+        assert response.status_code == 302
+
+    results[("scale", "list_editable")] = measure(save, iterations, len(pks))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        results = run(args.size, args.iterations)
+
+    for (mode, case), metrics in results.items():
+        print(
+            f"{mode:>7} {case:>13}: p50 {metrics['p50_ms']:9.2f} ms"
+            f"  p95 {metrics['p95_ms']:9.2f} ms  queries {metrics['queries']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Нагрузочное сравнение синхронного списка под WSGI и асинхронного под ASGI.
+
+Запуск::
+
+    python -m benchmarks.bench_async --size 10000 --concurrency 10 50 200
+
+Поднимает на временной базе gunicorn (WorkersViewSet, ``/api/workers/``)
+и uvicorn (``/api/async/workers/``) по одному процессу и для каждого
+уровня параллельности шлёт ``--requests`` запросов списка и карточки.
+Кэш отключён, чтобы оба сервера каждый раз ходили в БД.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import percentile
+
+SERVERS = {
+    "wsgi": "/api/workers/",
+    "asgi": "/api/async/workers/",
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare(env, size):
+    """Создаёт базу, сотрудников и токен в отдельном процессе."""
+    script = (
+        "from benchmarks.harness import setup_django; setup_django()\n"
+        "from django.core.management import call_command\n"
+        "call_command('migrate', verbosity=0)\n"
+        "from benchmarks.suite import make_client, seed_workers\n"
+        f"seed_workers({size})\n"
+        "from rest_framework.authtoken.models import Token\n"
+        "make_client(); print(Token.objects.get().key)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.split()[-1]
+
+
+def start_server(name, port, threads, env):
+    bind = ["127.0.0.1", str(port)]
+    if name == "wsgi":
+        command = [
+            "gunicorn",
+            "kiout_test_backend.wsgi:application",
+            "--bind",
+            ":".join(bind),
+            "--workers",
+            "1",
+            "--threads",
+            str(threads),
+        ]
+    else:
+        command = [
+            "uvicorn",
+            "kiout_test_backend.asgi:application",
+            "--host",
+            bind[0],
+            "--port",
+            bind[1],
+            "--no-access-log",
+        ]
+    return subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_ready(client, url):
+    for _ in range(100):
+        try:
+            await client.get(url)
+            return
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Сервер {url} не запустился")
+
+
+async def load(client, urls, requests, concurrency):
+    import httpx
+
+    latencies, errors = [], 0
+    queue = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.get(urls[i % len(urls)])
+            except httpx.TransportError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "errors": errors,
+    }
+
+
+async def run(servers, token, size, concurrency, requests):
+    import httpx
+
+    limits = httpx.Limits(max_connections=max(concurrency))
+    headers = {"Authorization": f"Token {token}"}
+    results = {}
+    for name, (port, path) in servers.items():
+        base = f"http://127.0.0.1:{port}{path}"
+        urls = [
+            f"{base}?page={i % 50 + 1}" if i % 2 else f"{base}{i * 7 % size + 1}/"
+            for i in range(100)
+        ]
+        async with httpx.AsyncClient(
+            headers=headers, limits=limits, timeout=60
+        ) as client:
+            await wait_ready(client, base)
+            await load(client, urls, min(requests, 100), 10)
+            for level in concurrency:
+                results[(name, level)] = await load(client, urls, requests, level)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--threads", type=int, default=4, help="потоков gunicorn (WSGI)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "kiout_test_backend.settings",
+            "SQLITE_PATH": os.path.join(directory, "bench.sqlite3"),
+            "WORKERS_CACHE_BACKEND": "django.core.cache.backends.dummy.DummyCache",
+            "WORKERS_IMPORT_JOB_RECOVER_ON_START": "False",
+        }
+        token = prepare(env, args.size)
+        servers = {name: (free_port(), path) for name, path in SERVERS.items()}
+        processes = [
+            start_server(name, port, args.threads, env)
+            for name, (port, _) in servers.items()
+        ]
+        try:
+            results = asyncio.run(
+                run(servers, token, args.size, args.concurrency, args.requests)
+            )
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait()
+
+    for (name, level), metrics in results.items():
+        print(
+            f"{name} concurrency={level:<4}: {metrics['rps']:8.1f} req/s"
+            f"  p50 {metrics['p50_ms']:8.2f} ms  p99 {metrics['p99_ms']:8.2f} ms"
+            f"  errors {metrics['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Импорт через API из xlsx и из CSV на одних и тех же данных.
+
+Запуск::
+
+    python -m benchmarks.bench_csv --rows 50000
+
+"parse" - только чтение строк файла (iter_file_rows), "import" - полный
+POST /api/workers/import/: чтение, проверка листа и запись в пустую базу.
+"""
+
+import argparse
+import csv
+import io
+import time
+
+from benchmarks.bench_import import make_dataset
+from benchmarks.harness import setup_django, test_database, timer
+from benchmarks.suite import make_client
+
+FORMATS = {
+    "xlsx": ("workers.xlsx", None, None),
+    "csv utf-8": ("workers.csv", "utf-8", ","),
+    "csv cp1251": ("workers.csv", "cp1251", ";"),
+    "tsv utf-16": ("workers.tsv", "utf-16", "\t"),
+}
+
+
+def make_file(dataset, encoding, delimiter):
+    if encoding is None:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(dataset.headers)
+        for row in dataset:
+            sheet.append(row)
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter)
+    writer.writerow(dataset.headers)
+    writer.writerows(dataset)
+    return buffer.getvalue().encode(encoding)
+
+
+def upload(name, content):
+    file = io.BytesIO(content)
+    file.name = name
+    return file
+
+
+def run(rows):
+    from workers.importers import iter_file_rows
+    from workers.models import Worker
+
+    dataset = make_dataset(rows)
+    client = make_client()
+
+    results = {}
+    for fmt, (name, encoding, delimiter) in FORMATS.items():
+        content = make_file(dataset, encoding, delimiter)
+        results[(fmt, "size")] = len(content)
+
+        with timer(results, (fmt, "parse")):
+            parsed = sum(1 for _ in iter_file_rows(upload(name, content)))
+        assert parsed == rows + 1
+
+        Worker.objects.all().delete()
+        start = time.perf_counter()
+        response = client.post("/api/workers/import/", {"file": upload(name, content)})
+        results[(fmt, "import")] = time.perf_counter() - start
+        assert response.status_code == 200, response.content
+        assert response.json()["imported"] == rows
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        results = run(args.rows)
+
+    for fmt in FORMATS:
+        print(
+            f"{fmt:>10}: {results[(fmt, 'size')] / 1024:8.0f} KiB"
+            f"  parse {args.rows / results[(fmt, 'parse')]:10.0f} rows/s"
+            f"  import {args.rows / results[(fmt, 'import')]:8.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
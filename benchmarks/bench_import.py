@@ -0,0 +1,51 @@
+"""Сравнение построчного и пакетного импорта сотрудников."""
+
+import argparse
+
+from benchmarks.harness import setup_django, test_database, timer
+
+
+def make_dataset(rows, offset=0):
+    import tablib
+
+    dataset = tablib.Dataset(
+        headers=["first_name", "last_name", "email", "position", "is_active"]
+    )
+    for i in range(offset, offset + rows):
+        dataset.append([f"Имя {i}", f"Фамилия {i}", f"w{i}@bench.test", "Dev", True])
+    return dataset
+
+
+def run(rows):
+    from workers.models import Worker
+    from workers.resourse import BulkWorkersResources, WorkersResources
+
+    results = {}
+    for name, resource_class in (
+        ("row_by_row", WorkersResources),
+        ("bulk", BulkWorkersResources),
+    ):
+        Worker.objects.all().delete()
+        # половина строк - обновления существующих сотрудников
+        resource_class().import_data(make_dataset(rows // 2))
+        with timer(results, name):
+            resource_class().import_data(make_dataset(rows))
+        assert Worker.objects.count() == rows
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        results = run(args.rows)
+
+    for name, seconds in results.items():
+        print(f"{name:>12}: {seconds:8.2f} s  {args.rows / seconds:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Сравнение обычного и быстрого (values_list) списка сотрудников."""
+
+import argparse
+
+from benchmarks.harness import setup_django, test_database
+from benchmarks.suite import make_client, measure, seed_workers
+
+
+def run(size, page_sizes, iterations):
+    from django.conf import settings
+    from django.core.cache import caches
+
+    cache = caches[settings.WORKERS_CACHE_ALIAS]
+    seed_workers(size)
+    client = make_client()
+
+    results = {}
+    for page_size in page_sizes:
+        url = f"/api/workers/?pagination=cursor&page_size={page_size}"
+        contents = {}
+        for name, fast in (("model", False), ("values_list", True)):
+            settings.WORKERS_FAST_LIST = fast
+
+            def request(i):
+                cache.clear()
+                response = client.get(url)
+                assert response.status_code == 200
+                contents[name] = response.content
+
+            results[(page_size, name)] = measure(request, iterations, page_size)
+        assert contents["model"] == contents["values_list"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        results = run(args.size, args.page_sizes, args.iterations)
+
+    for (page_size, name), metrics in results.items():
+        print(
+            f"page_size={page_size:<5} {name:>12}: p50 {metrics['p50_ms']:8.2f} ms"
+            f"  p95 {metrics['p95_ms']:8.2f} ms  {metrics['rows_per_s']:10.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
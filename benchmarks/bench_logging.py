@@ -0,0 +1,112 @@
+"""Импорт с синхронным логированием строк и с очередью логов.
+
+Запуск::
+
+    python -m benchmarks.bench_logging --rows 20000
+
+"sync" - прежняя схема: FileHandler и запись в лог на каждую строку
+импорта. "queue" - BatchQueueHandler и одна запись на порцию.
+Дополнительно замеряется время одного logger.info в вызывающем потоке.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.bench_import import make_dataset
+from benchmarks.harness import setup_django, test_database, timer
+from benchmarks.suite import percentile
+
+LOGGER = "workers"
+
+
+def row_logging_resource():
+    from workers.resourse import BulkWorkersResources
+
+    logger = logging.getLogger("workers.resourse")
+
+    class RowLoggingResources(BulkWorkersResources):
+        def before_import_row(self, row, **kwargs):
+            logger.info(
+                f"Импорт сотрудника: {row.get('first_name')} {row.get('email')}"
+            )
+
+    return RowLoggingResources()
+
+
+def configure(handler):
+    logger = logging.getLogger(LOGGER)
+    for old in logger.handlers:
+        old.close()
+    handler.setFormatter(
+        logging.Formatter("{asctime} {levelname} {message}", style="{")
+    )
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def call_latency(logger, calls):
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        logger.info("Пользователь %s выгрузил %s", "bench", i)
+        latencies.append(time.perf_counter() - start)
+    return percentile(latencies, 50) * 1e6, percentile(latencies, 99) * 1e6
+
+
+def run(rows, calls, directory):
+    from workers.importers import import_rows
+    from workers.log import BatchQueueHandler
+    from workers.models import Worker
+    from workers.resourse import BulkWorkersResources
+
+    dataset = make_dataset(rows)
+    lines = [dataset.headers, *dataset]
+    setups = {
+        "sync": (
+            lambda path: logging.FileHandler(path, encoding="utf-8"),
+            row_logging_resource,
+        ),
+        "queue": (BatchQueueHandler, BulkWorkersResources),
+    }
+
+    results = {}
+    for name, (make_handler, make_resource) in setups.items():
+        path = os.path.join(directory, f"{name}.log")
+        logger = configure(make_handler(path))
+        Worker.objects.all().delete()
+        with timer(results, (name, "import")):
+            import_rows(make_resource(), iter(lines))
+        results[(name, "call")] = call_latency(logger, calls)
+        logger.handlers[0].close()
+        with open(path, encoding="utf-8") as file:
+            results[(name, "lines")] = sum(1 for _ in file)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database(), tempfile.TemporaryDirectory() as directory:
+        results = run(args.rows, args.calls, directory)
+
+    for name in ("sync", "queue"):
+        seconds = results[(name, "import")]
+        p50, p99 = results[(name, "call")]
+        print(
+            f"{name:>6}: import {args.rows / seconds:8.0f} rows/s"
+            f"  logger.info p50 {p50:6.2f} us  p99 {p99:6.2f} us"
+            f"  lines {results[(name, 'lines')]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Скорость рендеринга больших страниц списка: json, orjson и MessagePack."""
+
+import argparse
+import time
+
+from benchmarks.harness import setup_django
+
+
+def make_page(rows):
+    # Та же форма, что у ответа GET /api/workers/?pagination=cursor
+    return {
+        "next": "http://testserver/api/workers/?cursor=cD0xMDAw&pagination=cursor",
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "first_name": f"Имя{i}",
+                "middle_name": "",
+                "last_name": f"Фамилия{i}",
+                "position": "Developer",
+                "is_active": i % 5 != 0,
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def run(page_sizes, iterations):
+    from rest_framework.renderers import JSONRenderer
+
+    from workers.renderers import MessagePackRenderer, ORJSONRenderer
+
+    renderers = {
+        "json": JSONRenderer(),
+        "orjson": ORJSONRenderer(),
+        "msgpack": MessagePackRenderer(),
+    }
+    results = {}
+    for rows in page_sizes:
+        page = make_page(rows)
+        for name, renderer in renderers.items():
+            start = time.perf_counter()
+            for _ in range(iterations):
+                content = renderer.render(page)
+            seconds = (time.perf_counter() - start) / iterations
+            results[(rows, name)] = (seconds, len(content))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    results = run(args.page_sizes, args.iterations)
+
+    for (rows, name), (seconds, size) in results.items():
+        print(
+            f"rows={rows:<6} {name:>8}: {seconds * 1000:8.2f} ms"
+            f"  {rows / seconds:12.0f} rows/s  {size / 1024:8.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
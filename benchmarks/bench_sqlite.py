@@ -0,0 +1,118 @@
+"""Параллельные чтения и записи на SQLite с настройками по умолчанию и с профилем.
+
+Запуск::
+
+    python -m benchmarks.bench_sqlite --writers 4 --readers 8 --seconds 5
+
+Каждый профиль получает свой файл БД. Писатели в транзакции читают
+таблицу и вставляют пачку строк (как пакетный импорт), читатели
+выбирают страницы. Считаются операции в секунду и ошибки
+"database is locked".
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import setup_django
+
+TABLE = "CREATE TABLE item (id INTEGER PRIMARY KEY, email TEXT UNIQUE, value INTEGER)"
+
+
+def run(alias, writers, readers, seconds, batch):
+    from django.db import OperationalError, connections, transaction
+
+    with connections[alias].cursor() as cursor:
+        cursor.execute(TABLE)
+    connections[alias].close()
+
+    counters = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    sequence = iter(range(10**9))
+
+    def count(name):
+        with lock:
+            counters[name] += 1
+
+    def write():
+        while time.perf_counter() < deadline:
+            rows = [(f"w{next(sequence)}@bench.test", i) for i in range(batch)]
+            try:
+                with transaction.atomic(using=alias):
+                    with connections[alias].cursor() as cursor:
+                        cursor.execute("SELECT MAX(id) FROM item")
+                        cursor.executemany(
+                            "INSERT INTO item (email, value) VALUES (%s, %s)", rows
+                        )
+                count("writes")
+            except OperationalError:
+                count("errors")
+
+    def read():
+        while time.perf_counter() < deadline:
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT * FROM item ORDER BY id DESC LIMIT 100")
+                    cursor.fetchall()
+                count("reads")
+            except OperationalError:
+                count("errors")
+
+    def guarded(fn):
+        def target():
+            try:
+                fn()
+            finally:
+                connections[alias].close()
+
+        return target
+
+    threads = [threading.Thread(target=guarded(write)) for _ in range(writers)]
+    threads += [threading.Thread(target=guarded(read)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {name: value / seconds for name, value in counters.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connections
+
+    profiles = {
+        "default": {},
+        "tuned": connections["default"].settings_dict["OPTIONS"],
+    }
+    if not settings.SQLITE_TUNED:
+        parser.error("профиль отключён: запустите без SQLITE_TUNED=False")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, options in profiles.items():
+            alias = f"bench_{name}"
+            connections.settings[alias] = {
+                **connections["default"].settings_dict,
+                "NAME": os.path.join(directory, f"{name}.sqlite3"),
+                "OPTIONS": options,
+            }
+            result = run(alias, args.writers, args.readers, args.seconds, args.batch)
+            print(
+                f"{name:>8}: {result['writes']:8.1f} writes/s"
+                f"  {result['reads']:8.1f} reads/s"
+                f"  {result['errors']:8.1f} locked/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Проверка листа импорта: pandas против построчного прохода import_data."""
+
+import argparse
+
+from benchmarks.harness import setup_django, test_database, timer
+
+HEADERS = ["first_name", "last_name", "email", "position", "is_active"]
+
+
+def make_rows(rows):
+    data = [HEADERS]
+    for i in range(rows):
+        # каждая сотая строка с ошибкой в email
+        email = f"w{i}@bench.test" if i % 100 else f"w{i}-bench.test"
+        data.append([f"Имя {i}", f"Фамилия {i}", email, "Dev", True])
+    return data
+
+
+def run(rows):
+    import tablib
+
+    from workers.resourse import WorkersResources
+    from workers.validation import read_frame, validate_frame, validate_rows
+
+    data = make_rows(rows)
+    results = {}
+    with timer(results, "pandas"):
+        report = validate_frame(read_frame(data))
+    assert report["error_count"] == rows // 100
+    with timer(results, "pandas chunks"):
+        report = validate_rows(data)
+    assert report["error_count"] == rows // 100
+
+    dataset = tablib.Dataset(*data[1:], headers=HEADERS)
+    with timer(results, "import_data"):
+        WorkersResources().import_data(dataset, dry_run=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        results = run(args.rows)
+
+    for name, seconds in results.items():
+        print(f"{name:>12}: {seconds:8.3f} s  {args.rows / seconds:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Общие утилиты для бенчмарков.
+
+Бенчмарки запускаются из корня проекта, например::
+
+    python -m benchmarks.bench_import --rows 50000
+
+и работают на отдельной тестовой базе, которая удаляется после запуска.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kiout_test_backend.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Создаёт тестовую базу на время бенчмарка."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer(results, name):
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
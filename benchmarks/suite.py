@@ -0,0 +1,296 @@
+"""Бенчмарк API сотрудников.
+
+Запуск::
+
+    python -m benchmarks --sizes 10000 100000 --output bench.json
+    python -m benchmarks --baseline bench.json --threshold 10
+
+Для каждого размера таблицы сценарии прогоняются ``--iterations`` раз
+и дают p50/p95, строк в секунду, число SQL-запросов и пиковую память.
+Запросы и память снимаются отдельным прогоном, чтобы tracemalloc
+не искажал время. С ``--baseline`` результаты сравниваются с прошлым
+прогоном, и при регрессии больше ``--threshold`` процентов код выхода 1.
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.harness import setup_django, test_database
+
+# Метрика -> True, если большее значение лучше
+METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "rows_per_s": True,
+    "queries": False,
+    "peak_memory_mb": False,
+}
+
+SEED_BATCH_SIZE = 5000
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def measure(fn, iterations, rows=1):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        fn(iterations)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "rows_per_s": round(rows * len(latencies) / sum(latencies), 1),
+        "queries": len(queries),
+        "peak_memory_mb": round(peak / 1024 / 1024, 3),
+    }
+
+
+def seed_workers(count):
+    from workers.models import Worker
+
+    positions = ["Developer", "Designer", "Manager", "Analyst"]
+    created = Worker.objects.count()
+    while created < count:
+        batch = min(SEED_BATCH_SIZE, count - created)
+        Worker.objects.bulk_create(
+            [
+                Worker(
+                    first_name=f"Имя{i}",
+                    last_name=f"Фамилия{i}",
+                    email=f"worker{i}@bench.test",
+                    position=positions[i % len(positions)],
+                    is_active=i % 5 != 0,
+                )
+                for i in range(created, created + batch)
+            ]
+        )
+        created += batch
+
+
+def make_sheet(rows, fmt):
+    from workers.exporters import EXPORT_FIELDS
+
+    # половина строк обновляет существующих сотрудников, половина - новые
+    data = [
+        [f"Имя{i}", "", f"Фамилия{i}", f"worker{i}@bench.test", "Developer", True]
+        for i in range(-rows // 2, rows - rows // 2)
+    ]
+    if fmt == "xlsx":
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(EXPORT_FIELDS)
+        for row in data:
+            sheet.append(row)
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+    import csv
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    writer.writerows(data)
+    return buffer.getvalue().encode()
+
+
+def make_client():
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    user, _ = User.objects.get_or_create(
+        username="bench", defaults={"is_staff": True, "is_superuser": True}
+    )
+    token, _ = Token.objects.get_or_create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+def get_cases(client, size, import_rows):
+    """Сценарии: имя -> (функция от номера итерации, строк за итерацию)."""
+    from django.conf import settings
+    from django.core.cache import caches
+
+    from workers.models import Worker
+
+    cache = caches[settings.WORKERS_CACHE_ALIAS]
+    ids = list(Worker.objects.values_list("id", flat=True)[:1000])
+    sheets = {fmt: make_sheet(import_rows, fmt) for fmt in ("xlsx", "csv")}
+
+    def request(method, url, expected=200, **kwargs):
+        response = getattr(client, method)(url, **kwargs)
+        assert response.status_code == expected, (url, response.status_code)
+        return response
+
+    def uncached(method, url, **kwargs):
+        cache.clear()
+        return request(method, url, **kwargs)
+
+    def create(i):
+        request(
+            "post",
+            "/api/workers/",
+            expected=201,
+            data={
+                "first_name": "Новый",
+                "last_name": "Сотрудник",
+                "email": f"new{size}-{i}-{time.time_ns()}@bench.test",
+            },
+        )
+
+    def import_file(fmt):
+        def run(i):
+            upload = io.BytesIO(sheets[fmt])
+            upload.name = f"workers.{fmt}"
+            request("post", "/api/workers/import/", data={"file": upload})
+
+        return run
+
+    return {
+        "list": (lambda i: uncached("get", f"/api/workers/?page={i % 50 + 1}"), 10),
+        "list_cached": (lambda i: request("get", "/api/workers/"), 10),
+        "list_filtered": (
+            lambda i: uncached(
+                "get",
+                f"/api/workers/?is_active=True&position=Designer&page={i % 50 + 1}",
+            ),
+            10,
+        ),
+        "list_cursor": (
+            lambda i: uncached("get", "/api/workers/?pagination=cursor&page_size=100"),
+            100,
+        ),
+        "retrieve": (
+            lambda i: uncached("get", f"/api/workers/{ids[i % len(ids)]}/"),
+            1,
+        ),
+        "create": (create, 1),
+        "patch": (
+            lambda i: request(
+                "patch",
+                f"/api/workers/{ids[i % len(ids)]}/",
+                data={"position": f"Position {i}"},
+            ),
+            1,
+        ),
+        "import_xlsx": (import_file("xlsx"), import_rows),
+        "import_csv": (import_file("csv"), import_rows),
+    }
+
+
+def run(sizes, iterations, import_rows, only=None):
+    from workers.models import Worker
+
+    results = {}
+    with test_database():
+        client = make_client()
+        for size in sorted(sizes):
+            Worker.objects.all().delete()
+            start = time.perf_counter()
+            seed_workers(size)
+            print(f"[{size}] seeded in {time.perf_counter() - start:.1f} s")
+
+            results[str(size)] = {}
+            for name, (fn, rows) in get_cases(client, size, import_rows).items():
+                if only and name not in only:
+                    continue
+                # тяжёлые сценарии гоняются меньше раз
+                count = (
+                    max(3, iterations // 10)
+                    if name.startswith("import")
+                    else iterations
+                )
+                results[str(size)][name] = measure(fn, count, rows)
+                print(f"[{size}] {name:>14}: {results[str(size)][name]}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Возвращает список регрессий больше ``threshold`` процентов."""
+    regressions = []
+    for size, cases in results.items():
+        for name, metrics in cases.items():
+            old_metrics = baseline.get(size, {}).get(name)
+            if not old_metrics:
+                continue
+            for metric, higher_is_better in METRICS.items():
+                old, new = old_metrics.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old * 100
+                if higher_is_better:
+                    change = -change
+                if change > threshold:
+                    regressions.append(
+                        f"{size}/{name}/{metric}: {old} -> {new} ({change:+.1f}%)"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Бенчмарк API сотрудников"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument(
+        "--import-rows", type=int, default=2000, help="Строк в файле импорта"
+    )
+    parser.add_argument("--only", nargs="+", help="Запустить только эти сценарии")
+    parser.add_argument("--output", help="Куда записать результаты в JSON")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Допустимая регрессия, %%"
+    )
+    args = parser.parse_args(argv)
+
+    setup_django()
+    results = run(args.sizes, args.iterations, args.import_rows, args.only)
+
+    if args.output:
+        report = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -60,6 +60,12 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Профилирование запросов: доля замеряемых запросов (0 - выключено)
+WORKERS_PROFILING_SAMPLE_RATE = float(os.getenv("WORKERS_PROFILING_SAMPLE_RATE", 0))
+WORKERS_PROFILING_WINDOW_MINUTES = int(os.getenv("WORKERS_PROFILING_WINDOW_MINUTES", 15))
+if WORKERS_PROFILING_SAMPLE_RATE > 0:
+    MIDDLEWARE.insert(0, "workers.profiling.ProfilingMiddleware")
+
 ROOT_URLCONF = "kiout_test_backend.urls"
 
 TEMPLATES = [
@@ -84,13 +90,83 @@ WSGI_APPLICATION = "kiout_test_backend.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Профиль SQLite для параллельных импортов и чтений: WAL (читатели не
+# блокируют писателя), ожидание блокировки вместо "database is locked" и
+# BEGIN IMMEDIATE для транзакций. SQLITE_TUNED=False - настройки SQLite
+# по умолчанию.
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "True") == "True"
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    # В режиме WAL NORMAL не теряет целостность, fsync только на checkpoint
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # Байт файла БД, читаемых через mmap
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    # Отрицательное значение - размер кэша страниц в КиБ
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024)),
+    # Сколько миллисекунд ждать освобождения блокировки
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+        "OPTIONS": (
+            {
+                "init_command": ";".join(
+                    f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+                ),
+                # Запись сразу берёт блокировку, а не повышает её после чтения
+                # внутри транзакции: такое повышение при занятой БД падает
+                # без ожидания busy_timeout
+                "transaction_mode": "IMMEDIATE",
+            }
+            if SQLITE_TUNED
+            else {}
+        ),
     }
 }
 
+# Реплики для чтения: имена баз через пробел (для SQLite - пути к файлам),
+# движок и OPTIONS как у default. Репликацию данных настраивают отдельно.
+for number, name in enumerate(os.getenv("DATABASE_REPLICAS", "").split(), 1):
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "NAME": name,
+        "TEST": {"MIRROR": "default"},
+    }
+WORKERS_DB_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["workers.routers.ReplicaRouter"]
+# Сколько секунд после записи клиент читает из основной базы. Отметка о записи
+# хранится в кэше workers, с репликами он должен быть общим (check workers.E001)
+WORKERS_DB_STICKY_SECONDS = int(os.getenv("WORKERS_DB_STICKY_SECONDS", 5))
+if WORKERS_DB_REPLICAS:
+    MIDDLEWARE.insert(0, "workers.routers.ReplicaRoutingMiddleware")
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Кэш ответов API сотрудников. Бэкенд и политика вытеснения настраиваются
+    # из env; при нескольких процессах нужен общий бэкенд (Redis, БД),
+    # иначе версия данных у каждого процесса своя.
+    "workers": {
+        "BACKEND": os.getenv("WORKERS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("WORKERS_CACHE_LOCATION", "workers"),
+        "TIMEOUT": int(os.getenv("WORKERS_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("WORKERS_CACHE_MAX_ENTRIES", 1000)),
+            "CULL_FREQUENCY": int(os.getenv("WORKERS_CACHE_CULL_FREQUENCY", 3)),
+        },
+    },
+}
+WORKERS_CACHE_ALIAS = "workers"
+
+# Сколько секунд токен -> пользователь живёт в кэше аутентификации
+WORKERS_TOKEN_CACHE_TIMEOUT = int(os.getenv("WORKERS_TOKEN_CACHE_TIMEOUT", 60))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -129,6 +205,9 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = os.getenv("STATIC_VOLUME_PATH", os.path.join(BASE_DIR, "staticfiles"))
 
+MEDIA_URL = "media/"
+MEDIA_ROOT = os.getenv("MEDIA_VOLUME_PATH", os.path.join(BASE_DIR, "media"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -137,7 +216,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "workers.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -147,26 +226,98 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 }
 
+# Максимальный размер страницы, который клиент может запросить через page_size
+WORKERS_MAX_PAGE_SIZE = int(os.getenv("WORKERS_MAX_PAGE_SIZE", 1000))
+
+# Изменений на странице /api/workers/changes/ без ?limit= (не больше
+# WORKERS_MAX_PAGE_SIZE)
+WORKERS_CHANGES_PAGE_SIZE = int(os.getenv("WORKERS_CHANGES_PAGE_SIZE", 500))
+
+# Максимум операций в одном запросе POST /api/workers/bulk/
+WORKERS_BULK_MAX_ITEMS = int(os.getenv("WORKERS_BULK_MAX_ITEMS", 10000))
+
+# Список сотрудников через values_list без создания моделей
+WORKERS_FAST_LIST = os.getenv("WORKERS_FAST_LIST", "True") == "True"
+
+# Админка сотрудников без COUNT(*) и SELECT DISTINCT по всей таблице
+WORKERS_ADMIN_SCALE_MODE = os.getenv("WORKERS_ADMIN_SCALE_MODE", "True") == "True"
+# До скольких строк админка считает выборку, которую не покрывает WorkerStats
+WORKERS_ADMIN_COUNT_CAP = int(os.getenv("WORKERS_ADMIN_COUNT_CAP", 10000))
+
 
 IMPORT_EXPORT_USE_TRANSACTIONS = True
 
+# Сколько ошибок проверки файла импорта возвращать в отчёте
+WORKERS_IMPORT_MAX_REPORTED_ERRORS = int(
+    os.getenv("WORKERS_IMPORT_MAX_REPORTED_ERRORS", 1000)
+)
+
+# Размер порции строк, которая импортируется в одной транзакции
+WORKERS_IMPORT_CHUNK_SIZE = int(os.getenv("WORKERS_IMPORT_CHUNK_SIZE", 1000))
+
+# Кодировка CSV/TSV, если файл не в UTF-8 и без BOM
+WORKERS_IMPORT_CSV_FALLBACK_ENCODING = os.getenv(
+    "WORKERS_IMPORT_CSV_FALLBACK_ENCODING", "cp1251"
+)
+
+# Процессов для разбора файлов при импорте нескольких файлов или архива
+WORKERS_IMPORT_PROCESSES = int(os.getenv("WORKERS_IMPORT_PROCESSES", os.cpu_count() or 1))
+# Ограничения импорта нескольких файлов: число файлов и размер после распаковки
+WORKERS_IMPORT_MAX_FILES = int(os.getenv("WORKERS_IMPORT_MAX_FILES", 100))
+WORKERS_IMPORT_MAX_UNPACKED_MB = int(os.getenv("WORKERS_IMPORT_MAX_UNPACKED_MB", 500))
+
+# Сколько строк читается из БД за раз при выгрузке
+WORKERS_EXPORT_CHUNK_SIZE = int(os.getenv("WORKERS_EXPORT_CHUNK_SIZE", 2000))
+
+# Сколько лучших совпадений полнотекстового поиска ранжируется на SQLite
+WORKERS_SEARCH_CANDIDATES = int(os.getenv("WORKERS_SEARCH_CANDIDATES", 500))
+
+# Фоновые задачи импорта
+WORKERS_IMPORT_JOB_THREADS = int(os.getenv("WORKERS_IMPORT_JOB_THREADS", 2))
+# Как часто процесс обновляет heartbeat своих задач (в том числе ожидающих в
+# очереди) и ищет брошенные чужие
+WORKERS_IMPORT_JOB_HEARTBEAT_SECONDS = int(os.getenv("WORKERS_IMPORT_JOB_HEARTBEAT_SECONDS", 30))
+# Через сколько секунд без heartbeat задача считается брошенной
+WORKERS_IMPORT_JOB_STALE_SECONDS = int(os.getenv("WORKERS_IMPORT_JOB_STALE_SECONDS", 300))
+WORKERS_IMPORT_JOB_MAX_ATTEMPTS = int(os.getenv("WORKERS_IMPORT_JOB_MAX_ATTEMPTS", 3))
+# Фоновый поток процесса: heartbeat его задач и восстановление брошенных
+WORKERS_IMPORT_JOB_RECOVER_ON_START = os.getenv("WORKERS_IMPORT_JOB_RECOVER_ON_START", "True") == "True"
+
+# Уровень логов приложения workers
+WORKERS_LOG_LEVEL = os.getenv("WORKERS_LOG_LEVEL", "INFO")
+# Сколько записей фоновый поток логирования пишет за один flush файла
+WORKERS_LOG_BATCH_SIZE = int(os.getenv("WORKERS_LOG_BATCH_SIZE", 500))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "verbose": {
+            "format": "{asctime} {levelname} {name} {message}",
+            "style": "{",
+        },
+    },
     "handlers": {
+        # Файл пишет фоновый поток, запрос только кладёт запись в очередь
         "file": {
-            'level': 'WARNING',
-            'class': "logging.FileHandler",
-            'filename': os.path.join(BASE_DIR, "logs", "django.log"),
+            "level": "DEBUG",
+            "class": "workers.log.BatchQueueHandler",
+            "filename": os.path.join(BASE_DIR, "logs", "django.log"),
+            "batch_size": WORKERS_LOG_BATCH_SIZE,
+            "formatter": "verbose",
         }
     },
     "loggers": {
         "django": {
             "handlers": ["file"],
             "level": "WARNING",
-            'propagate': True,
-        }
-    }
+            "propagate": True,
+        },
+        "workers": {
+            "handlers": ["file"],
+            "level": WORKERS_LOG_LEVEL,
+        },
+    },
 }
 
 os.environ.setdefault("DJANGO_SUPERUSER_USERNAME", os.getenv("DJANGO_SUPERUSER_USERNAME", "admin"))
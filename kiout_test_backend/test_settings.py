@@ -0,0 +1,11 @@
+"""Настройки для pytest: как основные, но без записи в logs/django.log."""
+
+from kiout_test_backend.settings import *  # noqa: F401,F403
+from kiout_test_backend.settings import LOGGING
+
+# Записи логгеров по-прежнему доходят до caplog через корневой логгер, но
+# файл не пишется: иначе каждый прогон тестов дописывает в него десятки МБ
+LOGGING = {
+    **LOGGING,
+    "handlers": {"file": {"class": "logging.NullHandler"}},
+}
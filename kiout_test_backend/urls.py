@@ -14,12 +14,14 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+
 from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.routers import DefaultRouter
 
-from workers.views import WorkersViewSet
+from workers.async_views import workers_detail, workers_list
+from workers.views import ProfilingStatsView, WorkersViewSet
 
 r = DefaultRouter()
 r.register("workers", WorkersViewSet, basename="workers")
@@ -32,5 +34,8 @@ urlpatterns = [
         name="swagger-ui",
     ),
     path("admin/", admin.site.urls),
+    path("api/_stats/", ProfilingStatsView.as_view(), name="profiling-stats"),
+    path("api/async/workers/", workers_list, name="workers-async-list"),
+    path("api/async/workers/<int:pk>/", workers_detail, name="workers-async-detail"),
     path("api/", include(r.urls)),
 ]
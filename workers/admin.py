@@ -1,9 +1,104 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.core.paginator import Paginator
+from django.db import router, transaction
+from django.forms import BaseModelFormSet, ModelChoiceField
+from django.utils.functional import cached_property
 from import_export.admin import ImportExportModelAdmin
 from import_export.formats import base_formats
 
-from workers.models import Worker
+from workers.cache import get_cache, get_version
+from workers.models import ImportJob, Worker, WorkerStats
 from workers.resourse import WorkersResources
+from workers.search import search_workers
+
+# Параметры changelist, которые не фильтруют выборку
+PAGE_PARAMS = {"p", "o"}
+
+
+class ScalePaginator(Paginator):
+    """Пагинатор без COUNT(*) по всей выборке.
+
+    Число строк берётся готовым (``known_count``) или считается не дальше
+    WORKERS_ADMIN_COUNT_CAP: страницы после предела недоступны, выборку
+    нужно сузить фильтром или поиском.
+    """
+
+    def __init__(self, *args, known_count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        return self.object_list[: settings.WORKERS_ADMIN_COUNT_CAP].count()
+
+
+class PreloadedPkField(ModelChoiceField):
+    """Скрытое поле pk формы list_editable.
+
+    Объект строки формсет уже загрузил одной выборкой, стандартное поле
+    проверяло бы каждый pk отдельным запросом.
+    """
+
+    def __init__(self, *args, instance, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance = instance
+
+    def to_python(self, value):
+        if value not in self.empty_values and str(value) == str(self.instance.pk):
+            return self.instance
+        return super().to_python(value)
+
+
+class PreloadedModelFormSet(BaseModelFormSet):
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        if form.is_bound and not form.instance._state.adding:
+            field = form.fields[self._pk_field.name]
+            form.fields[self._pk_field.name] = PreloadedPkField(
+                field.queryset,
+                instance=form.instance,
+                initial=field.initial,
+                widget=field.widget,
+                required=field.required,
+            )
+
+
+class PositionListFilter(admin.SimpleListFilter):
+    """Фильтр по должности без SELECT DISTINCT по таблице сотрудников.
+
+    Варианты берутся из WorkerStats и кэшируются под версией данных, любая
+    запись в сотрудников их инвалидирует.
+    """
+
+    title = "должность"
+    parameter_name = "position"
+
+    def lookups(self, request, model_admin):
+        cache = get_cache()
+        version, _ = get_version()
+        key = f"workers:{version}:admin:positions"
+        positions = cache.get(key)
+        if positions is None:
+            positions = list(
+                WorkerStats.objects.filter(count__gt=0)
+                .order_by("position")
+                .values_list("position", flat=True)
+                .distinct()
+            )
+            cache.set(key, positions)
+        return [(position, position or "-") for position in positions]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        return queryset.filter(position=self.value())
 
 
 @admin.register(Worker)
@@ -22,8 +117,121 @@ class WorkerAdmin(ImportExportModelAdmin):
     list_filter = ["is_active", "position", "hired_date"]
     search_fields = ["first_name", "middle_name", "last_name", "email"]
     list_editable = ["is_active"]
+    autocomplete_fields = ["created_by"]
+
+    @property
+    def show_full_result_count(self):
+        return not settings.WORKERS_ADMIN_SCALE_MODE
+
+    def get_list_filter(self, request):
+        if not settings.WORKERS_ADMIN_SCALE_MODE:
+            return self.list_filter
+        return ["is_active", PositionListFilter, "hired_date"]
+
+    def get_paginator(
+        self, request, queryset, per_page, orphans=0, allow_empty_first_page=True
+    ):
+        if not settings.WORKERS_ADMIN_SCALE_MODE:
+            return super().get_paginator(
+                request, queryset, per_page, orphans, allow_empty_first_page
+            )
+        return ScalePaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            known_count=self.get_stats_count(request),
+        )
+
+    def get_stats_count(self, request):
+        """Точное число строк из WorkerStats, если фильтры это позволяют.
+
+        Подходят только фильтры по активности и должности без поиска, для
+        остальных выборок возвращается None.
+        """
+        groups = WorkerStats.objects.all()
+        for name, value in request.GET.items():
+            if name in PAGE_PARAMS:
+                continue
+            if name == "is_active__exact" and value in ("0", "1"):
+                groups = groups.filter(is_active=value == "1")
+            elif name == "position":
+                groups = groups.filter(position=value)
+            else:
+                return None
+        return sum(groups.values_list("count", flat=True))
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_workers(queryset, search_term), False
 
     def get_import_resource_kwargs(self, request, *args, **kwargs):
         kwargs = super().get_import_resource_kwargs(request, *args, **kwargs)
         kwargs["user"] = request.user
         return kwargs
+
+    def get_changelist_formset(self, request, **kwargs):
+        kwargs.setdefault("formset", PreloadedModelFormSet)
+        return super().get_changelist_formset(request, **kwargs)
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != "POST" or "_save" not in request.POST:
+            return super().changelist_view(request, extra_context)
+        # Изменения is_active и записи журнала копятся в save_model и
+        # log_change и пишутся пачкой в той же транзакции
+        request._pending_workers = []
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            response = super().changelist_view(request, extra_context)
+            self.save_pending(request, request._pending_workers)
+        return response
+
+    def save_model(self, request, obj, form, change):
+        pending = getattr(request, "_pending_workers", None)
+        if pending is not None and change and set(form.changed_data) <= {"is_active"}:
+            pending.append([obj, None])
+        else:
+            super().save_model(request, obj, form, change)
+
+    def log_change(self, request, obj, message):
+        pending = getattr(request, "_pending_workers", None)
+        # changelist_view вызывает log_change сразу после save_model
+        if pending and pending[-1][0] is obj:
+            pending[-1][1] = message
+        else:
+            super().log_change(request, obj, message)
+
+    def save_pending(self, request, pending):
+        """Сохраняет отложенные изменения is_active одним upsert."""
+        if not pending:
+            return
+        Worker.objects.bulk_upsert(
+            [worker for worker, _ in pending], update_fields=["is_active"]
+        )
+
+        messages = defaultdict(list)
+        for worker, message in pending:
+            messages[json.dumps(message)].append(worker)
+        for message, logged in messages.items():
+            LogEntry.objects.log_actions(
+                user_id=request.user.pk,
+                queryset=logged,
+                action_flag=CHANGE,
+                change_message=message,
+            )
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = [
+        "file_name",
+        "status",
+        "imported",
+        "updated",
+        "skipped",
+        "errors",
+        "total",
+        "created_at",
+    ]
+    list_filter = ["status"]
+    readonly_fields = ["created_at", "started_at", "finished_at", "heartbeat_at"]
@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
 
 
 class WorkersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "workers"
+
+    def ready(self):
+        import workers.checks  # noqa: F401
+        import workers.signals  # noqa: F401
+        from workers.jobs import RECOVER_DISPATCH_UID, start_monitor_on_request
+
+        if settings.WORKERS_IMPORT_JOB_RECOVER_ON_START:
+            request_started.connect(
+                start_monitor_on_request, dispatch_uid=RECOVER_DISPATCH_UID
+            )
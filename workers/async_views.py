@@ -0,0 +1,143 @@
+"""Асинхронные list и retrieve сотрудников для запуска под ASGI.
+
+Ответы совпадают с WorkersViewSet, но запросы к БД идут через async ORM
+(``acount``, ``aiterator``, ``aget``). Драйверы БД в Django синхронные,
+поэтому async ORM сам выполняет запросы через sync_to_async в потоке:
+выигрыш в том, что событийный цикл не блокируется и держит много
+медленных клиентов, а не в отсутствии потоков.
+Аутентификация - тот же токен и тот же кэш, что у CachedTokenAuthentication.
+"""
+
+import math
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_GET
+from django_filters.filterset import filterset_factory
+from django_filters.rest_framework import FilterSet
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from workers.authentication import token_cache_key
+from workers.cache import get_cache
+from workers.models import Worker
+from workers.search import search_workers
+from workers.serializers import WorkerDetailSerializer, WorkerSerializer
+
+# Тот же FilterSet, что строит DjangoFilterBackend для WorkersViewSet
+WorkerFilterSet = filterset_factory(
+    Worker, filterset=FilterSet, fields=["id", "is_active", "position"]
+)
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        orjson.dumps(data), status=status, content_type="application/json"
+    )
+
+
+def error_response(detail, status):
+    response = json_response({"detail": str(detail)}, status=status)
+    if status == 401:
+        response["WWW-Authenticate"] = "Token"
+    return response
+
+
+async def authenticate(request):
+    """Устанавливает request.user, при ошибке возвращает ответ 401."""
+    auth = request.headers.get("Authorization", "").split()
+    if not auth or auth[0].lower() != "token":
+        return error_response(NotAuthenticated.default_detail, 401)
+    if len(auth) != 2:
+        return error_response(_("Invalid token header."), 401)
+
+    cache = get_cache()
+    key = token_cache_key(auth[1])
+    credentials = await cache.aget(key)
+    if credentials is None:
+        try:
+            token = await Token.objects.select_related("user").aget(key=auth[1])
+        except Token.DoesNotExist:
+            return error_response(_("Invalid token."), 401)
+        if not token.user.is_active:
+            return error_response(_("User inactive or deleted."), 401)
+        credentials = (token.user, token)
+        await cache.aset(key, credentials, settings.WORKERS_TOKEN_CACHE_TIMEOUT)
+    request.user = credentials[0]
+
+
+def get_page_number(request, num_pages):
+    value = request.GET.get("page") or 1
+    if value == "last":
+        return num_pages
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if 1 <= number <= num_pages else None
+
+
+def page_link(request, number, num_pages):
+    if number < 1 or number > num_pages:
+        return None
+    url = request.build_absolute_uri()
+    if number == 1:
+        return remove_query_param(url, "page")
+    return replace_query_param(url, "page", number)
+
+
+@require_GET
+async def workers_list(request):
+    error = await authenticate(request)
+    if error:
+        return error
+
+    filterset = WorkerFilterSet(request.GET, queryset=Worker.objects.all())
+    if not filterset.is_valid():
+        return json_response(filterset.errors, status=400)
+    queryset = filterset.qs
+    query = request.GET.get("q", "").strip()
+    if query:
+        # На SQLite поиск выполняет запрос к FTS через курсор
+        queryset = await sync_to_async(search_workers)(queryset, query)
+
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+    number = get_page_number(request, num_pages)
+    if number is None:
+        return error_response(_("Invalid page."), 404)
+
+    fields = WorkerSerializer.values_fields()
+    offset = (number - 1) * page_size
+    # values(), а не values_list(): итератор values_list в Django выполняет
+    # запрос ещё до перехода в поток и падает в async-контексте
+    rows = queryset.values(*fields)[offset : offset + page_size]
+    results = [row async for row in rows.aiterator()]
+    return json_response(
+        {
+            "count": count,
+            "next": page_link(request, number + 1, num_pages),
+            "previous": page_link(request, number - 1, num_pages),
+            "results": results,
+        }
+    )
+
+
+@require_GET
+async def workers_detail(request, pk):
+    error = await authenticate(request)
+    if error:
+        return error
+
+    try:
+        worker = await Worker.objects.aget(pk=pk)
+    except Worker.DoesNotExist:
+        # То же сообщение, что у get_object_or_404 в WorkersViewSet
+        return error_response("No Worker matches the given query.", 404)
+    # Все поля сериализатора берутся из объекта без запросов к БД
+    return json_response(WorkerDetailSerializer(worker).data)
@@ -0,0 +1,40 @@
+import hashlib
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from workers.cache import get_cache
+
+
+def token_cache_key(key):
+    # В ключе кэша хэш, а не сам токен
+    return f"workers:token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def invalidate_token(key):
+    get_cache().delete(token_cache_key(key))
+
+
+def invalidate_user(user_id):
+    keys = Token.objects.filter(user_id=user_id).values_list("key", flat=True)
+    get_cache().delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication, который кэширует пару (пользователь, токен).
+
+    Записи живут WORKERS_TOKEN_CACHE_TIMEOUT секунд в кэше сотрудников
+    (размер ограничен его MAX_ENTRIES) и удаляются сигналами при удалении
+    токена и при любом изменении пользователя, в том числе деактивации.
+    Неверные токены не кэшируются.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_cache()
+        cache_key = token_cache_key(key)
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            cache.set(cache_key, credentials, settings.WORKERS_TOKEN_CACHE_TIMEOUT)
+        return credentials
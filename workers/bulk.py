@@ -0,0 +1,147 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from workers.models import Worker
+from workers.serializers import BulkOperationSerializer
+
+logger = logging.getLogger(__name__)
+
+UPDATE_FIELDS = [
+    "first_name",
+    "middle_name",
+    "last_name",
+    "email",
+    "position",
+    "is_active",
+]
+
+STATUSES = {"create": "created", "update": "updated", "deactivate": "deactivated"}
+
+
+def _validate(operations):
+    """Проверяет поля каждой операции, для ошибочных возвращает None."""
+    # Один экземпляр на весь пакет, как в ListSerializer: поля
+    # ModelSerializer строятся один раз
+    serializer = BulkOperationSerializer()
+    validated, errors = [], {}
+    for index, operation in enumerate(operations):
+        try:
+            validated.append(serializer.run_validation(operation))
+        except ValidationError as e:
+            validated.append(None)
+            errors[index] = e.detail
+    return validated, errors
+
+
+def _load_workers(operations):
+    """Одним запросом загружает всех сотрудников, упомянутых в пакете."""
+    operations = [operation for operation in operations if operation]
+    ids = {operation["id"] for operation in operations if "id" in operation}
+    emails = {operation["email"] for operation in operations if "email" in operation}
+    # Блокировка до конца транзакции: удалённого после выборки сотрудника
+    # upsert по id вставил бы заново
+    workers = Worker.objects.select_for_update().filter(
+        Q(id__in=ids) | Q(email__in=emails)
+    )
+    by_id = {worker.id: worker for worker in workers}
+    by_email = {worker.email: worker for worker in by_id.values()}
+    return by_id, by_email
+
+
+def _plan(operations, user):
+    """Применяет операции к объектам в памяти.
+
+    Возвращает сотрудников для создания, для обновления и результаты по
+    каждой операции; при ошибках ничего не должно записываться.
+    """
+    operations, field_errors = _validate(operations)
+    by_id, by_email = _load_workers(operations)
+    # email -> индекс операции, которая его заняла в этом пакете
+    claimed_emails = {}
+    touched = {}
+    creates, updates, results = [], [], []
+
+    for index, operation in enumerate(operations):
+        if operation is None:
+            errors = field_errors[index]
+            results.append({"index": index, "status": "error", "errors": errors})
+            continue
+
+        op = operation["op"]
+        fields = {
+            key: value for key, value in operation.items() if key in UPDATE_FIELDS
+        }
+        email = fields.get("email")
+        errors = {}
+
+        if op == "create":
+            worker = Worker(**fields, created_by=user)
+        else:
+            key = "id" if "id" in operation else "email"
+            worker = (by_id if key == "id" else by_email).get(operation[key])
+            if worker is None:
+                errors[key] = ["Сотрудник не найден"]
+            elif worker.pk in touched:
+                errors[key] = [f"Сотрудник уже изменён операцией {touched[worker.pk]}"]
+            if key == "email":
+                # email здесь - ключ поиска, а не новое значение
+                email = None
+                fields.pop("email")
+
+        if email is not None:
+            owner = by_email.get(email)
+            if (owner is not None and owner is not worker) or email in claimed_emails:
+                errors["email"] = ["Сотрудник с таким email уже существует"]
+
+        if errors:
+            results.append({"index": index, "status": "error", "errors": errors})
+            continue
+
+        if op == "create":
+            creates.append(worker)
+        else:
+            touched[worker.pk] = index
+            if op == "deactivate":
+                worker.is_active = False
+            else:
+                for field, value in fields.items():
+                    setattr(worker, field, value)
+            updates.append(worker)
+        if email is not None:
+            claimed_emails[email] = index
+        results.append({"index": index, "status": STATUSES[op], "worker": worker})
+
+    return creates, updates, results
+
+
+def apply_operations(operations, user):
+    """Проверяет и записывает пакет операций над сотрудниками.
+
+    ``operations`` - список словарей из JSON запроса.
+    Пакет применяется целиком в одной транзакции или не применяется вовсе.
+    Запросов на каждую операцию нет: один SELECT, затем INSERT новых
+    и upsert изменённых сотрудников пачками по лимиту параметров БД.
+    Возвращает (успех, результаты по операциям).
+    """
+    with transaction.atomic():
+        creates, updates, results = _plan(operations, user)
+        if any(result["status"] == "error" for result in results):
+            for result in results:
+                if result.pop("worker", None) is not None:
+                    result["status"] = "valid"
+            return False, results
+
+        Worker.objects.bulk_upsert(creates)
+        Worker.objects.bulk_upsert(updates, update_fields=UPDATE_FIELDS)
+
+    for result in results:
+        result["id"] = result.pop("worker").pk
+    logger.info(
+        "Пакетная запись сотрудников: создано %s, изменено %s",
+        len(creates),
+        len(updates),
+    )
+    return True, results
@@ -0,0 +1,121 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from workers.routers import replica_may_lag
+
+VERSION_KEY = "workers:version"
+MODIFIED_KEY = "workers:modified"
+
+
+def get_cache():
+    return caches[settings.WORKERS_CACHE_ALIAS]
+
+
+def get_version():
+    """Текущая версия данных сотрудников и время её изменения."""
+    cache = get_cache()
+    values = cache.get_many([VERSION_KEY, MODIFIED_KEY])
+    if VERSION_KEY not in values:
+        # Начальное значение от времени, чтобы после вытеснения ключа
+        # версия не совпала с одной из уже использованных
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        cache.add(MODIFIED_KEY, time.time(), timeout=None)
+        values = cache.get_many([VERSION_KEY, MODIFIED_KEY])
+    # DummyCache ничего не хранит - кэширование просто отключено
+    return values.get(VERSION_KEY, 0), values.get(MODIFIED_KEY, time.time())
+
+
+def bump_version():
+    """Инвалидирует все закэшированные ответы по сотрудникам.
+
+    Внутри транзакции версия меняется только после коммита: иначе
+    параллельный GET успел бы прочитать ещё старые строки и закэшировать
+    их под новой версией и ETag.
+    """
+    transaction.on_commit(_bump_version)
+
+
+def _bump_version():
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+    cache.set(MODIFIED_KEY, time.time(), timeout=None)
+
+
+def _imported_file_key(digest):
+    version, _ = get_version()
+    return f"workers:{version}:file:{digest}"
+
+
+def get_imported_file(digest):
+    """Сводка импорта файла с этим хэшем, если данные с тех пор не менялись.
+
+    Ключ включает версию данных, поэтому любая запись в сотрудников делает
+    все запомненные файлы недействительными.
+    """
+    return get_cache().get(_imported_file_key(digest))
+
+
+def remember_imported_file(digest, summary):
+    get_cache().set(_imported_file_key(digest), summary, timeout=None)
+
+
+class CachedReadMixin:
+    """Read-through кэш ответов list/retrieve с ETag и Last-Modified.
+
+    Ключ строится из версии данных и запроса, поэтому любое изменение
+    сотрудников делает все старые записи недостижимыми. Условный GET
+    с совпавшим ETag получает 304 без обращения к БД и сериализатору.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cache_key(self, request, version):
+        query = sorted(request.query_params.lists())
+        raw = f"{self.action}:{request.get_host()}:{request.path}:{query}"
+        return f"workers:{version}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        version, modified = get_version()
+        key = self.get_cache_key(request, version)
+        etag = f'W/"{key.rsplit(":", 1)[-1]}-{version}"'
+
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=int(modified)
+        )
+        if response is None:
+            cache = get_cache()
+            data = cache.get(key)
+            if data is None:
+                response = handler(request, *args, **kwargs)
+                # Ответ из отстающей реплики под новой версией остался бы
+                # в кэше до её следующей смены
+                lagging = replica_may_lag(modified)
+                if response.status_code == status.HTTP_200_OK and not lagging:
+                    cache.set(key, response.data)
+            else:
+                response = Response(data)
+
+        # ETag ошибки (например, 404) клиент прислал бы в If-None-Match и
+        # получил бы 304 для несуществующего ресурса
+        if status.is_success(response.status_code) or (
+            response.status_code == status.HTTP_304_NOT_MODIFIED
+        ):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(modified)
+        patch_vary_headers(response, ["Accept", "Authorization"])
+        return response
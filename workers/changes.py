@@ -0,0 +1,73 @@
+"""Лента изменений сотрудников для инкрементальной синхронизации.
+
+Каждая запись сотрудника получает новый change_seq, удаление оставляет
+WorkerTombstone со своим номером. Потребитель хранит курсор и забирает
+только изменения после него.
+"""
+
+import heapq
+from itertools import islice
+
+from workers.models import ChangeSequence, Worker, WorkerTombstone
+from workers.serializers import WorkerDetailSerializer
+
+
+def get_changes(since, limit):
+    """Страница изменений с номером больше ``since``, не длиннее ``limit``.
+
+    Сотрудник, изменённый несколько раз, попадает в ленту один раз - с
+    текущим состоянием. Курсор ответа передаётся как ``since`` следующего
+    запроса.
+    """
+    # Номера до high закоммичены (выдаются и коммитятся по порядку), поэтому
+    # обе выборки ниже видят одно и то же множество изменений. Более
+    # поздние изменения придут со следующей страницей.
+    high = ChangeSequence.objects.values_list("value", flat=True).first() or 0
+    workers = Worker.objects.filter(
+        change_seq__gt=since, change_seq__lte=high
+    ).order_by("change_seq")[: limit + 1]
+    tombstones = WorkerTombstone.objects.filter(
+        change_seq__gt=since, change_seq__lte=high
+    ).order_by("change_seq")[: limit + 1]
+
+    items = list(
+        islice(
+            heapq.merge(
+                ((worker.change_seq, worker) for worker in workers),
+                ((tombstone.change_seq, tombstone) for tombstone in tombstones),
+                key=lambda item: item[0],
+            ),
+            limit + 1,
+        )
+    )
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    changes = []
+    for seq, item in items:
+        if isinstance(item, Worker):
+            changes.append(
+                {
+                    "seq": seq,
+                    "op": "upsert",
+                    "id": item.pk,
+                    "worker": WorkerDetailSerializer(item).data,
+                }
+            )
+        else:
+            changes.append(
+                {
+                    "seq": seq,
+                    "op": "delete",
+                    "id": item.worker_id,
+                    "email": item.email,
+                }
+            )
+
+    if has_more:
+        cursor = items[-1][0]
+    else:
+        # Всё до high уже отдано, пропуски номеров (перезаписанные
+        # изменения) потребителю больше не нужны
+        cursor = max(since, high)
+    return {"changes": changes, "cursor": cursor, "has_more": has_more}
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Бэкенды кэша, которые не видны другим процессам
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def check_replica_cache(app_configs, **kwargs):
+    """С репликами кэш workers должен быть общим для всех процессов.
+
+    В нём ReplicaRoutingMiddleware отмечает клиентов, которые только что
+    писали. С кэшем в памяти процесса следующий запрос, попавший в другой
+    процесс, прочитает из реплики и может не увидеть свою запись.
+    """
+    if not settings.WORKERS_DB_REPLICAS:
+        return []
+    backend = settings.CACHES[settings.WORKERS_CACHE_ALIAS]["BACKEND"]
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Error(
+            f"С DATABASE_REPLICAS нужен общий для процессов кэш, а не {backend}",
+            hint="Задайте WORKERS_CACHE_BACKEND, например "
+            "django.core.cache.backends.redis.RedisCache или "
+            "django.core.cache.backends.filebased.FileBasedCache",
+            id="workers.E001",
+        )
+    ]
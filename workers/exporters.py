@@ -0,0 +1,62 @@
+import csv
+import io
+import tempfile
+
+from django.conf import settings
+from openpyxl import Workbook
+
+from workers.resourse import WorkersResources
+
+# Колонки совпадают с импортом, чтобы выгрузку можно было загрузить обратно
+EXPORT_FIELDS = WorkersResources.Meta.fields
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def iter_rows(queryset, fields=EXPORT_FIELDS):
+    """Кортежи значений полей, читаемые из БД порциями."""
+    return (
+        queryset.order_by("id")
+        .values_list(*fields)
+        .iterator(chunk_size=settings.WORKERS_EXPORT_CHUNK_SIZE)
+    )
+
+
+def iter_csv(queryset, fields=EXPORT_FIELDS):
+    """Генератор CSV-текста, отдаётся порциями по WORKERS_EXPORT_CHUNK_SIZE строк."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM нужен, чтобы Excel открыл кириллицу в UTF-8
+    buffer.write("\ufeff")
+    writer.writerow(fields)
+
+    for i, row in enumerate(iter_rows(queryset, fields), 1):
+        writer.writerow(row)
+        if i % settings.WORKERS_EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_xlsx(queryset, fields=EXPORT_FIELDS):
+    """Собирает .xlsx во временном файле и возвращает его открытым.
+
+    Выгрузка не потоковая, в отличие от CSV: .xlsx - zip-архив, и первый
+    байт ответа уходит только после того, как собрана вся книга. Write-only
+    книга openpyxl сбрасывает строки на диск, поэтому память всё равно
+    не зависит от числа сотрудников. Файл удаляется после закрытия.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Workers")
+    sheet.append(fields)
+    for row in iter_rows(queryset, fields):
+        sheet.append(row)
+
+    file = tempfile.TemporaryFile()
+    workbook.save(file)
+    file.seek(0)
+    return file
@@ -0,0 +1,209 @@
+import codecs
+import csv
+import hashlib
+import io
+import logging
+from itertools import islice
+
+import tablib
+import xlrd
+from django.conf import settings
+from django.db import transaction
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".xlsx", ".xls", ".csv", ".tsv")
+# Сколько байт начала CSV читается для определения кодировки и разделителя
+CSV_SAMPLE_SIZE = 64 * 1024
+CSV_DELIMITERS = ",;\t|"
+
+
+class UnsupportedFileFormat(ValueError):
+    pass
+
+
+def iter_xlsx_rows(file):
+    """Построчно читает первый лист .xlsx, не загружая его целиком в память."""
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+def _read_xls_cell(value, cell_type, datemode):
+    if cell_type == xlrd.XL_CELL_ERROR:
+        return xlrd.error_text_from_code[value]
+    if cell_type == xlrd.XL_CELL_DATE:
+        return xlrd.xldate.xldate_as_datetime(value, datemode)
+    return value
+
+
+def iter_xls_rows(file):
+    """Построчно читает первый лист .xls.
+
+    xlrd не умеет читать файл потоково, поэтому экономия здесь только на том,
+    что строки не копируются в tablib.Dataset целиком.
+    """
+    book = xlrd.open_workbook(file_contents=file.read(), on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        for i in range(sheet.nrows):
+            yield [
+                _read_xls_cell(value, cell_type, book.datemode)
+                for value, cell_type in zip(sheet.row_values(i), sheet.row_types(i))
+            ]
+    finally:
+        book.release_resources()
+
+
+def detect_encoding(sample):
+    """Кодировка CSV по началу файла: BOM, затем UTF-8, иначе запасная.
+
+    Запасная кодировка (WORKERS_IMPORT_CSV_FALLBACK_ENCODING, cp1251) -
+    выгрузки Excel и 1С в русской Windows.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        # "Текст Юникод" из Excel - TSV в UTF-16
+        return "utf-16"
+    try:
+        # Образец мог оборваться посреди символа, это не ошибка
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return settings.WORKERS_IMPORT_CSV_FALLBACK_ENCODING
+    return "utf-8"
+
+
+def detect_delimiter(sample, file_name):
+    # Последняя строка образца может быть неполной
+    lines = sample.splitlines()[:-1] or sample.splitlines()
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        return "\t" if file_name.lower().endswith(".tsv") else ","
+    return dialect.delimiter
+
+
+def iter_csv_rows(file):
+    """Построчно читает CSV/TSV из потока загрузки без file.read().
+
+    Кодировка и разделитель определяются по первым CSV_SAMPLE_SIZE байтам.
+    """
+    sample = file.read(CSV_SAMPLE_SIZE)
+    file.seek(0)
+    encoding = detect_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample)
+    delimiter = detect_delimiter(text, file.name)
+
+    stream = io.TextIOWrapper(file, encoding=encoding, newline="")
+    try:
+        yield from csv.reader(stream, delimiter=delimiter)
+    finally:
+        # Загруженный файл закрывает Django, а не обёртка
+        stream.detach()
+
+
+def is_supported(file_name):
+    return file_name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def iter_file_rows(file):
+    """Возвращает итератор строк файла импорта, первая строка - заголовки."""
+    name = file.name.lower()
+    if name.endswith(".xlsx"):
+        return iter_xlsx_rows(file)
+    if name.endswith(".xls"):
+        return iter_xls_rows(file)
+    if name.endswith((".csv", ".tsv")):
+        return iter_csv_rows(file)
+    raise UnsupportedFileFormat(file.name)
+
+
+def file_digest(file):
+    """SHA-256 содержимого загруженного файла, позиция чтения сбрасывается."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def is_blank_row(row):
+    return all(value is None or value == "" for value in row)
+
+
+def normalize_headers(row):
+    return ["" if value is None else str(value).strip() for value in row]
+
+
+def iter_datasets(rows, chunk_size, skip=0):
+    """Нарезает поток строк на tablib.Dataset фиксированного размера.
+
+    ``skip`` - сколько строк данных пропустить после заголовка.
+    """
+    rows = (row for row in rows if not is_blank_row(row))
+    headers = next(rows, None)
+    if headers is None:
+        return
+    headers = normalize_headers(headers)
+    width = len(headers)
+    rows = islice(rows, skip, None)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        dataset = tablib.Dataset(headers=headers)
+        for row in chunk:
+            row = list(row[:width])
+            row += [""] * (width - len(row))
+            dataset.append(row)
+        yield dataset
+
+
+def import_rows(resource, rows, chunk_size=None, skip=0, on_chunk=None, **kwargs):
+    """Импортирует строки порциями, каждая порция в отдельной транзакции.
+
+    ``on_chunk`` вызывается со сводкой по порции внутри её транзакции, так что
+    сохранённый в нём прогресс всегда совпадает с записанными данными.
+    Возвращает сводку в формате ответа ``import_workers``.
+    """
+    chunk_size = chunk_size or settings.WORKERS_IMPORT_CHUNK_SIZE
+    summary = {"imported": 0, "updated": 0, "skipped": 0, "errors": 0, "total": 0}
+
+    for dataset in iter_datasets(rows, chunk_size, skip=skip):
+        with transaction.atomic():
+            result = resource.import_data(
+                dataset, dry_run=False, raise_errors=False, **kwargs
+            )
+            chunk_summary = {"imported": 0, "updated": 0, "skipped": 0, "errors": 0}
+            if result.has_errors():
+                # Транзакция порции откатана целиком
+                chunk_summary["errors"] += result.totals.get("error", 0)
+                chunk_summary["errors"] += len(result.base_errors)
+            else:
+                chunk_summary["imported"] += result.totals.get("new", 0)
+                chunk_summary["updated"] += result.totals.get("update", 0)
+                chunk_summary["skipped"] += result.totals.get("skip", 0)
+            chunk_summary["total"] = result.total_rows
+            if on_chunk:
+                on_chunk(chunk_summary)
+
+        for key, value in chunk_summary.items():
+            summary[key] += value
+        # Одна запись на порцию вместо записи на каждую строку
+        logger.info(
+            "Импортирована порция: создано %s, обновлено %s, пропущено %s, "
+            "ошибок %s из %s",
+            chunk_summary["imported"],
+            chunk_summary["updated"],
+            chunk_summary["skipped"],
+            chunk_summary["errors"],
+            chunk_summary["total"],
+        )
+
+    return summary
@@ -0,0 +1,249 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from workers.cache import get_imported_file, remember_imported_file
+from workers.importers import file_digest, import_rows, iter_file_rows
+from workers.models import ImportJob
+from workers.resourse import BulkWorkersResources
+from workers.validation import validate_rows
+
+logger = logging.getLogger(__name__)
+
+RECOVER_DISPATCH_UID = "workers.recover_import_jobs"
+
+_executor = None
+_executor_lock = threading.Lock()
+_monitor = None
+# Отличает процессы с одинаковым pid после перезапуска контейнера
+_boot_id = uuid.uuid4().hex[:8]
+
+
+class JobClaimed(Exception):
+    """Задачу перехватил другой процесс, этот её больше не выполняет."""
+
+
+def get_owner():
+    return f"{socket.gethostname()}:{os.getpid()}:{_boot_id}"
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.WORKERS_IMPORT_JOB_THREADS,
+                thread_name_prefix="import-job",
+            )
+    return _executor
+
+
+def submit_job(job_id):
+    """Ставит задачу в пул после коммита транзакции, в которой она создана.
+
+    Задача закрепляется за этим процессом: пока он жив, монитор обновляет
+    её heartbeat и в очереди, и во время выполнения.
+    """
+    ImportJob.objects.filter(pk=job_id).update(
+        owner=get_owner(), heartbeat_at=timezone.now()
+    )
+    transaction.on_commit(lambda: get_executor().submit(run_job, job_id))
+    start_monitor()
+
+
+def run_job(job_id):
+    try:
+        _run_job(job_id)
+    except JobClaimed:
+        logger.warning("Задачу импорта %s выполняет другой процесс", job_id)
+    except Exception as e:
+        logger.exception("Ошибка фоновой задачи импорта %s", job_id)
+        _finish(job_id, ImportJob.Status.FAILED, error_message=str(e))
+    finally:
+        close_old_connections()
+
+
+def _run_job(job_id):
+    job = ImportJob.objects.select_related("created_by").get(pk=job_id)
+    if job.status in (ImportJob.Status.DONE, ImportJob.Status.FAILED):
+        return
+
+    # Задачу, которую уже перехватил другой процесс, не запускаем повторно
+    owner = get_owner()
+    claimed = ImportJob.objects.filter(pk=job_id, owner=owner).update(
+        status=ImportJob.Status.RUNNING,
+        started_at=job.started_at or timezone.now(),
+        heartbeat_at=timezone.now(),
+        attempts=F("attempts") + 1,
+    )
+    if not claimed:
+        raise JobClaimed(job_id)
+
+    def on_chunk(summary):
+        # Вызывается в транзакции порции: если задачу перехватили, порция
+        # откатывается и импорт останавливается
+        updated = ImportJob.objects.filter(pk=job_id, owner=owner).update(
+            heartbeat_at=timezone.now(),
+            **{key: F(key) + value for key, value in summary.items()},
+        )
+        if not updated:
+            raise JobClaimed(job_id)
+
+    report = None
+    with job.file.open("rb") as file:
+        digest = file_digest(file)
+        unchanged = not job.total and get_imported_file(digest)
+        if unchanged:
+            on_chunk({"skipped": unchanged["total"], "total": unchanged["total"]})
+        else:
+            # Как и при синхронном импорте, файл с ошибками не импортируется.
+            # После перезапуска файл уже проверен: импорт начался
+            if not job.total:
+                report = validate_rows(iter_file_rows(file))
+                file.seek(0)
+            if report is None or report["valid"]:
+                # Порции до job.total уже закоммичены вместе с прогрессом,
+                # поэтому после перезапуска импорт продолжается с этого места
+                summary = import_rows(
+                    BulkWorkersResources(),
+                    iter_file_rows(file),
+                    skip=job.total,
+                    on_chunk=on_chunk,
+                    user=job.created_by,
+                )
+                if not job.total and not summary["errors"]:
+                    remember_imported_file(digest, summary)
+
+    if report and not report["valid"]:
+        _reject(job_id, report)
+        return
+    _finish(job_id, ImportJob.Status.DONE)
+    logger.info("Фоновый импорт %s завершен", job_id)
+
+
+def _reject(job_id, report):
+    ImportJob.objects.filter(pk=job_id).update(
+        errors=report["error_count"], total=report["total"]
+    )
+    first = report["errors"][0]
+    _finish(
+        job_id,
+        ImportJob.Status.FAILED,
+        error_message=f"Файл содержит ошибки: {report['error_count']}, первая - "
+        f"строка {first['row']}, {first['field']}: {first['message']}",
+    )
+    logger.warning(
+        "Фоновый импорт %s отклонён: %s ошибок", job_id, report["error_count"]
+    )
+
+
+def _finish(job_id, status, error_message=""):
+    job = ImportJob.objects.get(pk=job_id)
+    job.status = status
+    job.error_message = error_message
+    job.finished_at = timezone.now()
+    if job.file:
+        job.file.delete(save=False)
+    job.save(update_fields=["status", "error_message", "finished_at", "file"])
+
+
+def recover_jobs():
+    """Подхватывает задачи, брошенные остановленным процессом.
+
+    Задача считается брошенной, если её heartbeat не обновлялся дольше
+    WORKERS_IMPORT_JOB_STALE_SECONDS: живой владелец обновляет его каждые
+    WORKERS_IMPORT_JOB_HEARTBEAT_SECONDS. Такие задачи перезапускаются с
+    места остановки, а после WORKERS_IMPORT_JOB_MAX_ATTEMPTS попыток
+    помечаются как упавшие.
+    """
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.WORKERS_IMPORT_JOB_STALE_SECONDS
+    )
+    stale = ImportJob.objects.filter(
+        status__in=[ImportJob.Status.PENDING, ImportJob.Status.RUNNING],
+        heartbeat_at__lt=cutoff,
+    ).exclude(owner=get_owner())
+    recovered = 0
+    for job in stale:
+        # Условный UPDATE не даёт двум процессам захватить одну задачу
+        claimed = ImportJob.objects.filter(
+            pk=job.pk, heartbeat_at=job.heartbeat_at, owner=job.owner
+        ).update(heartbeat_at=timezone.now(), owner=get_owner())
+        if not claimed:
+            continue
+
+        if job.attempts >= settings.WORKERS_IMPORT_JOB_MAX_ATTEMPTS:
+            _finish(job.pk, ImportJob.Status.FAILED, "Превышено число попыток")
+        elif not job.file or not job.file.storage.exists(job.file.name):
+            _finish(job.pk, ImportJob.Status.FAILED, "Файл импорта не найден")
+        else:
+            logger.warning("Возобновление задачи импорта %s", job.pk)
+            submit_job(job.pk)
+        recovered += 1
+    return recovered
+
+
+def heartbeat_jobs():
+    """Обновляет heartbeat задач этого процесса, включая ожидающие в очереди."""
+    return ImportJob.objects.filter(
+        owner=get_owner(),
+        status__in=[ImportJob.Status.PENDING, ImportJob.Status.RUNNING],
+    ).update(heartbeat_at=timezone.now())
+
+
+def monitor_jobs():
+    """Один проход монитора: heartbeat своих задач и поиск брошенных."""
+    try:
+        heartbeat_jobs()
+        recovered = recover_jobs()
+    except DatabaseError:
+        logger.exception("Не удалось восстановить задачи импорта")
+        return
+    finally:
+        close_old_connections()
+    if recovered:
+        logger.warning("Восстановлено задач импорта: %s", recovered)
+
+
+def _monitor_loop():
+    while True:
+        monitor_jobs()
+        time.sleep(settings.WORKERS_IMPORT_JOB_HEARTBEAT_SECONDS)
+
+
+def start_monitor():
+    """Запускает фоновый поток монитора задач, один на процесс."""
+    global _monitor
+    if not settings.WORKERS_IMPORT_JOB_RECOVER_ON_START:
+        return
+    with _executor_lock:
+        if _monitor is None or _monitor.pid != os.getpid():
+            thread = threading.Thread(
+                target=_monitor_loop, name="import-job-monitor", daemon=True
+            )
+            # После fork поток родителя в дочернем процессе не работает
+            thread.pid = os.getpid()
+            thread.start()
+            _monitor = thread
+
+
+def start_monitor_on_request(**kwargs):
+    """Обработчик request_started: запускает монитор при первом запросе.
+
+    Монитор периодически, а не один раз при старте, ищет брошенные задачи:
+    после быстрого перезапуска задачи прежнего процесса становятся
+    брошенными позже первой проверки.
+    """
+    request_started.disconnect(dispatch_uid=RECOVER_DISPATCH_UID)
+    start_monitor()
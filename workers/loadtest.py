@@ -0,0 +1,302 @@
+"""Нагрузочный тест запущенного экземпляра: manage.py loadtest.
+
+Клиенты - корутины asyncio с общим пулом соединений httpx. Каждый клиент
+до конца теста выбирает сценарий по весам из смеси и выполняет запрос к
+/api/workers/ с токеном своего пользователя.
+"""
+
+import asyncio
+import csv
+import io
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import httpx
+from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
+from rest_framework.authtoken.models import Token
+
+from workers.models import Worker
+
+API = "/api/workers/"
+SCENARIOS = ("list", "filtered", "retrieve", "create", "patch", "import")
+DEFAULT_MIX = {
+    "list": 40,
+    "filtered": 20,
+    "retrieve": 20,
+    "create": 8,
+    "patch": 10,
+    "import": 2,
+}
+# Сколько id сотрудников берётся для retrieve и patch
+ID_POOL_SIZE = 1000
+
+
+def parse_mix(value):
+    """Разбирает смесь вида ``list=40,create=5``, сценарии без веса - 0."""
+    mix = dict.fromkeys(SCENARIOS, 0)
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in mix:
+            raise ValueError(f"Неизвестный сценарий: {name}")
+        try:
+            mix[name] = int(weight)
+        except ValueError:
+            raise ValueError(f"Вес сценария {name} должен быть целым числом")
+        if mix[name] < 0:
+            raise ValueError(f"Вес сценария {name} меньше нуля")
+    if not any(mix.values()):
+        raise ValueError("Все веса сценариев равны нулю")
+    return mix
+
+
+def usernames(count, prefix="loadtest"):
+    return [f"{prefix}-{number}" for number in range(1, count + 1)]
+
+
+def create_tokens(count, prefix="loadtest"):
+    """Создаёт staff-пользователей теста и возвращает их вместе с токенами.
+
+    Имена уникальны для запуска (``loadtest-<id запуска>-N``): пользователи
+    прошлых или параллельных запусков и одноимённые учётные записи не
+    затрагиваются ни здесь, ни в delete_users.
+    """
+    users, tokens = [], []
+    for username in usernames(count, f"{prefix}-{uuid.uuid4().hex[:8]}"):
+        user = User(username=username, is_staff=True)
+        user.set_unusable_password()
+        user.save()
+        users.append(user)
+        tokens.append(Token.objects.create(user=user).key)
+    return users, tokens
+
+
+def delete_users(users):
+    """Удаляет токены и пользователей, созданных create_tokens.
+
+    Пользователь, который создавал сотрудников, остаётся (Worker.created_by
+    защищён от удаления), но без токена, staff и возможности войти.
+    Возвращает число удалённых и оставленных пользователей.
+    """
+    users = User.objects.filter(pk__in=[user.pk for user in users])
+    Token.objects.filter(user__in=users).delete()
+    authors = users.filter(Exists(Worker.objects.filter(created_by=OuterRef("pk"))))
+    kept = authors.update(is_active=False, is_staff=False)
+    deleted = users.filter(is_active=True).delete()[1].get(User._meta.label, 0)
+    return deleted, kept
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    def add(self, scenario, seconds, status, ok):
+        self.latencies[scenario].append(seconds)
+        self.statuses[scenario][status] += 1
+        if not ok:
+            self.errors[scenario] += 1
+
+    def summary(self, latencies, statuses, errors, duration):
+        requests = len(latencies)
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            "requests": requests,
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "throughput_rps": round(requests / duration, 2),
+            "p50_ms": ms(percentile(latencies, 50)),
+            "p95_ms": ms(percentile(latencies, 95)),
+            "p99_ms": ms(percentile(latencies, 99)),
+            "statuses": {str(status): count for status, count in statuses.items()},
+        }
+
+    def report(self, duration):
+        endpoints = {
+            scenario: self.summary(
+                self.latencies[scenario],
+                self.statuses[scenario],
+                self.errors[scenario],
+                duration,
+            )
+            for scenario in SCENARIOS
+            if scenario in self.latencies
+        }
+        statuses = Counter()
+        for counter in self.statuses.values():
+            statuses.update(counter)
+        total = self.summary(
+            [value for values in self.latencies.values() for value in values],
+            statuses,
+            sum(self.errors.values()),
+            duration,
+        )
+        return {"total": total, "endpoints": endpoints}
+
+
+class LoadTest:
+    def __init__(self, url, tokens, mix, import_rows=100, timeout=30, seed=None):
+        self.url = url.rstrip("/")
+        self.tokens = tokens
+        self.mix = mix
+        self.import_rows = import_rows
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        # Уникальная часть email создаваемых сотрудников
+        self.run_id = uuid.uuid4().hex[:8]
+        self.counter = 0
+        self.ids = []
+        self.positions = []
+        self.pages = 1
+        self.recorder = Recorder()
+
+    def next_number(self):
+        self.counter += 1
+        return self.counter
+
+    def headers(self, client_number):
+        token = self.tokens[client_number % len(self.tokens)]
+        return {"Authorization": f"Token {token}"}
+
+    def make_import_file(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["first_name", "last_name", "email", "position"])
+        batch = self.next_number()
+        for number in range(self.import_rows):
+            writer.writerow(
+                [
+                    "Нагрузка",
+                    f"Импорт {number}",
+                    f"import-{self.run_id}-{batch}-{number}@loadtest.local",
+                    "Loadtest",
+                ]
+            )
+        return buffer.getvalue().encode()
+
+    def build_request(self, scenario):
+        """Запрос сценария: (метод, путь, аргументы httpx, ожидаемый статус)."""
+        if scenario == "list":
+            page = self.random.randint(1, min(self.pages, 50))
+            return "GET", API, {"params": {"page": page}}, 200
+        if scenario == "filtered":
+            params = {"is_active": "true"}
+            if self.positions:
+                params["position"] = self.random.choice(self.positions)
+            return "GET", API, {"params": params}, 200
+        if scenario == "retrieve":
+            return "GET", f"{API}{self.random.choice(self.ids)}/", {}, 200
+        if scenario == "patch":
+            data = {"position": f"Loadtest {self.next_number()}"}
+            return "PATCH", f"{API}{self.random.choice(self.ids)}/", {"json": data}, 200
+        if scenario == "create":
+            data = {
+                "first_name": "Нагрузка",
+                "last_name": "Тест",
+                "email": f"create-{self.run_id}-{self.next_number()}@loadtest.local",
+            }
+            return "POST", API, {"json": data}, 201
+        files = {"file": ("loadtest.csv", self.make_import_file(), "text/csv")}
+        return "POST", f"{API}import/", {"files": files}, 200
+
+    async def prepare(self, client):
+        """Запоминает id сотрудников и должности, при пустой базе создаёт."""
+        headers = self.headers(0)
+        response = await client.get(
+            API,
+            params={"pagination": "cursor", "page_size": ID_POOL_SIZE},
+            headers=headers,
+        )
+        response.raise_for_status()
+        self.ids = [worker["id"] for worker in response.json()["results"]]
+        if not self.ids and (self.mix["retrieve"] or self.mix["patch"]):
+            for _ in range(10):
+                _, path, kwargs, _ = self.build_request("create")
+                response = await client.post(path, headers=headers, **kwargs)
+                response.raise_for_status()
+                self.ids.append(response.json()["id"])
+
+        response = await client.get(API, headers=headers)
+        response.raise_for_status()
+        page = response.json()
+        if page["results"]:
+            self.pages = -(-page["count"] // len(page["results"]))
+
+        response = await client.get(f"{API}stats/", headers=headers)
+        if response.status_code == 200:
+            self.positions = [
+                group["position"]
+                for group in response.json()["by_position"]
+                if group["position"]
+            ]
+
+    async def run_client(self, client, client_number, deadline):
+        scenarios = list(self.mix)
+        weights = list(self.mix.values())
+        headers = self.headers(client_number)
+        while time.monotonic() < deadline:
+            scenario = self.random.choices(scenarios, weights)[0]
+            method, path, kwargs, expected = self.build_request(scenario)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, headers=headers, **kwargs)
+            except httpx.HTTPError as e:
+                status, ok = type(e).__name__, False
+            else:
+                status, ok = response.status_code, response.status_code == expected
+                if ok and scenario == "create":
+                    self.ids.append(response.json()["id"])
+            self.recorder.add(scenario, time.perf_counter() - start, status, ok)
+
+    async def run(self, clients, duration):
+        limits = httpx.Limits(
+            max_connections=clients, max_keepalive_connections=clients
+        )
+        async with httpx.AsyncClient(
+            base_url=self.url, limits=limits, timeout=self.timeout
+        ) as client:
+            await self.prepare(client)
+            started_at = datetime.now(timezone.utc)
+            start = time.monotonic()
+            deadline = start + duration
+            await asyncio.gather(
+                *(
+                    self.run_client(client, number, deadline)
+                    for number in range(clients)
+                )
+            )
+            elapsed = time.monotonic() - start
+
+        return {
+            "meta": {
+                "url": self.url,
+                "started_at": started_at.isoformat(),
+                "duration_s": round(elapsed, 3),
+                "clients": clients,
+                "users": len(self.tokens),
+                "mix": self.mix,
+                "import_rows": self.import_rows,
+            },
+            **self.recorder.report(elapsed),
+        }
+
+
+def run_loadtest(url, tokens, mix, clients, duration, **kwargs):
+    """Запускает тест и возвращает отчёт (словарь, готовый для JSON)."""
+    return asyncio.run(LoadTest(url, tokens, mix, **kwargs).run(clients, duration))
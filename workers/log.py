@@ -0,0 +1,146 @@
+"""Запись логов в файл из фонового потока.
+
+Поток запроса или импорта только подставляет аргументы в сообщение и
+кладёт запись в очередь: ни форматтера, ни обращения к диску в нём нет.
+Слушатель забирает записи пачками, форматирует их и пишет пачку в файл
+одним write.
+"""
+
+import logging
+import os
+import queue
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+
+# Хэндлеры процесса, слушателей которых нужно перезапустить после fork
+_handlers = weakref.WeakSet()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler, который копит строки до flush.
+
+    flush вызывает BatchQueueListener в конце пачки и пишет все строки
+    одним write, поэтому в файл попадают только целые записи.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buffer = []
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if self.buffer:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write("".join(self.buffer))
+                self.buffer.clear()
+            if self.stream is not None:
+                self.stream.flush()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class BatchQueueListener(QueueListener):
+    def __init__(self, queue, *handlers, batch_size=500):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        # Как QueueListener._monitor, но после блокирующего get забирает
+        # из очереди всё накопленное (до batch_size) и делает один flush
+        has_task_done = hasattr(self.queue, "task_done")
+        stopped = False
+        while not stopped:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stopped = True
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    self.queue.task_done()
+            for handler in self.handlers:
+                handler.flush()
+
+    def stop(self):
+        # logging.shutdown закрывает хэндлер при выходе, а close можно
+        # вызвать и раньше - повторная остановка ничего не делает
+        if self._thread is not None:
+            super().stop()
+
+
+class BatchQueueHandler(QueueHandler):
+    """Хэндлер для LOGGING: пишет в ``filename`` через фоновый поток.
+
+    Поток запускается при создании хэндлера и останавливается в close
+    (logging.shutdown при выходе из процесса), дописав очередь. В процессе,
+    созданном fork (gunicorn --preload), поток запускается заново.
+    """
+
+    def __init__(self, filename, batch_size=500, encoding="utf-8"):
+        super().__init__(queue.SimpleQueue())
+        self.target = BufferedFileHandler(filename, encoding=encoding, delay=True)
+        self.listener = BatchQueueListener(
+            self.queue, self.target, batch_size=batch_size
+        )
+        self.listener.start()
+        _handlers.add(self)
+
+    def setFormatter(self, fmt):
+        # Форматирует слушатель, поэтому форматтер нужен целевому хэндлеру
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Аргументы подставляются сразу: к моменту, когда запись дойдёт до
+        # слушателя, изменяемый аргумент мог уже поменяться. Форматтер
+        # (время, трейсбек) применяет слушатель. Копия не нужна: очередь
+        # внутри процесса, а текст сообщения для других хэндлеров тот же
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def restart_after_fork(self):
+        """Запускает слушатель в дочернем процессе после fork.
+
+        Потоки через fork не переходят, а очередь могла скопироваться с
+        захваченной блокировкой, поэтому очередь и слушатель создаются
+        заново. Строки из буфера родителя допишет сам родитель.
+        """
+        if self.listener._thread is None:
+            return
+        self.queue = queue.SimpleQueue()
+        self.target.buffer.clear()
+        self.listener = BatchQueueListener(
+            self.queue, self.target, batch_size=self.listener.batch_size
+        )
+        self.listener.start()
+
+    def close(self):
+        _handlers.discard(self)
+        self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+def _restart_after_fork():
+    for handler in list(_handlers):
+        handler.restart_after_fork()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,103 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from workers.loadtest import (
+    DEFAULT_MIX,
+    create_tokens,
+    delete_users,
+    parse_mix,
+    run_loadtest,
+)
+
+DEFAULT_MIX_ARG = ",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест запущенного экземпляра: N параллельных клиентов "
+        "выполняют смесь запросов к /api/workers/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--clients", type=int, default=10)
+        parser.add_argument(
+            "--duration", type=float, default=30, help="Длительность в секундах"
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=5,
+            help="Сколько тестовых пользователей с токенами создать",
+        )
+        parser.add_argument(
+            "--mix",
+            default=DEFAULT_MIX_ARG,
+            help="Веса сценариев list, filtered, retrieve, create, patch, import",
+        )
+        parser.add_argument(
+            "--keep-users",
+            action="store_true",
+            help="Не удалять тестовых пользователей и их токены после теста",
+        )
+        parser.add_argument("--import-rows", type=int, default=100)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("--output", help="Файл для отчёта в JSON")
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options["clients"] < 1 or options["users"] < 1:
+            raise CommandError("--clients и --users должны быть больше 0")
+
+        # Токены создаются в базе из настроек: экземпляр под нагрузкой
+        # должен работать с той же базой
+        users, tokens = create_tokens(options["users"])
+        self.stdout.write(
+            f"{options['clients']} клиентов, {options['duration']} с, {options['url']}"
+        )
+        try:
+            report = run_loadtest(
+                options["url"],
+                tokens,
+                mix,
+                options["clients"],
+                options["duration"],
+                import_rows=options["import_rows"],
+                timeout=options["timeout"],
+                seed=options["seed"],
+            )
+        finally:
+            # Staff-пользователи с рабочими токенами не должны оставаться в базе
+            if options["keep_users"]:
+                self.stdout.write(
+                    f"Пользователи {users[0].username}..{users[-1].username} "
+                    "и их токены оставлены в базе"
+                )
+            else:
+                deleted, kept = delete_users(users)
+                self.stdout.write(
+                    f"Удалено тестовых пользователей: {deleted}, отключено "
+                    f"(создавали сотрудников): {kept}"
+                )
+
+        rows = [*report["endpoints"].items(), ("total", report["total"])]
+        for name, metrics in rows:
+            if not metrics["requests"]:
+                continue
+            self.stdout.write(
+                f"{name:>9}: {metrics['requests']:7} req"
+                f"  {metrics['throughput_rps']:8.1f} req/s"
+                f"  p50 {metrics['p50_ms']:8.1f} ms"
+                f"  p95 {metrics['p95_ms']:8.1f} ms"
+                f"  p99 {metrics['p99_ms']:8.1f} ms"
+                f"  errors {metrics['error_rate']:6.2%}"
+            )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Отчёт: {options['output']}")
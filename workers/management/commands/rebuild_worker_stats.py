@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from workers.models import WorkerStats
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает таблицу WorkerStats по всем сотрудникам"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        WorkerStats.rebuild(using=options["database"])
+        groups = WorkerStats.objects.using(options["database"]).count()
+        self.stdout.write(f"Пересчитано групп: {groups}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from workers.jobs import recover_jobs
+
+
+class Command(BaseCommand):
+    help = "Возобновляет или завершает с ошибкой брошенные задачи импорта"
+
+    def handle(self, *args, **options):
+        recovered = recover_jobs()
+        self.stdout.write(f"Обработано задач: {recovered}")
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workers", "0004_importjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(
+                fields=["hired_date", "id"], name="worker_hired_date_id_idx"
+            ),
+        ),
+    ]
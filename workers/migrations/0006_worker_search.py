@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from workers.migrations._search import (
+    POSTGRESQL_BACKWARD,
+    POSTGRESQL_FORWARD,
+    SQLITE_BACKWARD,
+    SQLITE_FORWARD,
+    run_sql,
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("workers", "0005_worker_hired_date_id_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sql({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRESQL_FORWARD}),
+            run_sql({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRESQL_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:23
+
+import hashlib
+
+from django.db import migrations, models
+
+from workers.migrations._search import SQLITE_RESTORE_TRIGGERS, run_sql
+
+FINGERPRINT_FIELDS = (
+    "first_name",
+    "middle_name",
+    "last_name",
+    "email",
+    "position",
+    "is_active",
+)
+
+
+def fill_fingerprints(apps, schema_editor):
+    # Та же формула, что в Worker.get_fingerprint
+    workers = apps.get_model("workers", "Worker").objects.using(
+        schema_editor.connection.alias
+    )
+    batch = []
+    for worker in workers.only(*FINGERPRINT_FIELDS).iterator(chunk_size=2000):
+        values = "\x1f".join(
+            str(getattr(worker, field)) for field in FINGERPRINT_FIELDS
+        )
+        worker.import_fingerprint = hashlib.md5(
+            values.encode(), usedforsecurity=False
+        ).hexdigest()
+        batch.append(worker)
+        if len(batch) == 2000:
+            workers.bulk_update(batch, ["import_fingerprint"])
+            batch = []
+    workers.bulk_update(batch, ["import_fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workers", "0006_worker_search"),
+    ]
+
+    operations = [
+        # При откате пересоздание таблицы SQLite удаляет триггеры FTS,
+        # эта операция откатывается последней и возвращает их
+        migrations.RunPython(
+            migrations.RunPython.noop, run_sql({"sqlite": SQLITE_RESTORE_TRIGGERS})
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="skipped",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Строк без изменений, пропущенных при импорте"
+            ),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="import_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Хэш полей импорта, по нему импорт пропускает неизменённые строки",
+                max_length=32,
+            ),
+        ),
+        migrations.RunPython(fill_fingerprints, migrations.RunPython.noop),
+        migrations.RunPython(
+            run_sql({"sqlite": SQLITE_RESTORE_TRIGGERS}), migrations.RunPython.noop
+        ),
+    ]
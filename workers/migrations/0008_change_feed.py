@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:50
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+from workers.migrations._search import SQLITE_RESTORE_TRIGGERS, run_sql
+
+
+def fill_change_seqs(apps, schema_editor):
+    # Существующие сотрудники попадают в ленту в порядке id
+    alias = schema_editor.connection.alias
+    workers = apps.get_model("workers", "Worker").objects.using(alias)
+    ChangeSequence = apps.get_model("workers", "ChangeSequence")
+    workers.update(change_seq=F("id"))
+    last = workers.aggregate(last=Max("id"))["last"] or 0
+    ChangeSequence.objects.using(alias).create(pk=1, value=last)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workers", "0007_import_fingerprint"),
+    ]
+
+    operations = [
+        # При откате пересоздание таблицы SQLite удаляет триггеры FTS,
+        # эта операция откатывается последней и возвращает их
+        migrations.RunPython(
+            migrations.RunPython.noop, run_sql({"sqlite": SQLITE_RESTORE_TRIGGERS})
+        ),
+        migrations.CreateModel(
+            name="ChangeSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="WorkerTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("worker_id", models.BigIntegerField(unique=True)),
+                ("email", models.EmailField(max_length=255)),
+                ("change_seq", models.BigIntegerField(db_index=True)),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="change_seq",
+            field=models.BigIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Номер последнего изменения в ленте /api/workers/changes/",
+            ),
+        ),
+        migrations.RunPython(fill_change_seqs, migrations.RunPython.noop),
+        migrations.RunPython(
+            run_sql({"sqlite": SQLITE_RESTORE_TRIGGERS}), migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:55
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_stats(apps, schema_editor):
+    # То же, что WorkerStats.rebuild
+    alias = schema_editor.connection.alias
+    Worker = apps.get_model("workers", "Worker")
+    WorkerStats = apps.get_model("workers", "WorkerStats")
+    groups = (
+        Worker.objects.using(alias)
+        .values_list("position", "is_active")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    WorkerStats.objects.using(alias).bulk_create(
+        WorkerStats(position=position, is_active=is_active, count=count)
+        for position, is_active, count in groups
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workers", "0008_change_feed"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkerStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.CharField(blank=True, max_length=100)),
+                ("is_active", models.BooleanField()),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("position", "is_active"),
+                        name="worker_stats_group_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workers", "0009_worker_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="owner",
+            field=models.CharField(
+                blank=True,
+                help_text="Процесс, который выполняет задачу или держит её в очереди",
+                max_length=255,
+            ),
+        ),
+    ]
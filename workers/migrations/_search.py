@@ -0,0 +1,80 @@
+"""SQL полнотекстового поиска по сотрудникам для миграций.
+
+Модуль начинается с подчёркивания, поэтому загрузчик миграций его пропускает.
+"""
+
+SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE workers_worker_fts USING fts5(
+        first_name, middle_name, last_name, email,
+        content='workers_worker', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4 5'
+    )
+"""
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER workers_worker_fts_insert AFTER INSERT ON workers_worker BEGIN
+        INSERT INTO workers_worker_fts(rowid, first_name, middle_name, last_name, email)
+        VALUES (new.id, new.first_name, new.middle_name, new.last_name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER workers_worker_fts_delete AFTER DELETE ON workers_worker BEGIN
+        INSERT INTO workers_worker_fts(
+            workers_worker_fts, rowid, first_name, middle_name, last_name, email
+        )
+        VALUES ('delete', old.id, old.first_name, old.middle_name, old.last_name,
+                old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER workers_worker_fts_update
+    AFTER UPDATE OF first_name, middle_name, last_name, email ON workers_worker BEGIN
+        INSERT INTO workers_worker_fts(
+            workers_worker_fts, rowid, first_name, middle_name, last_name, email
+        )
+        VALUES ('delete', old.id, old.first_name, old.middle_name, old.last_name,
+                old.email);
+        INSERT INTO workers_worker_fts(rowid, first_name, middle_name, last_name, email)
+        VALUES (new.id, new.first_name, new.middle_name, new.last_name, new.email);
+    END
+    """,
+]
+
+SQLITE_REBUILD = "INSERT INTO workers_worker_fts(workers_worker_fts) VALUES ('rebuild')"
+
+SQLITE_FORWARD = [SQLITE_TABLE, *SQLITE_TRIGGERS, SQLITE_REBUILD]
+
+SQLITE_DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS workers_worker_fts_insert",
+    "DROP TRIGGER IF EXISTS workers_worker_fts_delete",
+    "DROP TRIGGER IF EXISTS workers_worker_fts_update",
+]
+
+SQLITE_BACKWARD = [*SQLITE_DROP_TRIGGERS, "DROP TABLE IF EXISTS workers_worker_fts"]
+
+# SQLite пересоздаёт таблицу при AddField/AlterField, и триггеры FTS
+# удаляются вместе со старой таблицей. Миграции, меняющие workers_worker,
+# должны заканчиваться этой операцией
+SQLITE_RESTORE_TRIGGERS = [*SQLITE_DROP_TRIGGERS, *SQLITE_TRIGGERS, SQLITE_REBUILD]
+
+POSTGRESQL_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS workers_worker_search_trgm ON workers_worker
+    USING gin ((
+        "workers_worker"."first_name" || ' ' || "workers_worker"."middle_name"
+        || ' ' || "workers_worker"."last_name" || ' ' || "workers_worker"."email"
+    ) gin_trgm_ops)
+    """,
+]
+
+POSTGRESQL_BACKWARD = ["DROP INDEX IF EXISTS workers_worker_search_trgm"]
+
+
+def run_sql(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return operation
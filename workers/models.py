@@ -1,5 +1,90 @@
+import hashlib
+from collections import Counter
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from workers.cache import bump_version
+
+# Поля, которые приходят из файла импорта и входят в отпечаток строки
+FINGERPRINT_FIELDS = (
+    "first_name",
+    "middle_name",
+    "last_name",
+    "email",
+    "position",
+    "is_active",
+)
+
+
+class ChangeSequence(models.Model):
+    """Счётчик ленты изменений сотрудников (одна строка).
+
+    Номер выдаётся в транзакции записи и блокирует строку счётчика до её
+    коммита, поэтому номера коммитятся строго по возрастанию и потребитель
+    ленты не пропустит изменение с меньшим номером, закоммиченное позже.
+    """
+
+    value = models.BigIntegerField(default=0)
+
+    @classmethod
+    def allocate(cls, count=1):
+        """Резервирует ``count`` номеров, вызывать внутри транзакции записи."""
+        with transaction.atomic():
+            if not cls.objects.filter(pk=1).update(value=F("value") + count):
+                cls.objects.create(pk=1, value=count)
+            last = cls.objects.select_for_update().values_list("value", flat=True)
+            last = last.get(pk=1)
+        return range(last - count + 1, last + 1)
+
+    @classmethod
+    def assign(cls, workers):
+        """Проставляет change_seq сотрудникам перед bulk_create или upsert."""
+        if workers:
+            for worker, seq in zip(workers, cls.allocate(len(workers))):
+                worker.change_seq = seq
+
+
+class WorkerQuerySet(models.QuerySet):
+    def bulk_upsert(self, workers, update_fields=None, unique_fields=("id",), **kwargs):
+        """Записывает сотрудников пачкой в обход Worker.save.
+
+        Без ``update_fields`` - INSERT новых сотрудников, иначе upsert
+        ``INSERT ... ON CONFLICT (unique_fields) DO UPDATE``: QuerySet.bulk_update
+        строит CASE WHEN по каждому полю и на больших пачках в разы медленнее.
+        Отпечатки, номера в ленте изменений, счётчики WorkerStats и версия
+        кэша обновляются здесь же, как при Worker.save.
+        """
+        if not workers:
+            return
+        for worker in workers:
+            worker.import_fingerprint = worker.get_fingerprint()
+        if update_fields is not None:
+            kwargs.update(
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=[*update_fields, "import_fingerprint", "change_seq"],
+            )
+        with transaction.atomic():
+            # Прежние группы WorkerStats - из заблокированных строк, а не
+            # значения на момент загрузки: их могла изменить другая запись
+            pks = [worker.pk for worker in workers if worker.pk is not None]
+            if pks:
+                stored = {
+                    pk: (position, is_active)
+                    for pk, position, is_active in self.select_for_update()
+                    .filter(pk__in=pks)
+                    .values_list("pk", "position", "is_active")
+                }
+                for worker in workers:
+                    if worker.pk is not None:
+                        worker._stats_key = stored.get(worker.pk)
+            ChangeSequence.assign(workers)
+            WorkerStats.track(workers)
+            self.bulk_create(workers, **kwargs)
+        bump_version()
 
 
 class Worker(models.Model):
@@ -19,6 +104,209 @@ class Worker(models.Model):
     created_by = models.ForeignKey(
         User, on_delete=models.PROTECT, null=True, blank=True
     )
+    import_fingerprint = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text="Хэш полей импорта, по нему импорт пропускает неизменённые строки",
+    )
+    change_seq = models.BigIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Номер последнего изменения в ленте /api/workers/changes/",
+    )
+
+    objects = WorkerQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["hired_date", "id"], name="worker_hired_date_id_idx")
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} : {self.position}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Значения из БД, чтобы при удалении знать, из какой группы
+        # WorkerStats сотрудник уходит
+        if "position" in field_names and "is_active" in field_names:
+            instance._stats_key = instance.get_stats_key()
+        return instance
+
+    def get_stats_key(self):
+        return (self.position, self.is_active)
+
+    def get_fingerprint(self):
+        values = "\x1f".join(str(getattr(self, field)) for field in FINGERPRINT_FIELDS)
+        return hashlib.md5(values.encode(), usedforsecurity=False).hexdigest()
+
+    def save(self, *args, **kwargs):
+        # Отпечаток всегда соответствует сохранённым значениям, иначе
+        # импорт пропустил бы строку, изменённую в обход него
+        self.import_fingerprint = self.get_fingerprint()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "import_fingerprint",
+                "change_seq",
+            }
+        with transaction.atomic():
+            if not self._state.adding:
+                # Прежняя группа - из заблокированной строки, а не значения
+                # на момент загрузки: их могла изменить другая запись
+                self._stats_key = (
+                    Worker.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("position", "is_active")
+                    .first()
+                )
+            self.change_seq = ChangeSequence.allocate()[0]
+            super().save(*args, **kwargs)
+            WorkerStats.track([self])
+
+
+class WorkerTombstone(models.Model):
+    """След удалённого сотрудника для ленты изменений."""
+
+    worker_id = models.BigIntegerField(unique=True)
+    email = models.EmailField(max_length=255)
+    change_seq = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.worker_id} : {self.email}"
+
+
+class ImportJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Завершён"
+        FAILED = "failed", "Ошибка"
+
+    file = models.FileField(upload_to="imports/", blank=True)
+    file_name = models.CharField(max_length=255, help_text="Имя загруженного файла")
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True
+    )
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    imported = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(
+        default=0, help_text="Строк без изменений, пропущенных при импорте"
+    )
+    errors = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0, help_text="Обработано строк")
+    error_message = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+    owner = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Процесс, который выполняет задачу или держит её в очереди",
+    )
+
+    def __str__(self):
+        return f"{self.file_name} : {self.status}"
+
+
+class WorkerStats(models.Model):
+    """Численность сотрудников по должности и активности.
+
+    Счётчики меняются в тех же транзакциях, что и сами сотрудники
+    (Worker.save, удаление, пакетный импорт, POST /api/workers/bulk/),
+    поэтому /api/workers/stats/ не сканирует таблицу сотрудников.
+    Пересчёт с нуля - manage.py rebuild_worker_stats.
+    """
+
+    position = models.CharField(max_length=100, blank=True)
+    is_active = models.BooleanField()
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["position", "is_active"], name="worker_stats_group_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.position} : {self.is_active} : {self.count}"
+
+    @classmethod
+    def track(cls, workers, deleted=False):
+        """Переносит сотрудников из прежних групп в текущие (или убирает).
+
+        Прежняя группа - ``_stats_key``: значения, прочитанные из БД под
+        блокировкой строки, у новых сотрудников её нет. Вызывать внутри
+        транзакции записи.
+        """
+        delta = Counter()
+        for worker in workers:
+            old = worker.__dict__.get("_stats_key")
+            if old is not None:
+                delta[old] -= 1
+            new = None if deleted else worker.get_stats_key()
+            if new is not None:
+                delta[new] += 1
+            worker._stats_key = new
+
+        rows = [(*key, count) for key, count in delta.items() if count]
+        if not rows:
+            return
+        connection = connections[router.db_for_write(cls)]
+        quote = connection.ops.quote_name
+        # Один executemany на все группы: ORM не умеет прибавлять к
+        # значению при конфликте (count = count + excluded.count)
+        sql = (
+            "INSERT INTO {table} ({position}, {is_active}, {count}) "
+            "VALUES (%s, %s, %s) ON CONFLICT ({position}, {is_active}) "
+            "DO UPDATE SET {count} = {table}.{count} + excluded.{count}"
+        ).format(
+            table=quote(cls._meta.db_table),
+            **{name: quote(name) for name in ("position", "is_active", "count")},
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    @classmethod
+    def summary(cls):
+        """Ответ /api/workers/stats/: итоги и разбивка по должностям."""
+        totals = {"total": 0, "active": 0, "inactive": 0}
+        positions = {}
+        groups = cls.objects.filter(count__gt=0).order_by("position", "is_active")
+        for position, is_active, count in groups.values_list(
+            "position", "is_active", "count"
+        ):
+            group = positions.setdefault(
+                position, {"position": position, "total": 0, "active": 0, "inactive": 0}
+            )
+            for target in (totals, group):
+                target["total"] += count
+                target["active" if is_active else "inactive"] += count
+        return {**totals, "by_position": list(positions.values())}
+
+    @classmethod
+    def rebuild(cls, using="default"):
+        """Пересчитывает все счётчики одним GROUP BY по сотрудникам."""
+        groups = (
+            Worker.objects.using(using)
+            .values_list("position", "is_active")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        with transaction.atomic(using=using):
+            cls.objects.using(using).all().delete()
+            cls.objects.using(using).bulk_create(
+                cls(position=position, is_active=is_active, count=count)
+                for position, is_active, count in groups
+            )
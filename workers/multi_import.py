@@ -0,0 +1,182 @@
+"""Импорт нескольких файлов или ZIP-архива за один запрос.
+
+Файлы разбираются и проверяются параллельно в пуле процессов (декодирование
+xlsx/xls упирается в процессор), затем строки всех файлов сливаются в одну
+выборку без повторов email и импортируются одним проходом.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+import pandas as pd
+from django.apps import apps
+from django.conf import settings
+
+from workers.importers import UnsupportedFileFormat, is_supported, iter_file_rows
+
+ARCHIVE_EXTENSIONS = (".zip",)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class ImportLimitExceeded(ValueError):
+    pass
+
+
+def is_archive(file_name):
+    return file_name.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def _is_service_member(name):
+    # Каталоги и служебные файлы, которые добавляют архиваторы macOS/Windows
+    base = os.path.basename(name.rstrip("/"))
+    return name.endswith("/") or name.startswith("__MACOSX/") or base.startswith(".")
+
+
+def expand_files(files):
+    """Раскрывает загруженные файлы и архивы в список (имя, содержимое).
+
+    Внутри архива поддерживаются .xlsx, .xls, .csv и .tsv, вложенные архивы
+    не раскрываются.
+    """
+    max_files = settings.WORKERS_IMPORT_MAX_FILES
+    max_size = settings.WORKERS_IMPORT_MAX_UNPACKED_MB * 1024 * 1024
+    contents, size = [], 0
+
+    for file in files:
+        if is_archive(file.name):
+            with zipfile.ZipFile(file) as archive:
+                members = [
+                    info
+                    for info in archive.infolist()
+                    if not _is_service_member(info.filename)
+                ]
+                for info in members:
+                    if not is_supported(info.filename):
+                        raise UnsupportedFileFormat(info.filename)
+                size += sum(info.file_size for info in members)
+                if size > max_size:
+                    raise ImportLimitExceeded(
+                        f"Распакованные файлы больше {settings.WORKERS_IMPORT_MAX_UNPACKED_MB} МБ"
+                    )
+                contents += [(info.filename, archive.read(info)) for info in members]
+        elif is_supported(file.name):
+            contents.append((file.name, file.read()))
+            size += file.size
+        else:
+            raise UnsupportedFileFormat(file.name)
+
+        if len(contents) > max_files:
+            raise ImportLimitExceeded(f"Больше {max_files} файлов в одном импорте")
+
+    if not contents:
+        raise ImportLimitExceeded("В архиве нет файлов для импорта")
+    return contents
+
+
+def contents_digest(contents):
+    """SHA-256 всех файлов по порядку, для пропуска повторного импорта."""
+    digest = hashlib.sha256()
+    for name, content in contents:
+        digest.update(name.encode())
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def _setup_process():
+    # Процессы запускаются через forkserver или spawn, Django в них ещё не
+    # настроен
+    if not apps.ready:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kiout_test_backend.settings")
+        django.setup()
+
+
+def get_pool():
+    """Общий для запросов пул процессов разбора файлов.
+
+    Процессы не форкаются от рабочего процесса сервера: fork копирует его
+    потоки (пул фоновых импортов, слушатель логов) и соединения с БД, а
+    блокировка, захваченная в момент fork другим потоком, в дочернем
+    процессе не освободится никогда. forkserver (где его нет - spawn)
+    запускает процессы от чистого родителя, а пул переиспользуется, чтобы
+    не настраивать Django в новых процессах на каждый запрос.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.WORKERS_IMPORT_PROCESSES,
+                mp_context=multiprocessing.get_context(method),
+                initializer=_setup_process,
+            )
+    return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def parse_file(name, content):
+    """Читает и проверяет один файл, выполняется в процессе пула."""
+    from workers.validation import read_frame, validate_frame
+
+    file = io.BytesIO(content)
+    file.name = name
+    frame = read_frame(iter_file_rows(file))
+    return frame, validate_frame(frame)
+
+
+def parse_files(contents):
+    """Разбирает файлы параллельно, результаты в порядке файлов.
+
+    Процессов в пуле WORKERS_IMPORT_PROCESSES, при одном файле или одном
+    процессе файлы разбираются в текущем процессе.
+    """
+    names = [name for name, _ in contents]
+    data = [content for _, content in contents]
+    processes = min(settings.WORKERS_IMPORT_PROCESSES, len(contents))
+    if processes <= 1:
+        return list(map(parse_file, names, data))
+    pool = get_pool()
+    try:
+        return list(pool.map(parse_file, names, data))
+    except BrokenProcessPool:
+        # Процесс пула убит (например, OOM): следующий запрос создаст новый пул
+        _reset_pool(pool)
+        raise
+
+
+def merge_frames(frames):
+    """Сливает строки файлов, из повторов email остаётся последняя строка.
+
+    Возвращает выборки для импорта (по одной на набор колонок: колонка,
+    которой нет в файле, не должна затирать значение у сотрудника) и число
+    вытесненных строк каждого файла.
+    """
+    emails = pd.concat(
+        [frame["email"].reset_index(drop=True) for frame in frames],
+        keys=range(len(frames)),
+    )
+    keep = ~emails.duplicated(keep="last")
+
+    groups, duplicates = {}, []
+    for number, frame in enumerate(frames):
+        kept = frame[keep.loc[number].to_numpy()] if len(frame) else frame
+        duplicates.append(len(frame) - len(kept))
+        groups.setdefault(tuple(frame.columns), []).append(kept)
+    merged = [pd.concat(parts) for parts in groups.values()]
+    return [frame for frame in merged if len(frame)], duplicates
@@ -0,0 +1,29 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+class WorkerCursorPagination(CursorPagination):
+    """Keyset-пагинация списка сотрудников.
+
+    Страницы выбираются по условию ``WHERE id > <курсор>`` вместо OFFSET
+    и без запроса ``COUNT(*)``, поэтому глубина страницы не влияет на время.
+    """
+
+    orderings = {
+        "id": ("id",),
+        "-id": ("-id",),
+        "hired_date": ("hired_date", "id"),
+        "-hired_date": ("-hired_date", "-id"),
+    }
+    ordering = orderings["id"]
+    page_size_query_param = "page_size"
+    max_page_size = settings.WORKERS_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        value = request.query_params.get("ordering", "id")
+        if value not in self.orderings:
+            raise ValidationError(
+                {"ordering": f"Допустимые значения: {', '.join(self.orderings)}"}
+            )
+        return self.orderings[value]
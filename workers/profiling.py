@@ -0,0 +1,202 @@
+import bisect
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+
+# Верхние границы корзин гистограммы, мс
+BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+METRICS = ["total", "db", "serialize", "render"]
+# Как в ответе /api/_stats/ обозначается последняя, бесконечная корзина:
+# inf не сериализуется в JSON
+OVERFLOW = f">{BUCKETS[-2]}"
+
+
+def bucket_label(bound):
+    return OVERFLOW if bound == BUCKETS[-1] else bound
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.timings = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.timings["db"] += time.perf_counter() - start
+
+    def server_timing(self):
+        parts = [
+            f'db;dur={self.timings["db"] * 1000:.2f};desc="{self.queries} queries"'
+        ]
+        for name in ("serialize", "render", "total"):
+            parts.append(f"{name};dur={self.timings[name] * 1000:.2f}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def span(request, name):
+    """Добавляет время блока к метрике ``name`` профиля запроса, если он есть."""
+    profile = getattr(request, "profile", None)
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.timings[name] += time.perf_counter() - start
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value_ms):
+        self.counts[bisect.bisect_left(BUCKETS, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+
+    def percentile(self, percent):
+        """Оценка сверху: граница корзины, в которую попал перцентиль.
+
+        Для последней корзины возвращается строка OVERFLOW (">5000").
+        """
+        threshold = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= threshold:
+                return bucket_label(bound)
+        return OVERFLOW
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count, 2) if self.count else 0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {
+                str(bucket_label(bound)): count
+                for bound, count in zip(BUCKETS, self.counts)
+                if count
+            },
+        }
+
+
+class ProfilingStats:
+    """Скользящие гистограммы по эндпоинтам в памяти процесса.
+
+    Данные хранятся поминутно, в снимок попадают последние
+    WORKERS_PROFILING_WINDOW_MINUTES минут.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.minutes = {}
+
+    def record(self, endpoint, profile):
+        minute = int(time.time() // 60)
+        with self.lock:
+            histograms = self.minutes.setdefault(minute, {}).setdefault(
+                endpoint, {metric: Histogram() for metric in METRICS + ["queries"]}
+            )
+            for metric in METRICS:
+                histograms[metric].add(profile.timings[metric] * 1000)
+            histograms["queries"].add(profile.queries)
+            self._prune(minute)
+
+    def _prune(self, minute):
+        oldest = minute - settings.WORKERS_PROFILING_WINDOW_MINUTES
+        for key in [key for key in self.minutes if key <= oldest]:
+            del self.minutes[key]
+
+    def snapshot(self):
+        merged = defaultdict(lambda: defaultdict(Histogram))
+        with self.lock:
+            self._prune(int(time.time() // 60))
+            for endpoints in self.minutes.values():
+                for endpoint, histograms in endpoints.items():
+                    for metric, histogram in histograms.items():
+                        merged[endpoint][metric].merge(histogram)
+        return {
+            endpoint: {metric: h.as_dict() for metric, h in histograms.items()}
+            for endpoint, histograms in sorted(merged.items())
+        }
+
+    def clear(self):
+        with self.lock:
+            self.minutes.clear()
+
+
+stats = ProfilingStats()
+
+
+class ProfilingMiddleware:
+    """Замеряет SQL, сериализацию и рендеринг для доли запросов.
+
+    Доля задаётся WORKERS_PROFILING_SAMPLE_RATE (0..1), остальные запросы
+    проходят без накладных расходов. Замеры отдаются в заголовке
+    Server-Timing и копятся в ``stats`` для /api/_stats/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.WORKERS_PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = request.profile = RequestProfile()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        profile.timings["total"] = time.perf_counter() - profile.started
+
+        response["Server-Timing"] = profile.server_timing()
+        match = request.resolver_match
+        if match is not None:
+            stats.record(f"{request.method} {match.view_name}", profile)
+        return response
+
+    def process_template_response(self, request, response):
+        profile = getattr(request, "profile", None)
+        if profile is not None:
+            start = time.perf_counter()
+
+            def rendered(response):
+                profile.timings["render"] += time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class ProfiledSerializerMixin:
+    @property
+    def data(self):
+        with span(self.context.get("request"), "serialize"):
+            return super().data
+
+
+class ProfiledListSerializer(ProfiledSerializerMixin, serializers.ListSerializer):
+    pass
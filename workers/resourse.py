@@ -1,12 +1,9 @@
-import logging
-
 from django.contrib.auth.models import User
 from import_export import resources
+from import_export.instance_loaders import CachedInstanceLoader
 
 from workers.models import Worker
 
-logger = logging.getLogger(__name__)
-
 
 class WorkersResources(resources.ModelResource):
     class Meta:
@@ -21,14 +18,93 @@ class WorkersResources(resources.ModelResource):
         )
         import_id_fields = ["email"]
 
-    def before_import_row(self, row, **kwargs):
+    def before_import(self, dataset, **kwargs):
+        # Автор определяется один раз на весь импорт, а не на каждую строку
         user = kwargs.get("user") or getattr(self, "user", None)
-        if user:
-            row["created_by"] = user.id
-        else:
-            # Fallback
-            user = User.objects.first()
-            if user:
-                row["created_by"] = user.id
-
-        logger.info(f"Импорт сотрудника: {row.get('first_name')} {row.get('email')}")
+        self.created_by = user or User.objects.first()
+
+    def skip_row(self, instance, original, row, import_validation_errors=None):
+        # Строка ничего не меняет, если отпечаток полей после её применения
+        # совпадает с отпечатком сохранённых значений
+        if (
+            not import_validation_errors
+            and instance.pk is not None
+            and instance.get_fingerprint() == instance.import_fingerprint
+        ):
+            return True
+        return super().skip_row(instance, original, row, import_validation_errors)
+
+    def before_save_instance(self, instance, row, **kwargs):
+        if instance.pk is None and instance.created_by_id is None:
+            instance.created_by = getattr(self, "created_by", None)
+
+
+class BulkWorkersResources(WorkersResources):
+    """Импорт пачками.
+
+    Существующие сотрудники порции загружаются одним запросом ``email IN (...)``,
+    новые строки пишутся через ``bulk_create``, изменённые - через upsert
+    ``INSERT ... ON CONFLICT (email) DO UPDATE``.
+    """
+
+    class Meta(WorkersResources.Meta):
+        instance_loader_class = CachedInstanceLoader
+        use_bulk = True
+        batch_size = 1000
+        skip_diff = True
+
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        self.pending_instances = {}
+
+    def get_or_init_instance(self, instance_loader, row):
+        instance, new = super().get_or_init_instance(instance_loader, row)
+        if new:
+            # Повтор email внутри файла обновляет уже созданный объект,
+            # как это происходит при построчном сохранении
+            email = self.fields["email"].clean(row)
+            if email in self.pending_instances:
+                return self.pending_instances[email], False
+            self.pending_instances[email] = instance
+        return instance, new
+
+    def save_instance(self, instance, is_create, row, **kwargs):
+        if not is_create and instance.pk is None:
+            # Объект уже стоит в очереди на bulk_create
+            self.before_save_instance(instance, row, **kwargs)
+            self.after_save_instance(instance, row, **kwargs)
+            return
+        super().save_instance(instance, is_create, row, **kwargs)
+
+    def bulk_create(
+        self, using_transactions, dry_run, raise_errors, batch_size=None, result=None
+    ):
+        if self.create_instances and (using_transactions or not dry_run):
+            try:
+                Worker.objects.bulk_upsert(self.create_instances, batch_size=batch_size)
+            except Exception as e:
+                self.handle_import_error(result, e, raise_errors)
+            finally:
+                self.create_instances.clear()
+
+    def bulk_update(
+        self, using_transactions, dry_run, raise_errors, batch_size=None, result=None
+    ):
+        if self.update_instances and (using_transactions or not dry_run):
+            # Повтор email существующего сотрудника в файле кладёт его в
+            # очередь дважды, а PostgreSQL не даёт upsert изменить строку
+            # дважды в одном запросе: остаётся последняя строка
+            self.update_instances[:] = {
+                instance.email: instance for instance in self.update_instances
+            }.values()
+            try:
+                Worker.objects.bulk_upsert(
+                    self.update_instances,
+                    update_fields=self.get_bulk_update_fields(),
+                    unique_fields=["email"],
+                    batch_size=batch_size,
+                )
+            except Exception as e:
+                self.handle_import_error(result, e, raise_errors)
+            finally:
+                self.update_instances.clear()
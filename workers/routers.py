@@ -0,0 +1,102 @@
+"""Чтение из реплик, запись в основную базу.
+
+Реплики перечислены в WORKERS_DB_REPLICAS. Из реплики читаются только
+запросы, помеченные ``use_replica()``: безопасные (GET/HEAD) HTTP-запросы
+через ReplicaRoutingMiddleware и явные выборки для отчётов. Всё остальное
+(записи, импорт, фоновые задачи, management-команды) идёт в основную базу.
+"""
+
+import contextvars
+import hashlib
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+
+PRIMARY = "default"
+SAFE_METHODS = ("GET", "HEAD")
+
+_replica = contextvars.ContextVar("workers_replica", default=None)
+
+
+def reading_from_replica():
+    return _replica.get() is not None
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Направляет чтения внутри блока в реплику (или в основную базу).
+
+    Реплика выбирается одна на весь блок: запросы одного HTTP-запроса
+    видят один и тот же снимок данных.
+    """
+    replicas = settings.WORKERS_DB_REPLICAS
+    token = _replica.set(random.choice(replicas) if enabled and replicas else None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def replica_may_lag(modified):
+    """Данные изменились так недавно, что реплика могла их ещё не получить.
+
+    ``modified`` - время последней записи из workers.cache.get_version.
+    """
+    return (
+        reading_from_replica()
+        and time.time() - modified < settings.WORKERS_DB_STICKY_SECONDS
+    )
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _replica.get() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики - копии основной базы, объекты из них связаны между собой
+        return True
+
+
+def _sticky_key(request):
+    """Ключ клиента: токен из Authorization или сессия.
+
+    У пользователя один токен DRF, поэтому ключ соответствует пользователю,
+    а определяется до аутентификации во view.
+    """
+    credentials = request.headers.get("Authorization") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credentials:
+        return None
+    return f"workers:db:sticky:{hashlib.sha256(credentials.encode()).hexdigest()}"
+
+
+class ReplicaRoutingMiddleware:
+    """Отправляет GET/HEAD в реплики, кроме клиентов, которые недавно писали.
+
+    После небезопасного запроса клиент WORKERS_DB_STICKY_SECONDS секунд
+    читает из основной базы и видит свои изменения, даже если реплика
+    отстаёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cache = caches[settings.WORKERS_CACHE_ALIAS]
+        key = _sticky_key(request)
+        safe = request.method in SAFE_METHODS
+        replica = safe and not (key and cache.get(key))
+
+        with use_replica(replica):
+            response = self.get_response(request)
+
+        if not safe and key:
+            cache.set(key, True, settings.WORKERS_DB_STICKY_SECONDS)
+        return response
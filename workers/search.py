@@ -0,0 +1,109 @@
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import FloatField, Q, TextField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+FTS_TABLE = "workers_worker_fts"
+SEARCH_FIELDS = ["first_name", "middle_name", "last_name", "email"]
+# Выражение, по которому на PostgreSQL построен триграммный GIN-индекс
+SEARCH_EXPRESSION = " || ' ' || ".join(f'"workers_worker"."{f}"' for f in SEARCH_FIELDS)
+
+
+def search_tokens(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def search_workers(queryset, query):
+    """Ищет сотрудников по префиксам слов в ФИО и email, лучшие совпадения первыми.
+
+    На SQLite используется FTS5-таблица, на PostgreSQL - регулярное выражение
+    по триграммному индексу.
+    Обе поддерживаются в актуальном состоянии самой БД (триггеры и индекс),
+    поэтому учитывают и bulk-импорт.
+    """
+    tokens = search_tokens(query)
+    if not tokens:
+        return queryset.none()
+
+    connection = connections[queryset.db]
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        match = " ".join(f'"{token}"*' for token in tokens)
+        # Совпадения FTS - подзапрос основной выборки: остальные фильтры и
+        # пагинация применяются к ним в SQL
+        queryset = queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        )
+        # bm25 считается, только если совпадений не больше
+        # WORKERS_SEARCH_CANDIDATES: ранжирование всех строк по короткому
+        # префиксу на миллионе записей стоит сотни миллисекунд. Иначе
+        # выборка не ограничивается, а упорядочивается по id
+        limit = settings.WORKERS_SEARCH_CANDIDATES
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                "LIMIT %s",
+                [match, limit + 1],
+            )
+            rows = cursor.fetchall()
+        if len(rows) > limit:
+            return queryset.order_by("id")
+        ids = [pk for pk, rank in sorted(rows, key=lambda row: row[1])]
+        # Порядок задаётся позицией id в строке ",3,1,2,": Case/When на сотни
+        # веток компилируется дольше, чем выполняется сам поиск
+        ranking = RawSQL(
+            "instr(%s, ',' || workers_worker.id || ',')",
+            [f",{','.join(map(str, ids))},"],
+        )
+        return queryset.order_by(ranking, "id")
+    if vendor == "postgresql":
+        # \m - начало слова, как префиксный поиск FTS5 на SQLite; регулярное
+        # выражение ~* тоже обслуживается триграммным индексом
+        queryset = queryset.alias(
+            search_text=RawSQL(SEARCH_EXPRESSION, [], output_field=TextField())
+        )
+        for token in tokens:
+            queryset = queryset.filter(search_text__iregex=r"\m" + re.escape(token))
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"word_similarity(%s, {SEARCH_EXPRESSION})",
+                [query],
+                output_field=FloatField(),
+            )
+        ).order_by("-search_rank", "id")
+
+    condition = Q()
+    for token in tokens:
+        token_condition = Q()
+        for field in SEARCH_FIELDS:
+            token_condition |= Q(**{f"{field}__icontains": token})
+        condition &= token_condition
+    return queryset.filter(condition)
+
+
+class WorkerSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск ``?q=`` по ФИО и email."""
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search_workers(queryset, query)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Поиск по началу слов в ФИО и email",
+                "schema": {"type": "string"},
+            }
+        ]
@@ -1,11 +1,20 @@
 from rest_framework import serializers
 
-from workers.models import Worker
+from workers.models import ImportJob, Worker
+from workers.profiling import ProfiledListSerializer, ProfiledSerializerMixin
 
+# Поля, to_representation которых возвращает значение из БД без изменений
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+)
 
-class WorkerSerializer(serializers.ModelSerializer):
+
+class WorkerSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Worker
+        list_serializer_class = ProfiledListSerializer
         fields = [
             "id",
             "first_name",
@@ -13,15 +22,35 @@ class WorkerSerializer(serializers.ModelSerializer):
             "last_name",
             "position",
             "is_active",
+            "email",
         ]
+        # email принимается при создании и изменении, но не раскрывается в
+        # списке. Уникальность проверяет UniqueValidator модели: при PATCH он
+        # исключает самого сотрудника, поэтому его же email не считается повтором
+        extra_kwargs = {"email": {"write_only": True}}
 
-    def validate_email(self, value):
-        if Worker.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Worker ")
-        return value
+    @classmethod
+    def values_fields(cls):
+        """Поля ответа для быстрого списка из values_list.
 
+        Возвращает None, если какое-то поле меняет значение при сериализации
+        и строку из БД нельзя отдать как есть.
+        """
+        if "_values_fields" not in cls.__dict__:
+            fields = [field for field in cls().fields.values() if not field.write_only]
+            cls._values_fields = (
+                [field.source for field in fields]
+                if all(
+                    isinstance(field, PASSTHROUGH_FIELDS)
+                    and field.source == field.field_name
+                    for field in fields
+                )
+                else None
+            )
+        return cls._values_fields
 
-class WorkerDetailSerializer(serializers.ModelSerializer):
+
+class WorkerDetailSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Worker
         fields = [
@@ -38,5 +67,70 @@ class WorkerDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ["hired_date", "created_by"]
 
 
+class BulkOperationSerializer(serializers.ModelSerializer):
+    """Одна операция POST /api/workers/bulk/.
+
+    Проверяются только сами поля, без запросов к БД: существование
+    сотрудников и уникальность email проверяет workers.bulk для всего пакета.
+    """
+
+    op = serializers.ChoiceField(choices=["create", "update", "deactivate"])
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Worker
+        fields = [
+            "op",
+            "id",
+            "first_name",
+            "middle_name",
+            "last_name",
+            "email",
+            "position",
+            "is_active",
+        ]
+        extra_kwargs = {
+            "email": {"validators": [], "required": False},
+            "first_name": {"required": False},
+            "last_name": {"required": False},
+        }
+
+    def validate(self, attrs):
+        if attrs["op"] == "create":
+            if "id" in attrs:
+                raise serializers.ValidationError(
+                    {"id": "id задаётся только для update и deactivate"}
+                )
+            missing = {
+                field: "Обязательное поле."
+                for field in ("first_name", "last_name", "email")
+                if not attrs.get(field)
+            }
+            if missing:
+                raise serializers.ValidationError(missing)
+        elif "id" not in attrs and "email" not in attrs:
+            raise serializers.ValidationError("Нужен id или email сотрудника")
+        return attrs
+
+
 class ImportWorkersSerializer(serializers.Serializer):
     file = serializers.FileField(help_text="Excel файл для импорта (.xlsx, .xls)")
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "file_name",
+            "status",
+            "imported",
+            "updated",
+            "skipped",
+            "errors",
+            "total",
+            "error_message",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
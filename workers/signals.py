@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from workers.authentication import invalidate_token, invalidate_user
+from workers.cache import bump_version
+from workers.models import ChangeSequence, Worker, WorkerStats, WorkerTombstone
+
+
+@receiver(post_save, sender=Worker)
+@receiver(post_delete, sender=Worker)
+def worker_changed(sender, **kwargs):
+    bump_version()
+
+
+@receiver(post_delete, sender=Worker)
+def worker_deleted(sender, instance, **kwargs):
+    # Вызывается в транзакции удаления, номер и счётчики коммитятся вместе с ней
+    WorkerTombstone.objects.create(
+        worker_id=instance.pk,
+        email=instance.email,
+        change_seq=ChangeSequence.allocate()[0],
+    )
+    instance.__dict__.setdefault("_stats_key", instance.get_stats_key())
+    WorkerStats.track([instance], deleted=True)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_changed(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    # Закэшированный пользователь мог быть деактивирован или лишён прав
+    if not created:
+        invalidate_user(instance.pk)
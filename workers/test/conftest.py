@@ -0,0 +1,50 @@
+import io
+
+import pandas as pd
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def user_is_staff(db):
+    return User.objects.create_user(
+        username="admin", password="testpass123", email="admin@test.com", is_staff=True
+    )
+
+
+@pytest.fixture
+def staff_client(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    return client
+
+
+@pytest.fixture
+def make_excel():
+    def factory(rows, name="workers.xlsx"):
+        excel_file = io.BytesIO()
+        pd.DataFrame(rows).to_excel(excel_file, index=False, engine="openpyxl")
+        excel_file.name = name
+        excel_file.seek(0)
+        return excel_file
+
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def clear_workers_cache():
+    caches[settings.WORKERS_CACHE_ALIAS].clear()
+
+
+@pytest.fixture(autouse=True)
+def no_job_monitor(settings):
+    # Поток монитора задач импорта в тестах не запускается, проходы
+    # монитора вызываются явно
+    settings.WORKERS_IMPORT_JOB_RECOVER_ON_START = False
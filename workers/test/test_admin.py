@@ -0,0 +1,104 @@
+import pytest
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from workers.admin import PositionListFilter
+from workers.models import Worker, WorkerStats
+
+CHANGELIST = "/admin/workers/worker/"
+
+
+@pytest.fixture
+def admin_client(client, db):
+    admin = User.objects.create_superuser("root", "root@test.com", "pass")
+    client.force_login(admin)
+    return client
+
+
+def worker_queries(queries, statement):
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith(statement) and '"workers_worker"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_changelist_counts_from_stats(admin_client):
+    baker.make(Worker, position="Dev", is_active=True, _quantity=3)
+    baker.make(Worker, position="QA", is_active=False)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(CHANGELIST, {"is_active__exact": "1"})
+
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == 3
+    # Ни COUNT(*), ни SELECT DISTINCT position по сотрудникам
+    assert not any("COUNT(" in sql for sql in worker_queries(queries, "SELECT"))
+    assert not any("DISTINCT" in sql for sql in worker_queries(queries, "SELECT"))
+
+
+@pytest.mark.django_db
+def test_changelist_count_is_capped(admin_client, settings):
+    settings.WORKERS_ADMIN_COUNT_CAP = 2
+    baker.make(Worker, first_name="Анна", _quantity=3)
+
+    response = admin_client.get(CHANGELIST, {"q": "анна"})
+
+    assert response.context["cl"].result_count == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_position_choices_follow_writes(admin_client):
+    baker.make(Worker, position="Dev")
+
+    def choices():
+        response = admin_client.get(CHANGELIST)
+        spec = next(
+            spec
+            for spec in response.context["cl"].filter_specs
+            if isinstance(spec, PositionListFilter)
+        )
+        return [choice for choice, _ in spec.lookup_choices]
+
+    assert choices() == ["Dev"]
+    worker = baker.make(Worker, position="QA")
+    assert choices() == ["Dev", "QA"]
+    worker.delete()
+    assert choices() == ["Dev"]
+
+
+@pytest.mark.django_db
+def test_list_editable_saves_with_one_upsert(admin_client):
+    workers = baker.make(Worker, position="Dev", is_active=True, _quantity=3)
+    data = {"form-TOTAL_FORMS": "3", "form-INITIAL_FORMS": "3", "_save": "Save"}
+    for i, worker in enumerate(workers):
+        data[f"form-{i}-id"] = str(worker.pk)
+    data["form-2-is_active"] = "on"
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(CHANGELIST, data)
+
+    assert response.status_code == 302
+    assert len(worker_queries(queries, "INSERT")) == 1
+    assert not worker_queries(queries, "UPDATE")
+    for worker in workers[:2]:
+        worker.refresh_from_db()
+        assert worker.is_active is False
+        assert worker.import_fingerprint == worker.get_fingerprint()
+    assert WorkerStats.summary()["inactive"] == 2
+    # Журнал админки тоже пишется пачкой, но по записи на сотрудника
+    assert len([query for query in queries if "django_admin_log" in query["sql"]]) == 1
+    assert LogEntry.objects.filter(action_flag=CHANGE).count() == 2
+
+
+@pytest.mark.django_db
+def test_created_by_uses_autocomplete(admin_client):
+    worker = baker.make(Worker)
+
+    response = admin_client.get(f"{CHANGELIST}{worker.pk}/change/")
+
+    assert "admin-autocomplete" in response.content.decode()
@@ -0,0 +1,89 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from model_bakery import baker
+from rest_framework.authtoken.models import Token
+
+from workers.models import Worker
+
+QUERIES = [
+    "",
+    "?page=2",
+    "?page=last&is_active=True",
+    "?position=Developer",
+    "?q=%D0%90%D0%BD%D0%BD%D0%B0",  # Анна
+    "?page=100",
+    "?is_active=maybe",
+]
+
+
+@pytest.fixture
+def token(user_is_staff):
+    return Token.objects.create(user=user_is_staff)
+
+
+@pytest.fixture
+def workers(db, user_is_staff):
+    for i in range(25):
+        baker.make(
+            Worker,
+            first_name="Анна" if i % 3 else f"Имя{i}",
+            email=f"w{i}@test.com",
+            position="Developer" if i % 2 else "Manager",
+            is_active=bool(i % 4),
+            created_by=user_is_staff,
+        )
+
+
+def async_get(url, token=None):
+    headers = {"Authorization": f"Token {token.key}"} if token else {}
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+def without_links(data):
+    return {
+        key: value for key, value in data.items() if key not in ("next", "previous")
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", QUERIES)
+def test_async_list_matches_viewset(client, token, workers, query):
+    expected = client.get(
+        f"/api/workers/{query}", HTTP_AUTHORIZATION=f"Token {token.key}"
+    )
+
+    response = async_get(f"/api/async/workers/{query}", token)
+
+    assert response.status_code == expected.status_code
+    assert without_links(response.json()) == without_links(expected.json())
+    if "next" in expected.json():
+        for link in ("next", "previous"):
+            assert response.json()[link] == (
+                expected.json()[link]
+                and expected.json()[link].replace("/api/", "/api/async/")
+            )
+
+
+@pytest.mark.django_db
+def test_async_retrieve_matches_viewset(client, token, workers):
+    worker = Worker.objects.first()
+    expected = client.get(
+        f"/api/workers/{worker.id}/", HTTP_AUTHORIZATION=f"Token {token.key}"
+    )
+
+    response = async_get(f"/api/async/workers/{worker.id}/", token)
+
+    assert response.status_code == 200
+    assert response.content == expected.content
+    assert async_get("/api/async/workers/0/", token).status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_views_require_token(token, user_is_staff):
+    assert async_get("/api/async/workers/").status_code == 401
+
+    user_is_staff.is_active = False
+    user_is_staff.save()
+
+    assert async_get("/api/async/workers/", token).status_code == 401
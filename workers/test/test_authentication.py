@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+
+@pytest.fixture
+def token(user_is_staff):
+    return Token.objects.create(user=user_is_staff)
+
+
+def get(client, token_key):
+    return client.get("/api/workers/", HTTP_AUTHORIZATION=f"Token {token_key}")
+
+
+@pytest.mark.django_db
+def test_token_lookup_is_cached(client, token):
+    assert get(client, token.key).status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        response = get(client, token.key)
+
+    assert response.status_code == 200
+    # Ответ тоже из кэша, поэтому запросов к БД нет совсем
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_deactivated_user_is_rejected(client, token, user_is_staff):
+    assert get(client, token.key).status_code == 200
+
+    user_is_staff.is_active = False
+    user_is_staff.save()
+
+    assert get(client, token.key).status_code == 401
+
+
+@pytest.mark.django_db
+def test_deleted_token_is_rejected(client, token):
+    assert get(client, token.key).status_code == 200
+
+    token.delete()
+
+    assert get(client, token.key).status_code == 401
+
+
+@pytest.mark.django_db
+def test_invalid_token_is_not_cached(client, token):
+    assert get(client, "wrong").status_code == 401
+    assert get(client, token.key).status_code == 200
@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from workers.models import Worker
+
+
+def post_bulk(client, operations):
+    return client.post("/api/workers/bulk/", operations, format="json")
+
+
+def new_worker(i):
+    return {
+        "op": "create",
+        "first_name": f"Имя{i}",
+        "last_name": f"Фамилия{i}",
+        "email": f"new{i}@test.com",
+    }
+
+
+@pytest.mark.django_db
+def test_bulk_create_update_deactivate(staff_client, user_is_staff):
+    first = baker.make(Worker, email="first@test.com", position="Dev")
+    second = baker.make(Worker, email="second@test.com", is_active=True)
+    hired_date = first.hired_date
+
+    response = post_bulk(
+        staff_client,
+        [
+            new_worker(1),
+            {"op": "update", "id": first.id, "position": "Lead"},
+            {"op": "deactivate", "email": "second@test.com"},
+        ],
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    created = Worker.objects.get(email="new1@test.com")
+    assert data["results"] == [
+        {"index": 0, "status": "created", "id": created.id},
+        {"index": 1, "status": "updated", "id": first.id},
+        {"index": 2, "status": "deactivated", "id": second.id},
+    ]
+    assert created.created_by == user_is_staff
+    first.refresh_from_db()
+    assert first.position == "Lead"
+    assert first.hired_date == hired_date
+    second.refresh_from_db()
+    assert second.is_active is False
+
+
+@pytest.mark.django_db
+def test_bulk_rejects_whole_batch_on_error(staff_client):
+    worker = baker.make(Worker, email="taken@test.com", position="Dev")
+
+    response = post_bulk(
+        staff_client,
+        [
+            {"op": "update", "id": worker.id, "position": "Lead"},
+            {**new_worker(1), "email": "taken@test.com"},
+            {"op": "update", "id": worker.id + 1000, "position": "Lead"},
+            {"op": "create", "first_name": "Без фамилии"},
+            new_worker(2),
+            new_worker(2),
+        ],
+    )
+
+    assert response.status_code == 400
+    results = response.json()["results"]
+    assert [item["status"] for item in results] == [
+        "valid",
+        "error",
+        "error",
+        "error",
+        "valid",
+        "error",
+    ]
+    assert "email" in results[1]["errors"]
+    assert "id" in results[2]["errors"]
+    assert "last_name" in results[3]["errors"]
+    worker.refresh_from_db()
+    assert worker.position == "Dev"
+    assert Worker.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_query_count_does_not_grow(staff_client):
+    workers = baker.make(Worker, _quantity=50)
+
+    def batch(size):
+        return [new_worker(f"{size}-{i}") for i in range(size)] + [
+            {"op": "update", "id": worker.id, "position": f"P{size}"}
+            for worker in workers[:size]
+        ]
+
+    counts = []
+    for size in (5, 50):
+        with CaptureQueriesContext(connection) as queries:
+            response = post_bulk(staff_client, batch(size))
+        assert response.status_code == 200
+        counts.append(len(queries))
+
+    assert counts[0] == counts[1]
+    assert Worker.objects.filter(position="P50").count() == 50
+
+
+@pytest.mark.django_db
+def test_bulk_limits(staff_client, settings):
+    settings.WORKERS_BULK_MAX_ITEMS = 2
+
+    assert post_bulk(staff_client, [new_worker(i) for i in range(3)]).status_code == 400
+    assert post_bulk(staff_client, {"op": "create"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_forbidden_for_non_staff(client):
+    client.force_authenticate(user=baker.make("auth.User", is_staff=False))
+
+    assert post_bulk(client, [new_worker(1)]).status_code == 403
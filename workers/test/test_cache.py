@@ -0,0 +1,89 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from workers.cache import get_version
+from workers.models import Worker
+
+
+@pytest.mark.django_db
+def test_list_is_served_from_cache(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    baker.make(Worker, _quantity=3)
+
+    first = client.get("/api/workers/?is_active=True")
+    with CaptureQueriesContext(connection) as queries:
+        second = client.get("/api/workers/?is_active=True")
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second["ETag"] == first["ETag"]
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_conditional_get_returns_304(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    worker = baker.make(Worker)
+
+    response = client.get(f"/api/workers/{worker.id}/")
+    with CaptureQueriesContext(connection) as queries:
+        not_modified = client.get(
+            f"/api/workers/{worker.id}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+    assert not_modified.status_code == 304
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_invalidates_cache(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    worker = baker.make(Worker, first_name="Саша")
+
+    response = client.get(f"/api/workers/{worker.id}/")
+    client.patch(f"/api/workers/{worker.id}/", {"first_name": "Катя"})
+    updated = client.get(
+        f"/api/workers/{worker.id}/", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+
+    assert updated.status_code == 200
+    assert updated.json()["first_name"] == "Катя"
+    assert updated["ETag"] != response["ETag"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_invalidates_cache(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+
+    assert client.get("/api/workers/").json()["count"] == 0
+    client.post(
+        "/api/workers/import/",
+        {"file": make_excel({"first_name": ["Саша"], "email": ["s@test.com"]})},
+    )
+
+    assert client.get("/api/workers/").json()["count"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_version_changes_after_commit():
+    version, _ = get_version()
+
+    with transaction.atomic():
+        baker.make(Worker)
+        # До коммита параллельный GET читает старые строки под старой версией
+        assert get_version()[0] == version
+
+    assert get_version()[0] != version
+
+
+@pytest.mark.django_db
+def test_not_found_has_no_etag(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.get("/api/workers/999/")
+
+    assert response.status_code == 404
+    assert "ETag" not in response
+    assert "Last-Modified" not in response
@@ -0,0 +1,127 @@
+import pytest
+from django.contrib.auth.models import User
+from model_bakery import baker
+
+from workers.importers import import_rows
+from workers.models import Worker, WorkerTombstone
+from workers.resourse import BulkWorkersResources
+
+
+def get_changes(client, since=0, **params):
+    response = client.get("/api/workers/changes/", {"since": since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def ops(page):
+    return [(change["op"], change["id"]) for change in page["changes"]]
+
+
+@pytest.mark.django_db
+def test_api_writes_and_deletes_appear_in_feed(staff_client):
+    start = get_changes(staff_client)["cursor"]
+
+    response = staff_client.post(
+        "/api/workers/",
+        {"first_name": "Анна", "last_name": "Петрова", "email": "anna@test.com"},
+        format="json",
+    )
+    anna = response.json()["id"]
+    other = baker.make(Worker, email="other@test.com")
+    staff_client.patch(f"/api/workers/{anna}/", {"position": "Lead"}, format="json")
+    staff_client.delete(f"/api/workers/{other.pk}/")
+
+    page = get_changes(staff_client, start)
+    # Сотрудник, изменённый дважды, приходит один раз в текущем состоянии
+    assert ops(page) == [("upsert", anna), ("delete", other.pk)]
+    assert page["changes"][0]["worker"]["position"] == "Lead"
+    assert page["changes"][1]["email"] == "other@test.com"
+    assert page["has_more"] is False
+    assert get_changes(staff_client, page["cursor"])["changes"] == []
+
+
+@pytest.mark.django_db
+def test_feed_pages_are_bounded(staff_client):
+    workers = baker.make(Worker, _quantity=5)
+    seen, cursor = [], 0
+    while True:
+        page = get_changes(staff_client, cursor, limit=2)
+        assert len(page["changes"]) <= 2
+        seen += [change["id"] for change in page["changes"]]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+    assert seen == [worker.pk for worker in workers]
+
+
+@pytest.mark.django_db
+def test_bulk_writes_get_change_seqs(staff_client, user_is_staff):
+    existing = baker.make(Worker, email="w0@test.com", first_name="Старое")
+    start = get_changes(staff_client)["cursor"]
+
+    import_rows(
+        BulkWorkersResources(),
+        iter(
+            [
+                ["first_name", "last_name", "email"],
+                ["Новое", "Имя", "w0@test.com"],
+                ["Новый", "Сотрудник", "w1@test.com"],
+            ]
+        ),
+        user=user_is_staff,
+    )
+    staff_client.post(
+        "/api/workers/bulk/",
+        [{"op": "deactivate", "email": "w1@test.com"}],
+        format="json",
+    )
+
+    page = get_changes(staff_client, start)
+    created = Worker.objects.get(email="w1@test.com")
+    assert ops(page) == [("upsert", existing.pk), ("upsert", created.pk)]
+    assert page["changes"][0]["worker"]["first_name"] == "Новое"
+    assert page["changes"][1]["worker"]["is_active"] is False
+    seqs = [change["seq"] for change in page["changes"]]
+    assert seqs == sorted(set(seqs))
+
+
+@pytest.mark.django_db
+def test_admin_list_editable_updates_feed(client, staff_client):
+    admin = User.objects.create_superuser("root", "root@test.com", "pass")
+    worker = baker.make(Worker, is_active=True)
+    start = get_changes(staff_client)["cursor"]
+
+    client.force_login(admin)
+    response = client.post(
+        "/admin/workers/worker/",
+        {
+            "form-TOTAL_FORMS": "1",
+            "form-INITIAL_FORMS": "1",
+            "form-0-id": str(worker.pk),
+            "_save": "Save",
+        },
+    )
+    assert response.status_code == 302
+
+    page = get_changes(staff_client, start)
+    assert ops(page) == [("upsert", worker.pk)]
+    assert page["changes"][0]["worker"]["is_active"] is False
+
+
+@pytest.mark.django_db
+def test_queryset_delete_leaves_tombstones(staff_client):
+    workers = baker.make(Worker, _quantity=3)
+    start = get_changes(staff_client)["cursor"]
+
+    Worker.objects.filter(pk__in=[workers[0].pk, workers[2].pk]).delete()
+
+    page = get_changes(staff_client, start)
+    assert sorted(ops(page)) == [("delete", workers[0].pk), ("delete", workers[2].pk)]
+    assert WorkerTombstone.objects.count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{"since": "abc"}, {"since": -1}, {"limit": 0}])
+def test_invalid_params(staff_client, params):
+    response = staff_client.get("/api/workers/changes/", params)
+    assert response.status_code == 400
@@ -0,0 +1,52 @@
+import csv
+import io
+
+import pytest
+from model_bakery import baker
+from openpyxl import load_workbook
+
+from workers.models import Worker
+
+
+@pytest.mark.django_db
+def test_export_csv_with_filters(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    baker.make(Worker, position="Developer", email="dev@test.com")
+    baker.make(Worker, position="Designer", email="design@test.com")
+
+    response = client.get("/api/workers/export/?format=csv&position=Developer")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv"
+    content = b"".join(response.streaming_content).decode("utf-8-sig")
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows[0] == [
+        "first_name",
+        "middle_name",
+        "last_name",
+        "email",
+        "position",
+        "is_active",
+    ]
+    assert [row[3] for row in rows[1:]] == ["dev@test.com"]
+
+
+@pytest.mark.django_db
+def test_export_xlsx(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    baker.make(Worker, _quantity=3)
+
+    response = client.get("/api/workers/export/?format=xlsx")
+
+    assert response.status_code == 200
+    workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+    assert workbook.active.max_row == 4
+
+
+@pytest.mark.django_db
+def test_export_unknown_format(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.get("/api/workers/export/?format=pdf")
+
+    assert response.status_code == 400
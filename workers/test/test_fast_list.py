@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from workers.cache import get_cache
+from workers.models import Worker
+
+URLS = [
+    "/api/workers/",
+    "/api/workers/?page=2",
+    "/api/workers/?is_active=True&position=Developer",
+    "/api/workers/?q=Анна",
+    "/api/workers/?pagination=cursor&page_size=7",
+    "/api/workers/?pagination=cursor&ordering=-hired_date&page_size=7",
+]
+
+
+@pytest.fixture
+def workers(db):
+    for i in range(25):
+        baker.make(
+            Worker,
+            first_name="Анна" if i % 3 else f'Имя "{i}"',
+            middle_name="" if i % 2 else "Петровна",
+            last_name=f"Фамилия{i}",
+            email=f"w{i}@test.com",
+            position="Developer" if i % 4 else "Manager",
+            is_active=bool(i % 5),
+        )
+
+
+def get_content(client, settings, url, fast):
+    settings.WORKERS_FAST_LIST = fast
+    get_cache().clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.content
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_fast_list_is_byte_identical(client, settings, user_is_staff, workers, url):
+    client.force_authenticate(user=user_is_staff)
+
+    slow = get_content(client, settings, url, fast=False)
+    fast = get_content(client, settings, url, fast=True)
+
+    assert fast == slow
+
+
+def test_cursor_next_page_is_identical(client, settings, user_is_staff, workers):
+    client.force_authenticate(user=user_is_staff)
+    url = "/api/workers/?pagination=cursor&ordering=hired_date&page_size=7"
+
+    pages = {}
+    for fast in (False, True):
+        settings.WORKERS_FAST_LIST = fast
+        next_url = client.get(url).json()["next"]
+        pages[fast] = get_content(client, settings, next_url, fast)
+
+    assert pages[True] == pages[False]
+
+
+def test_fast_list_does_not_build_models(client, user_is_staff, workers, monkeypatch):
+    client.force_authenticate(user=user_is_staff)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Модель не должна создаваться")
+
+    monkeypatch.setattr(Worker, "from_db", classmethod(fail))
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/workers/")
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 25
+    assert "email" not in response.json()["results"][0]
+    assert len(queries) == 2
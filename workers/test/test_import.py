@@ -0,0 +1,185 @@
+import io
+
+import pytest
+
+from workers.models import Worker, WorkerStats
+
+
+@pytest.mark.django_db
+def test_import_workers_in_chunks(client, user_is_staff, make_excel, settings):
+    settings.WORKERS_IMPORT_CHUNK_SIZE = 2
+    client.force_authenticate(user=user_is_staff)
+    Worker.objects.create(first_name="Old", last_name="Old", email="w1@test.com")
+
+    excel_file = make_excel(
+        {
+            "first_name": [f"Сотрудник {i}" for i in range(5)],
+            "email": [f"w{i}@test.com" for i in range(5)],
+            "position": ["Developer"] * 5,
+            "is_active": [True] * 5,
+        }
+    )
+
+    response = client.post("/api/workers/import/", {"file": excel_file})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "success": True,
+        "imported": 4,
+        "updated": 1,
+        "skipped": 0,
+        "errors": 0,
+        "total": 5,
+    }
+    assert Worker.objects.count() == 5
+    assert Worker.objects.get(email="w1@test.com").first_name == "Сотрудник 1"
+
+
+@pytest.mark.django_db
+def test_import_workers_unsupported_format(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+
+    upload = io.BytesIO(b"not a spreadsheet")
+    upload.name = "workers.txt"
+
+    response = client.post("/api/workers/import/", {"file": upload})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_import_upserts_and_sets_author(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    existing = Worker.objects.create(
+        first_name="Old", last_name="Old", email="old@test.com"
+    )
+
+    excel_file = make_excel(
+        {
+            "first_name": ["Новый", "Обновлён", "Дубль"],
+            "email": ["new@test.com", "old@test.com", "new@test.com"],
+            "position": ["Developer", "Designer", "Manager"],
+            "is_active": [True, False, True],
+        }
+    )
+
+    response = client.post("/api/workers/import/", {"file": excel_file})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["imported"], data["updated"], data["errors"]) == (1, 2, 0)
+
+    existing.refresh_from_db()
+    assert existing.first_name == "Обновлён"
+    assert existing.is_active is False
+    assert existing.created_by is None
+
+    new_worker = Worker.objects.get(email="new@test.com")
+    assert new_worker.first_name == "Дубль"
+    assert new_worker.position == "Manager"
+    assert new_worker.created_by == user_is_staff
+
+
+@pytest.mark.django_db
+def test_bulk_import_repeated_existing_email(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    Worker.objects.create(
+        first_name="Old", last_name="Old", email="old@test.com", position="Developer"
+    )
+
+    excel_file = make_excel(
+        {
+            "first_name": ["Первый", "Второй"],
+            "email": ["old@test.com", "old@test.com"],
+            "position": ["Designer", "Manager"],
+        }
+    )
+
+    response = client.post("/api/workers/import/", {"file": excel_file})
+
+    assert response.status_code == 200
+    worker = Worker.objects.get(email="old@test.com")
+    assert (worker.first_name, worker.position) == ("Второй", "Manager")
+    assert WorkerStats.summary()["total"] == 1
+    assert dict(
+        WorkerStats.objects.filter(count__gt=0).values_list("position", "count")
+    ) == {"Manager": 1}
+
+
+@pytest.mark.django_db
+def test_reimport_skips_unchanged_rows_and_files(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    rows = {
+        "first_name": ["Анна", "Борис", "Вера"],
+        "email": ["a@test.com", "b@test.com", "v@test.com"],
+        "position": ["Developer"] * 3,
+    }
+
+    client.post("/api/workers/import/", {"file": make_excel(rows)})
+    response = client.post("/api/workers/import/", {"file": make_excel(rows)})
+    # Тот же файл целиком пропускается без разбора
+    assert response.json()["skipped"] == 3
+
+    # Изменение в обход импорта сбрасывает и хэш файла, и отпечаток строки
+    worker = Worker.objects.get(email="b@test.com")
+    worker.position = "Manager"
+    worker.save()
+    rows["position"][0] = "Lead"
+
+    response = client.post("/api/workers/import/", {"file": make_excel(rows)})
+
+    data = response.json()
+    assert (data["updated"], data["skipped"], data["total"]) == (2, 1, 3)
+    worker.refresh_from_db()
+    assert worker.position == "Developer"
+    assert Worker.objects.get(email="a@test.com").position == "Lead"
+
+
+def make_text_file(text, name, encoding):
+    upload = io.BytesIO(text.encode(encoding))
+    upload.name = name
+    return upload
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name, encoding, delimiter",
+    [
+        ("workers.csv", "utf-8", ","),
+        ("workers.csv", "cp1251", ";"),
+        ("workers.csv", "utf-8-sig", ";"),
+        ("workers.tsv", "utf-16", "\t"),
+    ],
+)
+def test_import_csv(client, user_is_staff, name, encoding, delimiter):
+    client.force_authenticate(user=user_is_staff)
+    rows = [
+        ["first_name", "last_name", "email", "position", "is_active"],
+        ["Анна", "Петрова", "a@test.com", '"Ведущий; инженер"', "1"],
+        ["Борис", "Иванов", "b@test.com", "Дизайнер", "0"],
+    ]
+    text = "\r\n".join(delimiter.join(row) for row in rows) + "\r\n"
+
+    response = client.post(
+        "/api/workers/import/", {"file": make_text_file(text, name, encoding)}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    anna = Worker.objects.get(email="a@test.com")
+    assert (anna.first_name, anna.position) == ("Анна", "Ведущий; инженер")
+    assert Worker.objects.get(email="b@test.com").is_active is False
+
+
+@pytest.mark.django_db
+def test_import_csv_validation_reports_rows(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    text = "first_name;last_name;email\nАнна;Петрова;a@test.com\nБорис;;не-email\n"
+
+    response = client.post(
+        "/api/workers/import/?validate=only",
+        {"file": make_text_file(text, "workers.csv", "cp1251")},
+    )
+
+    errors = [(error["row"], error["field"]) for error in response.json()["errors"]]
+    assert errors == [(3, "last_name"), (3, "email")]
@@ -0,0 +1,156 @@
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from workers import jobs
+from workers.models import ImportJob, Worker
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture(autouse=True)
+def inline_jobs(monkeypatch, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    monkeypatch.setattr(jobs, "get_executor", InlineExecutor)
+
+
+@pytest.fixture
+def excel_rows(make_excel):
+    def factory(count):
+        return make_excel(
+            {
+                "first_name": [f"Сотрудник {i}" for i in range(count)],
+                "email": [f"w{i}@test.com" for i in range(count)],
+            }
+        )
+
+    return factory
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_import_job(client, user_is_staff, excel_rows):
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.post("/api/workers/import/?mode=async", {"file": excel_rows(3)})
+
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    response = client.get(f"/api/workers/import/{job_id}/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "done"
+    assert (data["imported"], data["errors"], data["total"]) == (3, 0, 3)
+    assert Worker.objects.count() == 3
+    assert not ImportJob.objects.get(pk=job_id).file
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_import_rejects_invalid_file(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    excel_file = make_excel(
+        {"first_name": ["Иван", "Пётр"], "email": ["ivan@test.com", "bad"]}
+    )
+
+    response = client.post("/api/workers/import/?mode=async", {"file": excel_file})
+
+    job = ImportJob.objects.get(pk=response.json()["id"])
+    assert job.status == ImportJob.Status.FAILED
+    assert (job.errors, job.total) == (1, 2)
+    assert "строка 3, email" in job.error_message
+    assert not job.file
+    assert not Worker.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recover_resumes_stale_job(user_is_staff, excel_rows, settings):
+    settings.WORKERS_IMPORT_CHUNK_SIZE = 2
+    job = ImportJob.objects.create(
+        file_name="workers.xlsx",
+        status=ImportJob.Status.RUNNING,
+        created_by=user_is_staff,
+        imported=2,
+        total=2,
+        attempts=1,
+        heartbeat_at=timezone.now() - timedelta(hours=1),
+    )
+    job.file.save("workers.xlsx", ContentFile(excel_rows(5).read()))
+
+    assert jobs.recover_jobs() == 1
+
+    job.refresh_from_db()
+    assert job.status == ImportJob.Status.DONE
+    assert (job.imported, job.total, job.attempts) == (5, 5, 2)
+    # первые две строки уже были импортированы до остановки процесса
+    assert not Worker.objects.filter(email__in=["w0@test.com", "w1@test.com"]).exists()
+    assert Worker.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_recover_fails_job_without_file():
+    job = ImportJob.objects.create(
+        file_name="workers.xlsx",
+        status=ImportJob.Status.RUNNING,
+        heartbeat_at=timezone.now() - timedelta(hours=1),
+    )
+
+    jobs.recover_jobs()
+
+    job.refresh_from_db()
+    assert job.status == ImportJob.Status.FAILED
+    assert job.error_message
+
+
+@pytest.mark.django_db
+def test_heartbeat_keeps_queued_job_from_recovery(settings):
+    settings.WORKERS_IMPORT_JOB_STALE_SECONDS = 60
+    job = ImportJob.objects.create(
+        file_name="workers.xlsx",
+        owner="other-host:1:dead",
+        heartbeat_at=timezone.now() - timedelta(hours=1),
+    )
+    # Живой владелец обновляет heartbeat задачи, пока она ждёт в очереди
+    ImportJob.objects.filter(pk=job.pk).update(owner=jobs.get_owner())
+    assert jobs.heartbeat_jobs() == 1
+    ImportJob.objects.filter(pk=job.pk).update(owner="other-host:1:alive")
+
+    assert jobs.recover_jobs() == 0
+    job.refresh_from_db()
+    assert job.status == ImportJob.Status.PENDING
+    assert job.owner == "other-host:1:alive"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recovered_job_gets_new_owner(user_is_staff, excel_rows):
+    job = ImportJob.objects.create(
+        file_name="workers.xlsx",
+        created_by=user_is_staff,
+        owner="other-host:1:dead",
+        heartbeat_at=timezone.now() - timedelta(hours=1),
+    )
+    job.file.save("workers.xlsx", ContentFile(excel_rows(2).read()))
+
+    assert jobs.recover_jobs() == 1
+
+    job.refresh_from_db()
+    assert job.owner == jobs.get_owner()
+    assert job.status == ImportJob.Status.DONE
+    assert Worker.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_run_job_skips_job_claimed_by_other_process(excel_rows):
+    job = ImportJob.objects.create(file_name="workers.xlsx", owner="other-host:1:x")
+    job.file.save("workers.xlsx", ContentFile(excel_rows(2).read()))
+
+    jobs.run_job(job.pk)
+
+    job.refresh_from_db()
+    assert job.status == ImportJob.Status.PENDING
+    assert job.attempts == 0
+    assert not Worker.objects.exists()
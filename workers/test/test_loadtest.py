@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from model_bakery import baker
+from rest_framework.authtoken.models import Token
+
+from workers.loadtest import DEFAULT_MIX, create_tokens, delete_users, parse_mix
+from workers.models import Worker
+
+
+def test_parse_mix():
+    assert parse_mix("list=3,import=1") == {
+        **dict.fromkeys(DEFAULT_MIX, 0),
+        "list": 3,
+        "import": 1,
+    }
+    for value in ("lists=1", "list=abc", "list=-1", "list=0"):
+        with pytest.raises(ValueError):
+            parse_mix(value)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_loadtest_against_live_server(live_server, tmp_path):
+    baker.make(Worker, position="Dev", _quantity=15)
+    output = tmp_path / "report.json"
+
+    # Один клиент: тестовая SQLite в памяти блокирует таблицы целиком и
+    # параллельные записи в live_server упали бы с "table is locked"
+    call_command(
+        "loadtest",
+        url=live_server.url,
+        clients=1,
+        duration=1,
+        users=2,
+        import_rows=5,
+        seed=1,
+        mix="list=1,filtered=1,retrieve=1,create=1,patch=1,import=1",
+        output=str(output),
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["meta"]["clients"] == 1
+    assert report["total"]["requests"] > 0
+    assert set(report["endpoints"]) <= set(DEFAULT_MIX)
+    for metrics in report["endpoints"].values():
+        assert metrics["errors"] == 0, metrics["statuses"]
+        assert metrics["p50_ms"] <= metrics["p95_ms"] <= metrics["p99_ms"]
+    # после теста не остаётся staff-пользователей с токенами
+    assert not Token.objects.exists()
+    assert not User.objects.filter(username__startswith="loadtest-", is_staff=True)
+
+
+def test_invalid_mix_fails():
+    with pytest.raises(CommandError):
+        call_command("loadtest", mix="unknown=1")
+
+
+@pytest.mark.django_db
+def test_delete_users():
+    # Одноимённый пользователь и пользователи другого запуска не затрагиваются
+    other = baker.make(User, username="loadtest-1", is_staff=True)
+    Token.objects.create(user=other)
+    other_run, _ = create_tokens(1)
+    users, tokens = create_tokens(3)
+    assert len(set(tokens)) == 3
+    baker.make(Worker, created_by=users[0])
+
+    assert delete_users(users) == (2, 1)
+    assert not Token.objects.filter(key__in=tokens).exists()
+    users[0].refresh_from_db()
+    assert (users[0].is_active, users[0].is_staff) == (False, False)
+    assert Token.objects.filter(user__in=[other, *other_run]).count() == 2
+    assert User.objects.filter(pk__in=[other.pk, other_run[0].pk]).count() == 2
@@ -0,0 +1,84 @@
+import logging
+import os
+from unittest import mock
+
+import pytest
+
+from workers.log import BatchQueueHandler, BufferedFileHandler
+
+
+def make_logger(handler):
+    logger = logging.getLogger("workers.test_log")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def test_records_are_written_by_listener(tmp_path):
+    path = tmp_path / "app.log"
+    handler = BatchQueueHandler(str(path), batch_size=10)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger = make_logger(handler)
+
+    for i in range(25):
+        logger.info("Запись %s", i)
+    rows = [1]
+    logger.warning("Строки %s", rows)
+    # Аргументы подставлены в потоке вызывающего, до изменения списка
+    rows.append(2)
+    handler.close()
+    handler.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[:25] == [f"INFO Запись {i}" for i in range(25)]
+    assert lines[25] == "WARNING Строки [1]"
+
+
+def test_batch_is_written_once(tmp_path):
+    handler = BufferedFileHandler(str(tmp_path / "app.log"), delay=True)
+    writes = []
+    handler.stream = mock.Mock(write=writes.append)
+    for i in range(3):
+        handler.handle(logging.makeLogRecord({"msg": f"Запись {i}"}))
+    assert writes == []
+
+    handler.flush()
+
+    assert writes == ["Запись 0\nЗапись 1\nЗапись 2\n"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="нужен fork")
+def test_listener_restarts_after_fork(tmp_path):
+    path = tmp_path / "app.log"
+    handler = BatchQueueHandler(str(path))
+    logger = make_logger(handler)
+    logger.info("Родитель")
+
+    pid = os.fork()
+    if pid == 0:
+        # Без перезапуска запись осталась бы в очереди без слушателя
+        logger.info("Потомок")
+        handler.close()
+        os._exit(0)
+    os.waitpid(pid, 0)
+    handler.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert sorted(lines) == ["Потомок", "Родитель"]
+
+
+def test_exception_is_formatted(tmp_path):
+    path = tmp_path / "app.log"
+    handler = BatchQueueHandler(str(path))
+    logger = make_logger(handler)
+
+    try:
+        raise ValueError("сломалось")
+    except ValueError:
+        logger.exception("Ошибка импорта")
+    handler.close()
+
+    content = path.read_text(encoding="utf-8")
+    assert content.startswith("Ошибка импорта\nTraceback")
+    assert "ValueError: сломалось" in content
@@ -0,0 +1,198 @@
+import io
+import zipfile
+
+import pytest
+from django.db import DatabaseError
+
+from workers.models import Worker, WorkerQuerySet
+from workers.multi_import import get_pool, parse_files
+
+URL = "/api/workers/import/"
+
+
+@pytest.fixture
+def make_zip(make_excel):
+    def factory(files, name="branches.zip"):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            for file_name, content in files.items():
+                if isinstance(content, dict):
+                    content = make_excel(content).getvalue()
+                zf.writestr(file_name, content)
+        archive.name = name
+        archive.seek(0)
+        return archive
+
+    return factory
+
+
+def department(emails, first_name, position="Developer"):
+    return {
+        "first_name": [first_name] * len(emails),
+        "last_name": ["Фамилия"] * len(emails),
+        "email": emails,
+        "position": [position] * len(emails),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("processes", [1, 2])
+def test_zip_import_merges_files(client, user_is_staff, make_zip, settings, processes):
+    settings.WORKERS_IMPORT_PROCESSES = processes
+    client.force_authenticate(user=user_is_staff)
+    Worker.objects.create(first_name="Old", last_name="Old", email="w1@test.com")
+
+    archive = make_zip(
+        {
+            "sales.xlsx": department(["w0@test.com", "w1@test.com"], "Продажи"),
+            "it/dev.xlsx": department(["w1@test.com", "w2@test.com"], "ИТ"),
+            "__MACOSX/._dev.xlsx": b"",
+        }
+    )
+
+    response = client.post(URL, {"file": archive})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "success": True,
+        "imported": 2,
+        "updated": 1,
+        "skipped": 0,
+        "errors": 0,
+        "total": 3,
+        "files": [
+            {"file": "sales.xlsx", "total": 2, "duplicates": 1},
+            {"file": "it/dev.xlsx", "total": 2, "duplicates": 0},
+        ],
+    }
+    # Из повторов email побеждает строка более позднего файла
+    assert Worker.objects.get(email="w1@test.com").first_name == "ИТ"
+    assert Worker.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_import_several_files(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    first = make_excel(department(["a@test.com"], "Первый"), name="a.xlsx")
+    # Без колонки position: должность сотрудника не затирается
+    second = make_excel(
+        {"first_name": ["Второй"], "last_name": ["Ф"], "email": ["b@test.com"]},
+        name="b.xlsx",
+    )
+    Worker.objects.create(
+        first_name="Old", last_name="Old", email="b@test.com", position="Lead"
+    )
+
+    response = client.post(URL, {"file": [first, second]})
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+    assert Worker.objects.get(email="a@test.com").position == "Developer"
+    assert Worker.objects.get(email="b@test.com").position == "Lead"
+
+
+@pytest.mark.django_db
+def test_invalid_file_blocks_whole_import(client, user_is_staff, make_zip):
+    client.force_authenticate(user=user_is_staff)
+    archive = make_zip(
+        {
+            "ok.xlsx": department(["ok@test.com"], "Имя"),
+            "bad.xlsx": department(["not-an-email"], "Имя"),
+        }
+    )
+
+    response = client.post(URL, {"file": archive})
+
+    assert response.status_code == 400
+    files = response.json()["files"]
+    assert [(report["file"], report["valid"]) for report in files] == [
+        ("ok.xlsx", True),
+        ("bad.xlsx", False),
+    ]
+    assert files[1]["errors"][0]["message"] == "Неверный формат email"
+    assert not Worker.objects.exists()
+
+
+@pytest.mark.django_db
+def test_write_error_rolls_back_all_files(
+    client, user_is_staff, make_excel, monkeypatch
+):
+    client.force_authenticate(user=user_is_staff)
+    first = make_excel(department(["a@test.com"], "Первый"), name="a.xlsx")
+    # Другой набор колонок - отдельный проход импорта
+    second = make_excel(
+        {"first_name": ["Второй"], "last_name": ["Ф"], "email": ["b@test.com"]},
+        name="b.xlsx",
+    )
+    bulk_upsert = WorkerQuerySet.bulk_upsert
+    calls = []
+
+    def fail_second_file(self, workers, *args, **kwargs):
+        calls.append(workers[0].email)
+        if len(calls) > 1:
+            raise DatabaseError("write failed")
+        return bulk_upsert(self, workers, *args, **kwargs)
+
+    monkeypatch.setattr(WorkerQuerySet, "bulk_upsert", fail_second_file)
+
+    response = client.post(URL, {"file": [first, second]})
+
+    assert response.status_code == 400
+    data = response.json()
+    assert (data["success"], data["imported"], data["errors"]) == (False, 0, 1)
+    assert calls == ["a@test.com", "b@test.com"]
+    assert not Worker.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "files",
+    [
+        {"notes.txt": b"text"},
+        {"inner.zip": b"PK"},
+        {},
+    ],
+)
+def test_rejects_bad_archives(client, user_is_staff, make_zip, files):
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.post(URL, {"file": make_zip(files)})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_file_limit(client, user_is_staff, make_zip, settings):
+    settings.WORKERS_IMPORT_MAX_FILES = 1
+    client.force_authenticate(user=user_is_staff)
+    archive = make_zip(
+        {
+            "a.xlsx": department(["a@test.com"], "Имя"),
+            "b.xlsx": department(["b@test.com"], "Имя"),
+        }
+    )
+
+    response = client.post(URL, {"file": archive})
+
+    assert response.status_code == 400
+    assert not Worker.objects.exists()
+
+
+def test_parse_files_reuses_pool_without_fork(settings, make_excel):
+    settings.WORKERS_IMPORT_PROCESSES = 2
+    contents = [
+        (
+            f"{number}.xlsx",
+            make_excel(department([f"w{number}@test.com"], "Имя")).getvalue(),
+        )
+        for number in range(2)
+    ]
+
+    first = parse_files(contents)
+    pool = get_pool()
+    second = parse_files(contents)
+
+    assert get_pool() is pool
+    assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    assert [report for _, report in first] == [report for _, report in second]
+    assert all(report["valid"] for _, report in first)
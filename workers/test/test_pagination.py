@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from workers.models import Worker
+
+
+def walk(client, url):
+    names = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert "count" not in data
+        names += [worker["first_name"] for worker in data["results"]]
+        url = data["next"]
+    return names
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_pages(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    workers = baker.make(Worker, _quantity=5)
+
+    names = walk(client, "/api/workers/?pagination=cursor&page_size=2")
+
+    assert names == [worker.first_name for worker in workers]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_with_filters(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    baker.make(Worker, position="Developer", is_active=True, _quantity=3)
+    baker.make(Worker, position="Developer", is_active=False, _quantity=2)
+    baker.make(Worker, position="Designer", is_active=True, _quantity=2)
+
+    names = walk(
+        client,
+        "/api/workers/?pagination=cursor&page_size=2&ordering=-hired_date"
+        "&position=Developer&is_active=True",
+    )
+
+    assert len(names) == 3
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_skips_count_and_limits_page_size(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    baker.make(Worker, _quantity=5)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/workers/?pagination=cursor&page_size=100000")
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 5
+    assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+    assert "LIMIT 1001" in queries.captured_queries[-1]["sql"]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_rejects_unknown_ordering(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.get("/api/workers/?pagination=cursor&ordering=email")
+
+    assert response.status_code == 400
@@ -0,0 +1,81 @@
+import pytest
+from model_bakery import baker
+
+from workers.models import Worker
+from workers.profiling import RequestProfile, stats
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.MIDDLEWARE = [
+        "workers.profiling.ProfilingMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+    settings.WORKERS_PROFILING_SAMPLE_RATE = 1.0
+    stats.clear()
+    yield
+    stats.clear()
+
+
+@pytest.mark.django_db
+def test_server_timing_header(profiling, client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    baker.make(Worker, _quantity=3)
+
+    response = client.get("/api/workers/")
+
+    assert response.status_code == 200
+    timing = response["Server-Timing"]
+    for metric in ("db;", "serialize;", "render;", "total;"):
+        assert metric in timing
+    assert 'queries"' in timing
+
+
+@pytest.mark.django_db
+def test_sample_rate_zero_skips_profiling(profiling, settings, client, user_is_staff):
+    settings.WORKERS_PROFILING_SAMPLE_RATE = 0
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.get("/api/workers/")
+
+    assert "Server-Timing" not in response
+    assert stats.snapshot() == {}
+
+
+@pytest.mark.django_db
+def test_stats_endpoint(profiling, client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    client.get("/api/workers/")
+    client.get("/api/workers/")
+
+    response = client.get("/api/_stats/")
+
+    assert response.status_code == 200
+    endpoint = response.json()["endpoints"]["GET workers-list"]
+    assert endpoint["total"]["count"] == 2
+    assert endpoint["total"]["p95_ms"] >= endpoint["total"]["p50_ms"]
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_is_staff_only(profiling, client):
+    user = baker.make("auth.User", is_staff=False)
+    client.force_authenticate(user=user)
+
+    assert client.get("/api/_stats/").status_code == 403
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_with_slow_sample(profiling, client, user_is_staff):
+    profile = RequestProfile()
+    profile.timings["total"] = 6.0
+    profile.queries = 6000
+    stats.record("GET workers-list", profile)
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.get("/api/_stats/")
+
+    assert response.status_code == 200
+    endpoint = response.json()["endpoints"]["GET workers-list"]
+    assert endpoint["total"]["p99_ms"] == ">5000"
+    assert endpoint["total"]["buckets"] == {">5000": 1}
+    assert endpoint["queries"]["p50_ms"] == ">5000"
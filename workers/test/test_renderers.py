@@ -0,0 +1,98 @@
+import io
+import json
+
+import msgpack
+import pytest
+from model_bakery import baker
+from rest_framework.renderers import JSONRenderer
+
+from workers.models import Worker
+from workers.renderers import MessagePackParser, ORJSONRenderer
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"count": 2, "results": [{"id": 1, "first_name": "Анна", "is_active": True}]},
+        [{"middle_name": "", "position": None, "text": 'кавычки " и \\ \n'}],
+        {"error": "Файл не предоставлен", "nested": {"float": 1.5}},
+        {"text": "строка\u2028абзац\u2029конец"},
+    ],
+)
+def test_orjson_matches_default_renderer(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_writes_nan_as_null():
+    data = {"nan": float("nan"), "inf": float("inf")}
+
+    # Стандартный рендерер при STRICT_JSON такие значения не принимает
+    with pytest.raises(ValueError):
+        JSONRenderer().render(data)
+    assert ORJSONRenderer().render(data) == b'{"nan":null,"inf":null}'
+
+
+@pytest.mark.django_db
+def test_list_json_is_default(staff_client):
+    baker.make(Worker, first_name="Анна", _quantity=3)
+
+    response = staff_client.get("/api/workers/")
+
+    assert response["Content-Type"] == "application/json"
+    assert response.content == JSONRenderer().render(response.data)
+
+
+@pytest.mark.django_db
+def test_list_msgpack(staff_client):
+    baker.make(Worker, first_name="Анна", _quantity=3)
+    expected = staff_client.get("/api/workers/").json()
+
+    response = staff_client.get("/api/workers/", HTTP_ACCEPT="application/msgpack")
+
+    assert response["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == expected
+
+
+@pytest.mark.django_db
+def test_create_from_json_body(staff_client):
+    response = staff_client.post(
+        "/api/workers/",
+        json.dumps({"first_name": "Иван", "last_name": "Петров", "email": "i@t.com"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 201
+    assert Worker.objects.filter(email="i@t.com").exists()
+
+
+@pytest.mark.django_db
+def test_create_from_msgpack_body(staff_client):
+    body = {"first_name": "Иван", "last_name": "Петров", "email": "m@t.com"}
+
+    response = staff_client.post(
+        "/api/workers/",
+        msgpack.packb(body),
+        content_type="application/msgpack",
+        HTTP_ACCEPT="application/msgpack",
+    )
+
+    assert response.status_code == 201
+    assert msgpack.unpackb(response.content)["first_name"] == "Иван"
+    assert Worker.objects.filter(email="m@t.com").exists()
+
+
+@pytest.mark.django_db
+def test_invalid_bodies_return_400(staff_client):
+    for body, content_type in (
+        (b"{", "application/json"),
+        (b"\xc1", "application/msgpack"),
+    ):
+        response = staff_client.post("/api/workers/", body, content_type=content_type)
+        assert response.status_code == 400
+
+
+def test_msgpack_parser_roundtrip():
+    data = [{"op": "create", "first_name": "Анна"}]
+    stream = io.BytesIO(msgpack.packb(data))
+
+    assert MessagePackParser().parse(stream) == data
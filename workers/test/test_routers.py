@@ -0,0 +1,133 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connections
+from model_bakery import baker
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from workers.checks import check_replica_cache
+from workers.models import Worker
+from workers.routers import PRIMARY, ReplicaRouter, use_replica
+
+REPLICA = "replica"
+
+
+@pytest.fixture
+def replica(tmp_path, settings, django_db_blocker):
+    """Вторая база в отдельном файле SQLite как реплика.
+
+    Репликации нет: тест сам решает, какие данные лежат в каждой базе,
+    и по ним видно, откуда был прочитан ответ.
+    """
+    connections.settings[REPLICA] = {
+        **connections[PRIMARY].settings_dict,
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+    with django_db_blocker.unblock():
+        call_command("migrate", database=REPLICA, verbosity=0)
+    settings.WORKERS_DB_REPLICAS = [REPLICA]
+    settings.MIDDLEWARE = [
+        "workers.routers.ReplicaRoutingMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def make_client(username):
+    """Пользователь и токен в обеих базах, как после репликации."""
+    user = User.objects.create_user(username=username, is_staff=True)
+    token = Token.objects.create(user=user)
+    user.save(using=REPLICA)
+    token.save(using=REPLICA)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+def names(response):
+    return sorted(worker["first_name"] for worker in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_router_outside_requests_uses_primary(replica):
+    router = ReplicaRouter()
+    assert router.db_for_read(Worker) == PRIMARY
+    with use_replica():
+        assert router.db_for_read(Worker) == REPLICA
+        assert router.db_for_write(Worker) == PRIMARY
+        with use_replica(False):
+            assert router.db_for_read(Worker) == PRIMARY
+
+
+@pytest.mark.django_db
+def test_safe_requests_read_from_replica(replica):
+    client = make_client("reader")
+    baker.make(Worker, first_name="Основная")
+    baker.make(Worker, first_name="Реплика", _using=REPLICA)
+
+    response = client.get("/api/workers/")
+    assert response.status_code == 200
+    assert names(response) == ["Реплика"]
+
+    response = client.get("/api/workers/export/")
+    content = b"".join(response.streaming_content).decode()
+    assert "Реплика" in content
+    assert "Основная" not in content
+
+
+@pytest.mark.django_db
+def test_writer_reads_own_writes(replica):
+    writer = make_client("writer")
+    reader = make_client("other")
+    baker.make(Worker, first_name="Реплика", _using=REPLICA)
+
+    response = writer.post(
+        "/api/workers/",
+        {"first_name": "Новый", "last_name": "Сотрудник", "email": "new@test.com"},
+        format="json",
+    )
+    assert response.status_code == 201
+    assert Worker.objects.using(REPLICA).filter(first_name="Новый").count() == 0
+
+    assert names(reader.get("/api/workers/")) == ["Реплика"]
+    # Ответ реплики сразу после записи не кэшируется: когда она догонит,
+    # читатели увидят новые данные
+    baker.make(Worker, first_name="Догнала", _using=REPLICA)
+    assert names(reader.get("/api/workers/")) == ["Догнала", "Реплика"]
+
+    assert names(writer.get("/api/workers/")) == ["Новый"]
+
+
+@pytest.mark.django_db
+def test_stickiness_expires(replica, settings):
+    settings.WORKERS_DB_STICKY_SECONDS = 0
+    writer = make_client("writer")
+    baker.make(Worker, first_name="Реплика", _using=REPLICA)
+
+    writer.post(
+        "/api/workers/",
+        {"first_name": "Новый", "last_name": "Сотрудник", "email": "new@test.com"},
+        format="json",
+    )
+    assert names(writer.get("/api/workers/")) == ["Реплика"]
+
+
+def test_replicas_require_shared_cache(settings, tmp_path):
+    settings.WORKERS_DB_REPLICAS = []
+    assert check_replica_cache(None) == []
+
+    settings.WORKERS_DB_REPLICAS = [REPLICA]
+    assert [error.id for error in check_replica_cache(None)] == ["workers.E001"]
+
+    settings.CACHES = {
+        **settings.CACHES,
+        settings.WORKERS_CACHE_ALIAS: {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        },
+    }
+    assert check_replica_cache(None) == []
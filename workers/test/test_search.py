@@ -0,0 +1,118 @@
+import pytest
+from model_bakery import baker
+
+from workers.models import Worker
+
+
+def search(client, query):
+    response = client.get("/api/workers/", {"q": query})
+    assert response.status_code == 200
+    return [worker["first_name"] for worker in response.json()["results"]]
+
+
+@pytest.mark.django_db
+def test_search_by_name_prefix_and_email(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+    baker.make(Worker, first_name="Александр", last_name="Петров", email="a@corp.ru")
+    baker.make(Worker, first_name="Алексей", last_name="Иванов", email="lex@mail.ru")
+    baker.make(Worker, first_name="Мария", last_name="Петрова", email="m@corp.ru")
+
+    assert sorted(search(client, "алекс")) == ["Александр", "Алексей"]
+    assert search(client, "алекс петр") == ["Александр"]
+    assert search(client, "lex@mail") == ["Алексей"]
+    assert search(client, "ПЕТРОВА") == ["Мария"]
+    assert search(client, "Сидоров") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_search_index_follows_writes(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    worker = baker.make(Worker, first_name="Саша", email="s@test.com")
+
+    worker.first_name = "Катя"
+    worker.save()
+    assert search(client, "саша") == []
+    assert search(client, "катя") == ["Катя"]
+
+    client.post(
+        "/api/workers/import/",
+        {
+            "file": make_excel(
+                {"first_name": ["Борис", "Глеб"], "email": ["s@test.com", "g@t.ru"]}
+            )
+        },
+    )
+    assert search(client, "катя") == []
+    assert sorted(search(client, "борис глеб")) == []
+    assert search(client, "глеб") == ["Глеб"]
+
+    worker.delete()
+    assert search(client, "борис") == []
+
+
+@pytest.mark.django_db
+def test_admin_changelist_search(client, user_is_staff):
+    user_is_staff.is_superuser = True
+    user_is_staff.save()
+    client.force_login(user_is_staff)
+    baker.make(Worker, first_name="Александр", email="a@corp.ru")
+    baker.make(Worker, first_name="Мария", email="m@corp.ru")
+
+    response = client.get("/admin/workers/worker/", {"q": "алекс"})
+
+    assert response.status_code == 200
+    assert list(response.context["cl"].result_list.values_list("first_name")) == [
+        ("Александр",)
+    ]
+
+
+def make_ivans(count, active_every=5):
+    Worker.objects.bulk_create(
+        Worker(
+            first_name="Иван",
+            last_name=f"Фамилия{i}",
+            email=f"ivan{i}@test.com",
+            is_active=i % active_every < 2,
+        )
+        for i in range(count)
+    )
+
+
+@pytest.mark.django_db
+def test_search_returns_all_matches_above_candidates(client, user_is_staff, settings):
+    settings.WORKERS_SEARCH_CANDIDATES = 500
+    client.force_authenticate(user=user_is_staff)
+    make_ivans(600)
+    baker.make(Worker, first_name="Мария", email="m@test.com")
+
+    response = client.get("/api/workers/", {"q": "иван"})
+
+    assert response.json()["count"] == 600
+
+
+@pytest.mark.django_db
+def test_search_combines_with_filters(client, user_is_staff, settings):
+    settings.WORKERS_SEARCH_CANDIDATES = 10
+    client.force_authenticate(user=user_is_staff)
+    make_ivans(50)
+
+    response = client.get("/api/workers/", {"q": "иван", "is_active": "true"})
+
+    assert response.json()["count"] == 20
+    assert all(worker["is_active"] for worker in response.json()["results"])
+
+
+@pytest.mark.django_db
+def test_admin_search_returns_all_matches(client, user_is_staff, settings):
+    settings.WORKERS_SEARCH_CANDIDATES = 10
+    settings.WORKERS_ADMIN_SCALE_MODE = False
+    user_is_staff.is_superuser = True
+    user_is_staff.save()
+    client.force_login(user_is_staff)
+    make_ivans(30)
+
+    response = client.get(
+        "/admin/workers/worker/", {"q": "иван", "is_active__exact": "1"}
+    )
+
+    assert response.context["cl"].result_count == 12
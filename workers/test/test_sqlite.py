@@ -0,0 +1,183 @@
+import threading
+
+import pytest
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+
+WRITERS = 4
+READERS = 4
+WRITES = 25
+
+pytestmark = pytest.mark.skipif(
+    not settings.SQLITE_TUNED, reason="профиль SQLite отключён SQLITE_TUNED=False"
+)
+
+
+@pytest.fixture
+def make_database(tmp_path, django_db_blocker):
+    """Регистрирует файловую БД под новым алиасом с заданными OPTIONS.
+
+    Базы создаются вне тестовой: потокам нужны настоящие файлы и
+    собственные соединения.
+    """
+    aliases = []
+
+    def factory(alias, options):
+        connections.settings[alias] = {
+            **connections["default"].settings_dict,
+            "NAME": str(tmp_path / f"{alias}.sqlite3"),
+            "OPTIONS": options,
+        }
+        aliases.append(alias)
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE item (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+        connections[alias].close()
+        return alias
+
+    with django_db_blocker.unblock():
+        yield factory
+    for alias in aliases:
+        del connections[alias]
+        del connections.settings[alias]
+
+
+def guarded(alias, fn):
+    """Закрывает соединение потока после fn."""
+
+    def target():
+        try:
+            fn()
+        finally:
+            connections[alias].close()
+
+    return target
+
+
+def read_then_write(alias, errors, after_read=None):
+    """Транзакция чтение->запись, как у импорта; "database is locked" в errors."""
+    try:
+        with transaction.atomic(using=alias):
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM item")
+                count = cursor.fetchone()[0]
+                if after_read:
+                    after_read()
+                cursor.execute("INSERT INTO item (value) VALUES (%s)", [count])
+    except OperationalError as e:
+        errors.append(str(e))
+
+
+def count_items(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM item")
+        written = cursor.fetchone()[0]
+    connections[alias].close()
+    return written
+
+
+def run_conflict(alias):
+    """Писатели одновременно держат прочитанную транзакцию и пишут.
+
+    Barrier выпускает писателей к INSERT, только когда все они уже
+    прочитали таблицу, поэтому конфликт не зависит от планировщика потоков.
+    Возвращает число записанных строк и ошибок.
+    """
+    errors = []
+    barrier = threading.Barrier(WRITERS, timeout=10)
+    writers = [
+        threading.Thread(
+            target=guarded(
+                alias, lambda: read_then_write(alias, errors, after_read=barrier.wait)
+            )
+        )
+        for _ in range(WRITERS)
+    ]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    return count_items(alias), errors
+
+
+def run_load(alias):
+    """Писатели и читатели стартуют, пока главный поток держит запись.
+
+    Потоки проходят Barrier внутри открытой транзакции записи главного
+    потока, поэтому нагрузка начинается с занятой блокировки. Результат от
+    порядка потоков не зависит: профиль не должен давать ошибок ни при каком.
+    Возвращает число записанных строк и ошибок "database is locked".
+    """
+    errors = []
+    stop = threading.Event()
+    barrier = threading.Barrier(WRITERS + READERS + 1, timeout=10)
+
+    def write():
+        barrier.wait()
+        for _ in range(WRITES):
+            read_then_write(alias, errors)
+
+    def read():
+        barrier.wait()
+        while not stop.is_set():
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*), SUM(value) FROM item")
+                    cursor.fetchone()
+            except OperationalError as e:
+                errors.append(str(e))
+
+    writers = [threading.Thread(target=guarded(alias, write)) for _ in range(WRITERS)]
+    readers = [threading.Thread(target=guarded(alias, read)) for _ in range(READERS)]
+    for thread in readers + writers:
+        thread.start()
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute("INSERT INTO item (value) VALUES (0)")
+        barrier.wait()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+    return count_items(alias) - 1, errors
+
+
+def test_tuned_profile_pragmas(make_database):
+    alias = make_database("tuned", connections["default"].settings_dict["OPTIONS"])
+    with connections[alias].cursor() as cursor:
+        values = {}
+        for name in ("journal_mode", "synchronous", "busy_timeout", "temp_store"):
+            cursor.execute(f"PRAGMA {name}")
+            values[name] = cursor.fetchone()[0]
+    connections[alias].close()
+
+    # synchronous=NORMAL - 1, temp_store=MEMORY - 2
+    assert values == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "busy_timeout": settings.SQLITE_PRAGMAS["busy_timeout"],
+        "temp_store": 2,
+    }
+
+
+def test_default_profile_conflicts(make_database):
+    alias = make_database("default_profile", {})
+
+    written, errors = run_conflict(alias)
+
+    # Без профиля повышение блокировки после чтения падает сразу, без
+    # ожидания: проходит только один писатель
+    assert written == 1
+    assert len(errors) == WRITERS - 1
+    assert all("locked" in error for error in errors)
+
+
+def test_tuned_profile_has_no_lock_errors(make_database):
+    tuned = make_database("tuned", connections["default"].settings_dict["OPTIONS"])
+
+    written, errors = run_load(tuned)
+
+    assert errors == []
+    assert written == WRITERS * WRITES
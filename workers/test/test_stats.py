@@ -0,0 +1,175 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from workers.importers import import_rows
+from workers.models import Worker, WorkerStats
+from workers.resourse import BulkWorkersResources, WorkersResources
+
+
+def assert_consistent():
+    """Счётчики совпадают с GROUP BY по таблице сотрудников."""
+    expected = {
+        (row["position"], row["is_active"]): row["count"]
+        for row in Worker.objects.values("position", "is_active")
+        .annotate(count=Count("id"))
+        .order_by()
+    }
+    actual = {
+        (stats.position, stats.is_active): stats.count
+        for stats in WorkerStats.objects.filter(count__gt=0)
+    }
+    assert actual == expected
+
+
+@pytest.mark.django_db
+def test_api_writes_keep_stats(staff_client):
+    response = staff_client.post(
+        "/api/workers/",
+        {
+            "first_name": "Анна",
+            "last_name": "Петрова",
+            "email": "anna@test.com",
+            "position": "Dev",
+        },
+        format="json",
+    )
+    anna = response.json()["id"]
+    other = baker.make(Worker, position="Dev")
+    assert_consistent()
+
+    staff_client.patch(
+        f"/api/workers/{anna}/", {"position": "Lead", "is_active": False}, format="json"
+    )
+    assert_consistent()
+    staff_client.delete(f"/api/workers/{other.pk}/")
+    assert_consistent()
+    Worker.objects.all().delete()
+    assert_consistent()
+
+
+@pytest.mark.django_db
+def test_admin_list_editable_keeps_stats(client):
+    admin = User.objects.create_superuser("root", "root@test.com", "pass")
+    workers = baker.make(Worker, position="Dev", is_active=True, _quantity=2)
+
+    client.force_login(admin)
+    client.post(
+        "/admin/workers/worker/",
+        {
+            "form-TOTAL_FORMS": "2",
+            "form-INITIAL_FORMS": "2",
+            "form-0-id": str(workers[0].pk),
+            "form-1-id": str(workers[1].pk),
+            "form-1-is_active": "on",
+            "_save": "Save",
+        },
+    )
+
+    assert Worker.objects.filter(is_active=False).count() == 1
+    assert_consistent()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("resource_class", [WorkersResources, BulkWorkersResources])
+def test_imports_keep_stats(resource_class, user_is_staff):
+    baker.make(Worker, email="w0@test.com", position="Dev", is_active=True)
+    rows = [
+        ["first_name", "last_name", "email", "position", "is_active"],
+        ["Имя", "Фамилия", "w0@test.com", "Lead", "0"],
+        ["Имя", "Фамилия", "w1@test.com", "Dev", "1"],
+        # Повтор email в файле обновляет только что созданного
+        ["Имя", "Фамилия", "w1@test.com", "QA", "1"],
+    ]
+
+    import_rows(resource_class(), iter(rows), user=user_is_staff)
+
+    assert Worker.objects.get(email="w1@test.com").position == "QA"
+    assert_consistent()
+
+
+@pytest.mark.django_db
+def test_bulk_api_keeps_stats(staff_client):
+    worker = baker.make(Worker, email="w0@test.com", position="Dev")
+    staff_client.post(
+        "/api/workers/bulk/",
+        [
+            {"op": "update", "id": worker.pk, "position": "Lead"},
+            {"op": "deactivate", "email": "w0@test.com"},
+            {
+                "op": "create",
+                "first_name": "Имя",
+                "last_name": "Фамилия",
+                "email": "w1@test.com",
+                "position": "Dev",
+            },
+        ],
+        format="json",
+    )
+    assert_consistent()
+
+
+@pytest.mark.django_db
+def test_save_uses_stored_group():
+    worker = baker.make(Worker, position="Dev")
+    stale = Worker.objects.get(pk=worker.pk)
+    worker.position = "QA"
+    worker.save()
+
+    stale.is_active = False
+    stale.save()
+
+    assert_consistent()
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_uses_stored_group():
+    worker = baker.make(Worker, position="Dev")
+    stale = Worker.objects.get(pk=worker.pk)
+    # Другая запись меняет сотрудника после загрузки stale
+    worker.position = "QA"
+    worker.save()
+
+    stale.position = "Lead"
+    Worker.objects.bulk_upsert([stale], update_fields=["position"])
+
+    assert_consistent()
+
+
+@pytest.mark.django_db
+def test_stats_endpoint(staff_client):
+    baker.make(Worker, position="Dev", is_active=True, _quantity=3)
+    baker.make(Worker, position="Dev", is_active=False)
+    baker.make(Worker, position="QA", is_active=True, _quantity=2)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = staff_client.get("/api/workers/stats/")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 6,
+        "active": 5,
+        "inactive": 1,
+        "by_position": [
+            {"position": "Dev", "total": 4, "active": 3, "inactive": 1},
+            {"position": "QA", "total": 2, "active": 2, "inactive": 0},
+        ],
+    }
+    # Ни одного запроса к таблице сотрудников
+    assert not any('"workers_worker"' in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+def test_rebuild_command():
+    baker.make(Worker, position="Dev", _quantity=3)
+    WorkerStats.objects.update(count=100)
+    WorkerStats.objects.create(position="Старая", is_active=True, count=5)
+
+    call_command("rebuild_worker_stats")
+
+    assert_consistent()
+    assert not WorkerStats.objects.filter(position="Старая").exists()
@@ -0,0 +1,101 @@
+import pytest
+
+from workers.models import Worker
+from workers.validation import iter_frames, read_frame, validate_frame, validate_rows
+
+
+def validate(rows):
+    return validate_frame(read_frame(rows))
+
+
+def errors_by_row(report):
+    return {(error["row"], error["field"]) for error in report["errors"]}
+
+
+def test_missing_and_duplicated_columns():
+    report = validate([[], ["first_name", "position", "position"], ["Иван", "", ""]])
+
+    assert report["valid"] is False
+    assert errors_by_row(report) == {(2, "email"), (2, "position")}
+
+
+def test_row_level_errors():
+    report = validate(
+        [
+            ["first_name", "last_name", "email", "position", "is_active"],
+            ["Анна", "Иванова", "anna@test.com", "Dev", True],
+            ["", "Петров", "not-an-email", "Dev", "yes"],
+            ["Олег", " ", None, "D" * 101, None],
+            ["Анна", "Смирнова", "anna@test.com", "Dev", "0"],
+        ]
+    )
+
+    assert report["total"] == 4
+    assert errors_by_row(report) == {
+        (3, "first_name"),
+        (3, "email"),
+        (3, "is_active"),
+        (4, "last_name"),
+        (4, "email"),
+        (4, "position"),
+        (4, "is_active"),
+    }
+    assert report["error_count"] == 7
+    assert report["warnings"][0]["row"] == 5
+
+
+@pytest.mark.django_db
+def test_validate_only_does_not_import(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    excel_file = make_excel(
+        {"first_name": ["Иван", "Пётр"], "email": ["ivan@test.com", "bad"]}
+    )
+
+    response = client.post("/api/workers/import/?validate=only", {"file": excel_file})
+
+    assert response.status_code == 200
+    assert response.json()["errors"] == [
+        {"row": 3, "field": "email", "message": "Неверный формат email"}
+    ]
+    assert Worker.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_invalid_file_is_not_imported(client, user_is_staff, make_excel):
+    client.force_authenticate(user=user_is_staff)
+    excel_file = make_excel(
+        {"first_name": ["Иван", ""], "email": ["ivan@test.com", "petr@test.com"]}
+    )
+
+    response = client.post("/api/workers/import/", {"file": excel_file})
+
+    assert response.status_code == 400
+    assert response.json()["error_count"] == 1
+    assert Worker.objects.count() == 0
+
+
+def test_validate_rows_by_chunks(settings):
+    settings.WORKERS_IMPORT_MAX_REPORTED_ERRORS = 2
+    rows = [["first_name", "email"]]
+    rows += [[f"Имя {i}", f"w{i}@test.com"] for i in range(7)]
+    rows += [["", "w1@test.com"], ["Имя", "bad"], ["Имя", "w5@test.com"]]
+
+    assert [len(frame) for frame in iter_frames(rows, chunk_size=3)] == [3, 3, 3, 1]
+    report = validate_rows(rows, chunk_size=3)
+
+    assert report["total"] == 10
+    assert report["error_count"] == 2
+    assert errors_by_row(report) == {(9, "first_name"), (10, "email")}
+    # повторы email из разных порций указывают на первую строку листа
+    assert [(warning["row"], warning["message"]) for warning in report["warnings"]] == [
+        (9, "Email уже встречался в строке 3, будет использована последняя строка"),
+        (11, "Email уже встречался в строке 7, будет использована последняя строка"),
+    ]
+    assert report == validate_frame(read_frame(rows))
+
+
+def test_validate_rows_checks_headers_of_empty_sheet():
+    report = validate_rows([["first_name"]], chunk_size=3)
+
+    assert report["total"] == 0
+    assert errors_by_row(report) == {(1, "email")}
@@ -195,3 +195,66 @@ def test_worker_filtering(client, user_is_staff, worker_factory):
     data_filtered = response_filtered.json()
     assert len(data_filtered["results"]) == 1
     assert data_filtered["results"][0]["first_name"] == "Петя"
+
+
+@pytest.mark.django_db
+def test_post_worker_saves_email(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+
+    for email in ["first@test.com", "second@test.com"]:
+        response = client.post(
+            "/api/workers/",
+            {"first_name": "Саша", "last_name": "Кузнецов", "email": email},
+        )
+        assert response.status_code == 201
+        assert "email" not in response.json()
+
+    assert Worker.objects.filter(email="second@test.com").exists()
+
+
+@pytest.mark.django_db
+def test_post_worker_requires_email(client, user_is_staff):
+    client.force_authenticate(user=user_is_staff)
+
+    response = client.post(
+        "/api/workers/", {"first_name": "Саша", "last_name": "Кузнецов"}
+    )
+
+    assert response.status_code == 400
+    assert "email" in response.json()
+
+
+@pytest.mark.django_db
+def test_patch_worker_with_own_email(client, user_is_staff, worker_factory):
+    client.force_authenticate(user=user_is_staff)
+    worker = worker_factory(email="katya@test.com")
+
+    response = client.patch(
+        f"/api/workers/{worker.id}/",
+        {"first_name": "Катя", "email": "katya@test.com"},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    worker.refresh_from_db()
+    assert (worker.first_name, worker.email) == ("Катя", "katya@test.com")
+
+
+@pytest.mark.django_db
+def test_patch_worker_email(client, user_is_staff, worker_factory):
+    client.force_authenticate(user=user_is_staff)
+    worker = worker_factory(email="old@test.com")
+    worker_factory(email="taken@test.com")
+
+    response = client.patch(
+        f"/api/workers/{worker.id}/", {"email": "taken@test.com"}, format="json"
+    )
+    assert response.status_code == 400
+    assert "email" in response.json()
+
+    response = client.patch(
+        f"/api/workers/{worker.id}/", {"email": "new@test.com"}, format="json"
+    )
+    assert response.status_code == 200
+    worker.refresh_from_db()
+    assert worker.email == "new@test.com"
@@ -0,0 +1,223 @@
+import pandas as pd
+from django.conf import settings
+from import_export.widgets import BooleanWidget
+
+from workers.importers import is_blank_row, normalize_headers
+from workers.models import Worker
+from workers.resourse import WorkersResources
+
+# Без этих колонок строки файла нельзя сопоставить с сотрудниками
+REQUIRED_COLUMNS = ("first_name", "email")
+NAME_COLUMNS = ("first_name", "last_name")
+# Упрощённая проверка формата, которую можно выполнить векторно
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+BOOLEAN_VALUES = BooleanWidget.TRUE_VALUES + BooleanWidget.FALSE_VALUES
+
+
+def _make_frame(numbers, data, headers, header_row):
+    frame = pd.DataFrame(data, index=numbers, columns=headers or [], dtype=object)
+    frame.attrs["header_row"] = header_row
+    return frame
+
+
+def iter_frames(rows, chunk_size=None):
+    """Загружает строки файла импорта в DataFrame порциями по chunk_size строк.
+
+    Пустые строки пропускаются, первая непустая - заголовки. Индекс -
+    номер строки в исходном листе, чтобы в отчёте указывать его. Без
+    chunk_size лист загружается одной порцией; хотя бы одна порция (пусть
+    пустая) есть всегда, чтобы проверить заголовки.
+    """
+    numbers, data = [], []
+    headers, header_row = None, 1
+    yielded = False
+    for number, row in enumerate(rows, 1):
+        if is_blank_row(row):
+            continue
+        if headers is None:
+            headers = normalize_headers(row)
+            header_row = number
+            continue
+        row = list(row[: len(headers)])
+        row += [None] * (len(headers) - len(row))
+        numbers.append(number)
+        data.append(row)
+        if chunk_size and len(data) >= chunk_size:
+            yield _make_frame(numbers, data, headers, header_row)
+            numbers, data = [], []
+            yielded = True
+    if data or not yielded:
+        yield _make_frame(numbers, data, headers, header_row)
+
+
+def read_frame(rows):
+    """Загружает весь лист импорта в один DataFrame."""
+    return next(iter_frames(rows))
+
+
+def iter_frame_rows(frame):
+    """Строки DataFrame в формате iter_file_rows: сначала заголовки."""
+    yield list(frame.columns)
+    for row in frame.itertuples(index=False, name=None):
+        yield [None if pd.isna(value) else value for value in row]
+
+
+def _blank(series):
+    return series.isna() | series.astype(str).str.strip().eq("")
+
+
+class Report:
+    """Отчёт проверки листа, собирается по порциям.
+
+    Между порциями хранятся только счётчики, первые
+    WORKERS_IMPORT_MAX_REPORTED_ERRORS ошибок и предупреждений и первая
+    строка каждого email - для повторов из разных порций.
+    """
+
+    def __init__(self):
+        self.limit = settings.WORKERS_IMPORT_MAX_REPORTED_ERRORS
+        self.total = 0
+        self.error_count = 0
+        self.errors = []
+        self.warnings = []
+        self.first_rows = {}
+        self.checked_headers = False
+        self.invalid_headers = False
+
+    def add(self, target, frame, mask, field, message):
+        rows = frame.index[mask.to_numpy()]
+        target.extend(
+            {"row": int(row), "field": field, "message": message} for row in rows
+        )
+
+    def collect(self, errors, warnings):
+        # Порции идут по порядку строк, поэтому первые строки всего листа -
+        # первые строки первых порций
+        errors.sort(key=lambda error: error["row"])
+        warnings.sort(key=lambda warning: warning["row"])
+        self.error_count += len(errors)
+        self.errors.extend(errors[: self.limit - len(self.errors)])
+        self.warnings.extend(warnings[: self.limit - len(self.warnings)])
+
+    def as_dict(self):
+        return {
+            "valid": not self.error_count,
+            "total": self.total,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "warnings": self.warnings,
+        }
+
+    def check_headers(self, frame):
+        self.checked_headers = True
+        columns = list(frame.columns)
+        duplicated = sorted(
+            {column for column in columns if column and columns.count(column) > 1}
+        )
+        missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+        row = frame.attrs["header_row"]
+        errors = [
+            {"row": row, "field": column, "message": "Колонка повторяется"}
+            for column in duplicated
+        ] + [
+            {"row": row, "field": column, "message": "Нет обязательной колонки"}
+            for column in missing
+        ]
+        self.invalid_headers = bool(errors)
+        self.collect(errors, [])
+
+    def check(self, frame):
+        """Проверяет порцию листа векторными операциями pandas.
+
+        Ошибки - строки, которые импорт не сможет сохранить или сохранит
+        неверно. Повторы email в файле - предупреждения: при импорте
+        побеждает последняя строка.
+        """
+        if not self.checked_headers:
+            self.check_headers(frame)
+        self.total += len(frame)
+        if self.invalid_headers or not len(frame):
+            return
+
+        columns = list(frame.columns)
+        errors, warnings = [], []
+        for column in NAME_COLUMNS:
+            if column in columns:
+                self.add(
+                    errors, frame, _blank(frame[column]), column, "Обязательное поле"
+                )
+
+        emails = frame["email"]
+        blank_emails = _blank(emails)
+        self.add(errors, frame, blank_emails, "email", "Обязательное поле")
+        invalid = ~blank_emails & ~emails.astype(str).str.fullmatch(EMAIL_PATTERN)
+        self.add(errors, frame, invalid, "email", "Неверный формат email")
+        warnings.extend(self.check_duplicates(emails[~blank_emails]))
+
+        for column in WorkersResources.Meta.fields:
+            max_length = getattr(Worker._meta.get_field(column), "max_length", None)
+            if column in columns and max_length:
+                lengths = frame[column].fillna("").astype(str).str.len()
+                self.add(
+                    errors,
+                    frame,
+                    lengths > max_length,
+                    column,
+                    f"Длиннее {max_length} символов",
+                )
+
+        if "is_active" in columns:
+            values = frame["is_active"]
+            blank = values.isna() | values.isin(BooleanWidget.NULL_VALUES)
+            self.add(errors, frame, blank, "is_active", "Обязательное поле")
+            self.add(
+                errors,
+                frame,
+                ~blank & ~values.isin(BOOLEAN_VALUES),
+                "is_active",
+                "Ожидается true/false или 1/0",
+            )
+
+        self.collect(errors, warnings)
+
+    def check_duplicates(self, emails):
+        if not len(emails):
+            return []
+        rows = emails.index.to_series(index=emails.index)
+        first_in_chunk = rows.groupby(emails).transform("first")
+        # Email из прошлых порций указывает на строку, где он встретился впервые
+        # map(dict) строит Series из всего словаря, get - только по строкам порции
+        earlier = emails.map(self.first_rows.get).astype(float)
+        first_rows = earlier.fillna(first_in_chunk)
+        new = earlier.isna() & ~emails.duplicated()
+        self.first_rows.update(zip(emails[new], rows[new]))
+
+        later = first_rows != rows
+        return [
+            {
+                "row": int(row),
+                "field": "email",
+                "message": f"Email уже встречался в строке {int(first_row)}, "
+                "будет использована последняя строка",
+            }
+            for row, first_row in first_rows[later].items()
+        ]
+
+
+def validate_frame(frame):
+    """Проверяет весь лист, загруженный в DataFrame."""
+    report = Report()
+    report.check(frame)
+    return report.as_dict()
+
+
+def validate_rows(rows, chunk_size=None):
+    """Проверяет лист потоком порций по WORKERS_IMPORT_CHUNK_SIZE строк.
+
+    В памяти одновременно только одна порция, поэтому файл можно проверить
+    первым проходом, а импортировать вторым.
+    """
+    report = Report()
+    for frame in iter_frames(rows, chunk_size or settings.WORKERS_IMPORT_CHUNK_SIZE):
+        report.check(frame)
+    return report.as_dict()
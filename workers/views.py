@@ -1,32 +1,131 @@
 import logging
+import zipfile
 
-import tablib
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.pagination import CursorPagination
 from rest_framework.parsers import FormParser, MultiPartParser
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
-from workers.models import Worker
+from workers.authentication import CachedTokenAuthentication
+from workers.bulk import apply_operations
+from workers.cache import (
+    CachedReadMixin,
+    get_imported_file,
+    remember_imported_file,
+)
+from workers.changes import get_changes
+from workers.exporters import EXPORT_FORMATS, iter_csv, write_xlsx
+from workers.importers import (
+    UnsupportedFileFormat,
+    file_digest,
+    import_rows,
+    is_supported,
+    iter_file_rows,
+)
+from workers.jobs import submit_job
+from workers.models import ImportJob, Worker, WorkerStats
+from workers.multi_import import (
+    ImportLimitExceeded,
+    contents_digest,
+    expand_files,
+    is_archive,
+    merge_frames,
+    parse_files,
+)
+from workers.pagination import WorkerCursorPagination
 from workers.permissions import IsAdminOrReadOnly
-from workers.resourse import WorkersResources
-from workers.serializers import WorkerDetailSerializer, WorkerSerializer
+from workers.profiling import span, stats
+from workers.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+)
+from workers.resourse import BulkWorkersResources
+from workers.search import WorkerSearchFilter
+from workers.serializers import (
+    BulkOperationSerializer,
+    ImportJobSerializer,
+    WorkerDetailSerializer,
+    WorkerSerializer,
+)
+from workers.validation import iter_frame_rows, validate_rows
 
 logger = logging.getLogger(__name__)
 
 
-class WorkersViewSet(ModelViewSet):
+class ValuesListMixin:
+    """Список без создания моделей: строки из values_list сразу в словари.
+
+    Включается WORKERS_FAST_LIST для сериализаторов с ``values_fields()``,
+    JSON ответа при этом совпадает с обычной сериализацией побайтно.
+    """
+
+    def list(self, request, *args, **kwargs):
+        values_fields = getattr(self.get_serializer_class(), "values_fields", None)
+        fields = values_fields() if values_fields else None
+        if not settings.WORKERS_FAST_LIST or fields is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # Курсору нужны поля сортировки, а ordering по extra(select=...) -
+        # сами выражения в SELECT; в ответ они не попадают
+        extra = list(queryset.query.extra)
+        if isinstance(self.paginator, CursorPagination):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+            extra += [field.lstrip("-") for field in ordering]
+        columns = fields + [column for column in extra if column not in fields]
+        rows = queryset.values_list(*columns, named=bool(extra))
+
+        page = self.paginate_queryset(rows)
+        with span(request, "serialize"):
+            data = [dict(zip(fields, row)) for row in (rows if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class WorkersViewSet(CachedReadMixin, ValuesListMixin, ModelViewSet):
     queryset = Worker.objects.all()
     serializer_class = WorkerSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, WorkerSearchFilter]
     filterset_fields = ["id", "is_active", "position"]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
-    parser_classes = [MultiPartParser, FormParser]
+    # Формат ответа выбирается по Accept: application/json (по умолчанию),
+    # application/msgpack или text/html для browsable API
+    renderer_classes = [ORJSONRenderer, MessagePackRenderer, BrowsableAPIRenderer]
+    parser_classes = [ORJSONParser, MessagePackParser, MultiPartParser, FormParser]
+
+    @property
+    def paginator(self):
+        # ?pagination=cursor включает keyset-пагинацию вместо постраничной
+        request = getattr(self, "request", None)
+        if (
+            not hasattr(self, "_paginator")
+            and request is not None
+            and request.query_params.get("pagination") == "cursor"
+        ):
+            self._paginator = WorkerCursorPagination()
+        return super().paginator
+
+    def perform_content_negotiation(self, request, force=False):
+        # В export ?format= задаёт формат файла, а не рендерер DRF
+        if self.action == "export":
+            renderer = self.get_renderers()[0]
+            return renderer, renderer.media_type
+        return super().perform_content_negotiation(request, force)
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -36,19 +135,98 @@ class WorkersViewSet(ModelViewSet):
     def perform_create(self, serializer):
         worker = serializer.save(created_by=self.request.user)
         logger.info(
-            f"Создан новый сотрудник: {worker.first_name} {worker.middle_name} "
-            f"({worker.email}) пользователем {self.request.user.username}"
+            "Создан новый сотрудник: %s %s (%s) пользователем %s",
+            worker.first_name,
+            worker.middle_name,
+            worker.email,
+            self.request.user.username,
         )
 
     @extend_schema(
+        request=BulkOperationSerializer(many=True),
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "success": {"type": "boolean"},
+                    "results": {"type": "array", "items": {"type": "object"}},
+                },
+                "example": {
+                    "success": True,
+                    "results": [
+                        {"index": 0, "status": "created", "id": 11},
+                        {"index": 1, "status": "deactivated", "id": 3},
+                    ],
+                },
+            },
+            400: {
+                "type": "object",
+                "properties": {
+                    "success": {"type": "boolean"},
+                    "results": {"type": "array", "items": {"type": "object"}},
+                },
+            },
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        url_name="bulk",
+        parser_classes=[ORJSONParser, MessagePackParser],
+    )
+    def bulk(self, request):
+        operations = request.data
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"error": "Ожидается непустой JSON-массив операций"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(operations) > settings.WORKERS_BULK_MAX_ITEMS:
+            return Response(
+                {
+                    "error": "Слишком много операций, максимум "
+                    f"{settings.WORKERS_BULK_MAX_ITEMS}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        success, results = apply_operations(operations, request.user)
+
+        logger.info(
+            "Пользователь %s отправил пакет из %s операций, успех: %s",
+            request.user.username,
+            len(operations),
+            success,
+        )
+        return Response(
+            {"success": success, "results": results},
+            status=status.HTTP_200_OK if success else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "mode",
+                str,
+                enum=["async"],
+                description="async - импорт в фоне, ответ 202 с id задачи",
+            ),
+            OpenApiParameter(
+                "validate",
+                str,
+                enum=["only"],
+                description="only - только проверить файл и вернуть отчёт об ошибках",
+            ),
+        ],
         request={
             "multipart/form-data": {
                 "type": "object",
                 "properties": {
                     "file": {
-                        "type": "string",
-                        "format": "binary",
-                        "description": "Excel file (.xlsx, .xls)",
+                        "type": "array",
+                        "items": {"type": "string", "format": "binary"},
+                        "description": "Excel (.xlsx, .xls), CSV/TSV files or ZIP archives",
                     }
                 },
             }
@@ -60,6 +238,7 @@ class WorkersViewSet(ModelViewSet):
                     "success": {"type": "boolean"},
                     "imported": {"type": "integer"},
                     "updated": {"type": "integer"},
+                    "skipped": {"type": "integer"},
                     "errors": {"type": "integer"},
                     "total": {"type": "integer"},
                 },
@@ -67,10 +246,12 @@ class WorkersViewSet(ModelViewSet):
                     "success": True,
                     "imported": 5,
                     "updated": 2,
+                    "skipped": 0,
                     "errors": 0,
                     "total": 7,
                 },
             },
+            202: ImportJobSerializer,
             400: {
                 "type": "object",
                 "properties": {"error": {"type": "string"}},
@@ -83,51 +264,287 @@ class WorkersViewSet(ModelViewSet):
         detail=False, methods=["post"], url_path="import", url_name="import-workers"
     )
     def import_workers(self, request):
-        logger.info(f"Пользователь {request.user.username} запустил импорт Excel")
+        logger.info("Пользователь %s запустил импорт Excel", request.user.username)
 
         if "file" not in request.FILES:
             return Response(
                 {"error": "Файл не предоставлен"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        file = request.FILES["file"]
+        files = request.FILES.getlist("file")
+        if len(files) > 1 or is_archive(files[0].name):
+            return self._import_files(request, files)
+        file = files[0]
+
+        if request.query_params.get("mode") == "async":
+            return self._start_import_job(request, file)
 
         try:
-            resource = WorkersResources()
+            rows = iter_file_rows(file)
+        except UnsupportedFileFormat:
+            return self._unsupported_format(file.name)
 
-            dataset = tablib.Dataset()
+        validate_only = request.query_params.get("validate") == "only"
+        digest = file_digest(file)
+        unchanged = not validate_only and get_imported_file(digest)
+        if unchanged:
+            logger.info("Файл %s уже импортирован, изменений нет", file.name)
+            return Response(
+                {
+                    "success": True,
+                    "imported": 0,
+                    "updated": 0,
+                    "skipped": unchanged["total"],
+                    "errors": 0,
+                    "total": unchanged["total"],
+                }
+            )
 
-            if file.name.endswith(".xlsx"):
-                dataset.load(file.read(), format="xlsx")
-            elif file.name.endswith(".xls"):
-                dataset.load(file.read(), format="xls")
-            else:
-                logger.error(f"Неподдерживаемый формат файла: {file.name}")
+        try:
+            # Первый проход проверяет файл порциями, второй импортирует: весь
+            # лист в памяти не держится
+            report = validate_rows(rows)
+            if validate_only:
+                logger.info(
+                    "Проверка файла %s: %s ошибок", file.name, report["error_count"]
+                )
+                return Response(report)
+            if not report["valid"]:
+                logger.warning(
+                    "Файл %s не импортирован: %s ошибок",
+                    file.name,
+                    report["error_count"],
+                )
                 return Response(
-                    {"error": "Поддерживаются только .xlsx и .xls файлы"},
+                    {"success": False, "error": "Файл содержит ошибки", **report},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            result = resource.import_data(
-                dataset,
-                dry_run=False,
-                raise_errors=False,
-                user=request.user,
+            file.seek(0)
+            summary = import_rows(
+                BulkWorkersResources(), iter_file_rows(file), user=request.user
             )
-            logger.info(f"Импорт завершен: {result.totals}")
-            response_data = {
-                "success": True,
-                "imported": result.totals.get("new", 0),
-                "updated": result.totals.get("update", 0),
-                "errors": result.totals.get("error", 0),
-                "total": result.total_rows,
-            }
+            if not summary["errors"]:
+                remember_imported_file(digest, summary)
+            logger.info("Импорт завершен: %s", summary)
+
+            return Response({"success": True, **summary})
+
+        except Exception as e:
+            logger.exception("Ошибка обработки файла %s: %s", file.name, e)
+            return Response(
+                {"error": f"Ошибка обработки файла: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    def _import_files(self, request, files):
+        """Импорт нескольких файлов или архивов одним проходом."""
+        if request.query_params.get("mode") == "async":
+            return Response(
+                {
+                    "error": "Фоновый импорт принимает один файл .xlsx, .xls, .csv или .tsv"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            contents = expand_files(files)
+        except UnsupportedFileFormat as e:
+            return self._unsupported_format(e.args[0])
+        except (ImportLimitExceeded, zipfile.BadZipFile) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            return Response(response_data)
+        validate_only = request.query_params.get("validate") == "only"
+        digest = contents_digest(contents)
+        unchanged = not validate_only and get_imported_file(digest)
+        if unchanged:
+            logger.info("Файлы уже импортированы, изменений нет")
+            return Response({**unchanged, "imported": 0, "updated": 0})
 
+        try:
+            parsed = parse_files(contents)
         except Exception as e:
-            logger.exception(f"Ошибка обработки файла {file.name}: {e}")
+            logger.exception("Ошибка обработки файлов: %s", e)
             return Response(
                 {"error": f"Ошибка обработки файла: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+        reports = [
+            {"file": name, **report} for (name, _), (_, report) in zip(contents, parsed)
+        ]
+        valid = all(report["valid"] for report in reports)
+        if validate_only:
+            return Response({"valid": valid, "files": reports})
+        if not valid:
+            logger.warning(
+                "Файлы не импортированы: ошибки в %s из %s",
+                sum(not report["valid"] for report in reports),
+                len(reports),
+            )
+            return Response(
+                {"success": False, "error": "Файлы содержат ошибки", "files": reports},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        frames, duplicates = merge_frames([frame for frame, _ in parsed])
+        summary = {"imported": 0, "updated": 0, "skipped": 0, "errors": 0, "total": 0}
+        files_summary = [
+            {"file": report["file"], "total": report["total"], "duplicates": count}
+            for report, count in zip(reports, duplicates)
+        ]
+        # Файлы пишутся целиком или не пишутся вовсе: транзакции порций
+        # становятся точками сохранения внутри общей
+        with transaction.atomic():
+            for frame in frames:
+                result = import_rows(
+                    BulkWorkersResources(), iter_frame_rows(frame), user=request.user
+                )
+                for key, value in result.items():
+                    summary[key] += value
+            if summary["errors"]:
+                transaction.set_rollback(True)
+        if summary["errors"]:
+            logger.warning("Импорт %s файлов отменён: %s", len(contents), summary)
+            return Response(
+                {
+                    "success": False,
+                    "error": "Ошибка записи, импорт отменён",
+                    **summary,
+                    "imported": 0,
+                    "updated": 0,
+                    "files": files_summary,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        remember_imported_file(
+            digest,
+            {
+                "success": True,
+                **summary,
+                "skipped": summary["total"],
+                "files": files_summary,
+            },
+        )
+        logger.info("Импорт %s файлов завершен: %s", len(contents), summary)
+        return Response({"success": True, **summary, "files": files_summary})
+
+    def _unsupported_format(self, file_name):
+        logger.error("Неподдерживаемый формат файла: %s", file_name)
+        return Response(
+            {"error": "Поддерживаются .xlsx, .xls, .csv, .tsv и ZIP-архивы с ними"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def _start_import_job(self, request, file):
+        if not is_supported(file.name):
+            return self._unsupported_format(file.name)
+
+        job = ImportJob.objects.create(
+            file=file, file_name=file.name, created_by=request.user
+        )
+        submit_job(job.pk)
+        logger.info("Создана задача импорта %s для файла %s", job.pk, file.name)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @extend_schema(responses=ImportJobSerializer)
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"import/(?P<job_id>\d+)",
+        url_name="import-job",
+        permission_classes=[IsAuthenticated, IsAdminUser],
+    )
+    def import_job(self, request, job_id):
+        job = get_object_or_404(ImportJob, pk=job_id)
+        return Response(ImportJobSerializer(job).data)
+
+    @extend_schema(responses={200: {"type": "object"}})
+    @action(detail=False, methods=["get"], url_path="stats", url_name="stats")
+    def worker_stats(self, request):
+        # Читаются только счётчики WorkerStats, время ответа не зависит от
+        # числа сотрудников
+        return Response(WorkerStats.summary())
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "since",
+                int,
+                default=0,
+                description="Курсор из предыдущего ответа, 0 - с начала",
+            ),
+            OpenApiParameter("limit", int, description="Изменений на странице"),
+        ],
+        responses={200: {"type": "object"}},
+    )
+    @action(detail=False, methods=["get"], url_path="changes", url_name="changes")
+    def changes(self, request):
+        try:
+            since = int(request.query_params.get("since", 0))
+            limit = int(
+                request.query_params.get("limit", settings.WORKERS_CHANGES_PAGE_SIZE)
+            )
+        except ValueError:
+            since = limit = -1
+        if since < 0 or limit < 1:
+            return Response(
+                {"error": "since и limit должны быть целыми числами, limit больше 0"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limit = min(limit, settings.WORKERS_MAX_PAGE_SIZE)
+        return Response(get_changes(since, limit))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("format", str, enum=list(EXPORT_FORMATS), default="csv")
+        ],
+        responses={(200, media_type): bytes for media_type in EXPORT_FORMATS.values()},
+    )
+    @action(detail=False, methods=["get"], url_path="export", url_name="export")
+    def export(self, request):
+        export_format = request.query_params.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": "Поддерживаются только форматы csv и xlsx"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # Файл формируется после выхода из view: база выбирается сейчас,
+        # пока действует маршрутизация запроса
+        queryset = queryset.using(queryset.db)
+        file_name = f"workers.{export_format}"
+        if export_format == "csv":
+            response = StreamingHttpResponse(
+                iter_csv(queryset), content_type=EXPORT_FORMATS["csv"]
+            )
+            response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+        else:
+            # .xlsx целиком собирается до ответа, потоково отдаётся только CSV
+            response = FileResponse(
+                write_xlsx(queryset),
+                as_attachment=True,
+                filename=file_name,
+                content_type=EXPORT_FORMATS["xlsx"],
+            )
+
+        logger.info("Пользователь %s выгрузил %s", request.user.username, file_name)
+        return response
+
+
+class ProfilingStatsView(APIView):
+    """Гистограммы времени ответа по эндпоинтам из ProfilingMiddleware."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @extend_schema(responses={200: {"type": "object"}})
+    def get(self, request):
+        return Response(
+            {
+                "sample_rate": settings.WORKERS_PROFILING_SAMPLE_RATE,
+                "window_minutes": settings.WORKERS_PROFILING_WINDOW_MINUTES,
+                "endpoints": stats.snapshot(),
+            }
+        )